@@ -0,0 +1,642 @@
+#!/usr/bin/env python3
+"""End-to-end benchmark for nbtparsedat-v3.py
+
+Builds a reproducible synthetic recovery dump (level.dat files across DataVersions,
+plain and gzip logs, truncated/corrupted carvings, duplicates and big noise blobs),
+scans it with the real script and reports files/s, MB/s, peak RSS and per-stage time.
+
+    python benchmark.py corpus bench_corpus            # only build the corpus
+    python benchmark.py scan --repeat 3 --save before.json
+    python benchmark.py scan --repeat 3 --compare before.json
+
+The micro command times the hot per-line/per-value helpers on their own and compares
+them with the committed benchmark_micro.json baseline:
+
+    python benchmark.py micro             # compare, exit code 1 on a regression
+    python benchmark.py micro --update    # rewrite the baseline after an intended change
+
+The options command scans a small corpus through scan() with overridden settings and
+exits with 1 if one of them didn't reach the scan.
+"""
+
+import sys
+import os
+import io
+import platform
+import argparse
+import builtins
+import gzip
+import json
+import random
+import shutil
+import statistics
+import subprocess
+import tempfile
+import time
+from contextlib import redirect_stdout
+
+# === Configuration Settings ===
+DEFAULT_CORPUS = 'bench_corpus'  # Built next to the current directory unless --corpus is given
+DEFAULT_SEED = 1234  # Same seed, same corpus bytes
+MANIFEST_NAME = 'corpus.json'  # What was generated and which seeds a scan should find
+CORPUS_VERSION = 1  # Bump when the generator changes so old corpora are rebuilt
+MICRO_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmark_micro.json')
+MICRO_REPEAT = 5  # Passes over the inputs per helper, the fastest pass counts
+MICRO_MIN_PASS = 0.05  # Seconds per pass, short input lists are looped until they take this long
+MICRO_TOLERANCE = 0.15  # Slower than the baseline by more than 15% is a regression
+OPTIONS_SCALE = 0.1  # Corpus size for the options check
+
+# Per --scale 1.0
+CORPUS_WORLDS = 40  # Intact saves/<world>/level.dat
+CORPUS_LOGS = 30  # Logs, every other one gzipped
+CORPUS_LOG_LINES = 4000  # Lines per log
+CORPUS_CARVINGS = 60  # DMDE style fileNNNN.dat carvings, a third each intact, truncated and corrupted
+CORPUS_DUPLICATES = 10  # Byte-identical copies of gzip logs and carvings
+CORPUS_BLOBS = 2  # Mixed binary/text noise blobs
+CORPUS_BLOB_MB = 8  # Size of each noise blob
+
+# (DataVersion, version name), None for saves older than DataVersion (pre 1.9)
+VERSIONS = [
+    (None, '1.7.10'),
+    (819, '1.10.2'),
+    (1343, '1.12.2'),
+    (1976, '1.14.4'),
+    (2586, '1.16.5'),
+    (3465, '1.20.1'),
+    (3953, '1.21'),
+]
+WORLDGEN_SETTINGS_VERSION = 2566  # 1.16+ keeps the seed in WorldGenSettings instead of RandomSeed
+GENERATORS = ['default', 'default', 'default', 'flat', 'largeBiomes', 'amplified']
+WORLD_NAMES = ['New World', 'Survival', 'my world', 'Creative Test', 'SMP', 'Wörld', 'hardcore run', 'base']
+
+LOG_NOISE = [
+    '[{t}] [Server thread/INFO]: Preparing spawn area: {p}%',
+    '[{t}] [Render thread/INFO]: Loaded {n} recipes',
+    '[{t}] [Server thread/WARN]: Can\'t keep up! Is the server overloaded? Running {n}ms or {m} ticks behind',
+    '[{t}] [Server thread/INFO]: Player{p} joined the game',
+    '[{t}] [Server thread/INFO]: Player{p} has made the advancement [Stone Age]',
+    '[{t}] [Render thread/INFO]: Reloading ResourceManager: Default, {n}',
+    '[{t}] [Worker-Main-{p}/INFO]: Saving chunks for level \'ServerLevel[world]\'/minecraft:overworld',
+    '[{t}] [Server thread/INFO]: Player{p} lost connection: Disconnected id={n}',
+    '[{t}] [Render thread/INFO]: [CHAT] <Player{p}> meet at {n} 64 {m}',
+    '[{t}] [main/INFO]: Setting user: Player{p}',
+]
+# /seed output echoed into client logs, the shapes the scanner is meant to find
+LOG_SEED_LINES = [
+    '[{t}] [Render thread/INFO]: [CHAT] Seed: [{s}]',
+    '[{t}] [Client thread/INFO]: [CHAT] Seed: {s}',
+    '[{t}] [Client thread/INFO]: [CHAT] World seed: {s}',
+]
+LOG_HEADER = [
+    '[{t}] [main/INFO]: Loading Minecraft {v} with Fabric Loader 0.14.21',
+    '[{t}] [Server thread/INFO]: Starting minecraft server version {v}',
+    '[{t}] [Server thread/INFO]: Preparing level "world"',
+]
+
+def random_seed(rng):
+    """Random Java long seed, well clear of the IGNORED_SEEDS examples"""
+    return rng.randint(-2 ** 63, 2 ** 63 - 1)
+
+def level_data(rng, seed):
+    """Data compound of a level.dat for a random version"""
+    from nbtlib import Compound, Long, String, Int, Byte
+    data_version, version_name = rng.choice(VERSIONS)
+    data = Compound({
+        'LevelName': String(rng.choice(WORLD_NAMES)),
+        'GameType': Int(rng.choice([0, 0, 0, 1, 2])),
+        'LastPlayed': Long(1262304000000 + rng.randrange(14 * 365 * 86400) * 1000),
+        'SpawnX': Int(rng.randint(-500, 500)),
+        'SpawnY': Int(rng.randint(60, 90)),
+        'SpawnZ': Int(rng.randint(-500, 500)),
+        'Time': Long(rng.randrange(10 ** 7)),
+        'SizeOnDisk': Long(0),
+        'hardcore': Byte(rng.random() < 0.1),
+        'allowCommands': Byte(rng.random() < 0.5),
+        'Difficulty': Byte(rng.randint(0, 3)),
+        'generatorName': String(rng.choice(GENERATORS)),
+    })
+    if data_version is None or data_version < WORLDGEN_SETTINGS_VERSION:
+        data['RandomSeed'] = Long(seed)
+    else:
+        data['WorldGenSettings'] = Compound({'seed': Long(seed), 'bonus_chest': Byte(0),
+                                             'generate_features': Byte(1)})
+    if data_version is not None:
+        data['DataVersion'] = Int(data_version)
+        data['Version'] = Compound({'Id': Int(data_version), 'Name': String(version_name), 'Snapshot': Byte(0)})
+    return data
+
+def level_dat_bytes(rng, seed):
+    """Gzipped level.dat, written with mtime 0 so the bytes are reproducible"""
+    from nbtlib import File, Compound
+    buffer = io.BytesIO()
+    File({'': Compound({'Data': level_data(rng, seed)})}).write(buffer)
+    return gzip.compress(buffer.getvalue(), mtime=0)
+
+def log_text(rng, lines, seeds):
+    """A client/server log with the given seeds scattered between noise lines"""
+    clock = rng.randrange(86400)
+    version = rng.choice(VERSIONS)[1]
+    out = []
+    seed_at = {rng.randrange(len(LOG_HEADER), lines): seed for seed in seeds}
+    for i in range(lines):
+        clock += rng.randrange(3)
+        t = f'{clock // 3600 % 24:02}:{clock // 60 % 60:02}:{clock % 60:02}'
+        if i < len(LOG_HEADER):
+            out.append(LOG_HEADER[i].format(t=t, v=version))
+        elif i in seed_at:
+            out.append(rng.choice(LOG_SEED_LINES).format(t=t, s=seed_at[i]))
+        else:
+            out.append(rng.choice(LOG_NOISE).format(t=t, p=rng.randrange(100), n=rng.randrange(10 ** 6),
+                                                    m=rng.randrange(-30000, 30000)))
+    return '\n'.join(out) + '\n'
+
+def blob_bytes(rng, size, seeds):
+    """Carved disk region: mostly random binary with text runs and a few seed lines in between"""
+    out = bytearray()
+    seed_iter = iter(seeds)
+    while len(out) < size:
+        roll = rng.random()
+        if roll < 0.6:
+            length = rng.randrange(4096, 65536)
+            out += rng.getrandbits(length * 8).to_bytes(length, 'little')  # randbytes needs 3.9
+        elif roll < 0.95:
+            out += log_text(rng, rng.randrange(50, 400), []).encode()
+        else:
+            seed = next(seed_iter, None)
+            if seed is not None:
+                out += f'\n[12:00:00] [Render thread/INFO]: [CHAT] Seed: [{seed}]\n'.encode()
+    return bytes(out[:size])
+
+def write_file(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(data)
+    return len(data)
+
+def generate_corpus(directory, scale=1.0, seed=DEFAULT_SEED, blob_mb=CORPUS_BLOB_MB):
+    """Build the synthetic corpus in directory (replacing it) and return its manifest"""
+    rng = random.Random(seed)
+    count = lambda n: max(1, round(n * scale))
+    if os.path.isdir(directory):
+        shutil.rmtree(directory)
+    os.makedirs(directory)
+    manifest = {'version': CORPUS_VERSION, 'seed': seed, 'scale': scale, 'blob_mb': blob_mb, 'files': 0, 'bytes': 0, 'seeds': []}
+    expected = set()
+    gz_logs = []
+    carvings = []
+
+    def add(path, data):
+        manifest['files'] += 1
+        manifest['bytes'] += write_file(os.path.join(directory, path), data)
+
+    # Intact saves
+    for i in range(count(CORPUS_WORLDS)):
+        world_seed = random_seed(rng)
+        expected.add(world_seed)
+        add(os.path.join('saves', f'world{i}', 'level.dat'), level_dat_bytes(rng, world_seed))
+
+    # Logs, a few seeds each, every other one gzipped like the launcher's rotated logs
+    for i in range(count(CORPUS_LOGS)):
+        log_seeds = [random_seed(rng) for _ in range(rng.randrange(0, 4))]
+        expected.update(log_seeds)
+        text = log_text(rng, CORPUS_LOG_LINES, log_seeds).encode()
+        if i % 2:
+            path = os.path.join('logs', f'2014-{i % 12 + 1:02}-{i % 28 + 1:02}-{i}.log.gz')
+            data = gzip.compress(text, mtime=0)
+            gz_logs.append(data)
+        else:
+            path = os.path.join('logs', f'latest-{i}.log')
+            data = text
+        add(path, data)
+
+    # Carvings recovered by signature: intact, cut short, or with damaged deflate data
+    for i in range(count(CORPUS_CARVINGS)):
+        world_seed = random_seed(rng)
+        data = level_dat_bytes(rng, world_seed)
+        kind = i % 3
+        if kind == 0:
+            expected.add(world_seed)
+        elif kind == 1:
+            data = data[:rng.randrange(10, len(data) - 8)]
+        else:
+            data = bytearray(data)
+            for _ in range(8):
+                data[rng.randrange(10, len(data))] = rng.randrange(256)
+            data = bytes(data)
+        carvings.append(data)
+        add(os.path.join('recovered', f'file{i:04}.dat'), data)
+
+    # Identical copies, as DMDE finds the same file in several places
+    sources = gz_logs + carvings
+    for i in range(count(CORPUS_DUPLICATES)):
+        data = rng.choice(sources)
+        ext = '.log.gz' if data in gz_logs else '.dat'
+        add(os.path.join('recovered', 'dupes', f'copy{i:04}{ext}'), data)
+
+    # Big noise blobs, text extensions so the scanner classifies and skims them
+    for i in range(count(CORPUS_BLOBS)):
+        blob_seeds = [random_seed(rng) for _ in range(3)]
+        data = blob_bytes(rng, blob_mb * 1024 * 1024, blob_seeds)
+        expected.update(seed for seed in blob_seeds if f'Seed: [{seed}]'.encode() in data)
+        add(os.path.join('recovered', f'blob{i:03}.txt'), data)
+
+    manifest['seeds'] = sorted(expected)
+    with open(os.path.join(directory, MANIFEST_NAME), 'w') as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+def load_manifest(directory):
+    try:
+        with open(os.path.join(directory, MANIFEST_NAME)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def peak_rss():
+    """Peak resident memory of this process and its finished children in bytes, None if unknown"""
+    try:
+        import resource
+    except ImportError:
+        resource = None
+    if resource:
+        scale = 1 if sys.platform == 'darwin' else 1024  # ru_maxrss is KB on Linux, bytes on macOS
+        return max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+                   resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss) * scale
+    try:
+        import ctypes
+        from ctypes import wintypes
+
+        class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+            _fields_ = [('cb', wintypes.DWORD), ('PageFaultCount', wintypes.DWORD)] + [
+                (name, ctypes.c_size_t) for name in (
+                    'PeakWorkingSetSize', 'WorkingSetSize', 'QuotaPeakPagedPoolUsage', 'QuotaPagedPoolUsage',
+                    'QuotaPeakNonPagedPoolUsage', 'QuotaNonPagedPoolUsage', 'PagefileUsage', 'PeakPagefileUsage')]
+
+        counters = PROCESS_MEMORY_COUNTERS()
+        counters.cb = ctypes.sizeof(counters)
+        process = ctypes.windll.kernel32.GetCurrentProcess()
+        if ctypes.windll.psapi.GetProcessMemoryInfo(process, ctypes.byref(counters), counters.cb):
+            return counters.PeakWorkingSetSize
+    except Exception:
+        pass
+    return None
+
+def load_scanner():
+    """The nbtparsedat-v3.py engine, imported through the mc_recovery package"""
+    from mc_recovery import engine
+    return engine
+
+def clear_outputs(directory, basename):
+    """Remove a previous run's workbook, database and stats so every run starts the same"""
+    for name in os.listdir(directory):
+        if name.startswith(basename):
+            path = os.path.join(directory, name)
+            if os.path.isdir(path):
+                shutil.rmtree(path)
+            else:
+                os.remove(path)
+
+def scan_once(directory):
+    """Scan the corpus in this process and return the measurements"""
+    builtins.input = lambda *args: 'n'  # Never block on the save retry prompt
+    with open(os.devnull, 'w') as devnull, redirect_stdout(devnull):
+        scanner = load_scanner()
+        clear_outputs(directory, scanner.OUTPUT_BASENAME)
+        scanner.directory_path = directory
+        started = time.perf_counter()
+        ctx = scanner.main()
+        elapsed = time.perf_counter() - started
+
+    manifest = load_manifest(directory) or {}
+    planted = [scanner.normalize_seed(seed) for seed in manifest.get('seeds', [])]
+    found = sum(1 for seed in planted if seed in ctx.unique_seeds)
+    stats = ctx.stats.to_dict()
+    return {
+        'seconds': round(elapsed, 3),
+        'files': ctx.processed_files,
+        'corpus_files': manifest.get('files'),
+        'bytes': manifest.get('bytes'),
+        'peak_rss': peak_rss(),
+        'unique_seeds': len(ctx.unique_seeds),
+        'planted_seeds': len(planted),
+        'planted_found': found,
+        'log_entries': ctx.rows['Log Results'],
+        'errors': ctx.errors,
+        'stages': {stage: round(entry['seconds'], 3) for stage, entry in stats['stages'].items()},
+        'file_types': stats['file_types'],
+    }
+
+def run_scan(directory, output_format):
+    """Scan in a fresh interpreter so peak RSS and imports belong to this run only"""
+    env = dict(os.environ, MC_RECOVERY_OUTPUT=output_format)
+    result = subprocess.run([sys.executable, os.path.abspath(__file__), 'once', directory],
+                            env=env, stdout=subprocess.PIPE, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"Scan failed with exit code {result.returncode}")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+def summarize(runs):
+    """Median run plus the rates derived from it"""
+    median = sorted(runs, key=lambda run: run['seconds'])[len(runs) // 2]
+    seconds = median['seconds'] or 1e-9
+    return {
+        'runs': len(runs),
+        'seconds': median['seconds'],
+        'seconds_all': [run['seconds'] for run in runs],
+        'stdev': round(statistics.stdev(run['seconds'] for run in runs), 3) if len(runs) > 1 else 0.0,
+        'files_per_second': round(median['files'] / seconds, 1),
+        'mb_per_second': round((median['bytes'] or 0) / seconds / 1048576, 2),
+        'peak_rss_mb': round(max(run['peak_rss'] or 0 for run in runs) / 1048576, 1),
+        'median_run': median,
+    }
+
+def change(new, old):
+    if not old:
+        return ''
+    return f"{(new - old) * 100 / old:+.1f}%"
+
+def print_report(summary, baseline=None):
+    run = summary['median_run']
+    old = baseline['median_run'] if baseline else {}
+    old_summary = baseline or {}
+    print(f"\n=== Benchmark ({summary['runs']} runs, median) ===")
+    print(f"Corpus: {run['corpus_files']} files, {(run['bytes'] or 0) / 1048576:.1f} MB")
+    rows = [
+        ('Seconds', summary['seconds'], old_summary.get('seconds')),
+        ('Files/s', summary['files_per_second'], old_summary.get('files_per_second')),
+        ('MB/s', summary['mb_per_second'], old_summary.get('mb_per_second')),
+        ('Peak RSS MB', summary['peak_rss_mb'], old_summary.get('peak_rss_mb')),
+    ]
+    for name, value, previous in rows:
+        print(f"{name:<14}{value:>12}  {change(value, previous)}")
+    print(f"Seeds found: {run['planted_found']}/{run['planted_seeds']} planted, "
+          f"{run['unique_seeds']} unique, {run['log_entries']} log entries, {run['errors']} errors")
+    if old and old.get('planted_found') != run['planted_found']:
+        print(f"WARNING: baseline found {old.get('planted_found')} planted seeds")
+
+    print("\nStage              Seconds")
+    old_stages = old.get('stages', {})
+    for stage, seconds in sorted(run['stages'].items(), key=lambda item: -item[1]):
+        print(f"{stage:<16}{seconds:>10}  {change(seconds, old_stages.get(stage))}")
+
+# Lines that show up in real logs and carvings besides the generated ones
+MICRO_EXTRA_LINES = [
+    '[23:13:21] [Render thread/INFO]: Took 3371 ms to load 846 recipes',
+    '[23:13:22] [Server thread/INFO]: Player812 logged in with entity id 20632 at (-1.572269102367993, 80.0, 141.58268250516798)',
+    '[23:13:25] [Server-Worker-3/INFO]: Preparing spawn area: 83%',
+    '[12:01:44] [Client thread/INFO]: Loaded 4256 Datafixer optimizations took 301 milliseconds',
+    '[12:01:44] [main/INFO]: Random seed for biome generation -4172144997902289642 world gen',
+    '    at net.minecraft.world.level.levelgen.RandomState.<init>(RandomState.java:72) ~[client-1.20.1.jar:?]',
+    '2011-03-04 18:22:01 [INFO] Preparing level "world" seed: 3257840388504953787',
+    'RandomSeed 8091867987493326313 LevelName New World generatorName default',
+]
+
+def micro_inputs(seed=DEFAULT_SEED):
+    """Representative inputs for each helper, generated the same way every time"""
+    rng = random.Random(seed)
+    lines = []
+    for _ in range(4):
+        lines += log_text(rng, 500, [random_seed(rng) for _ in range(10)]).splitlines()
+    lines += MICRO_EXTRA_LINES * 20
+    # Text decoded out of binary carvings, control characters and all
+    blob = blob_bytes(rng, 256 * 1024, [random_seed(rng) for _ in range(5)])
+    carved = [line for line in blob.decode('latin-1').split('\n') if line][:500]
+    words = [word for line in lines for word in line.split()]
+
+    chunks = []
+    for _ in range(200):
+        chunks.append(log_text(rng, 40, []).encode()[:1024])
+        length = rng.randrange(256, 1024)
+        chunks.append(rng.getrandbits(length * 8).to_bytes(length, 'little'))
+        chunks.append(b'\x00' * 512 + b'level.dat seed 123456789')
+
+    levels = [level_data(rng, random_seed(rng)) for _ in range(200)]
+    # The same seeds again from logs and older copies, so the merge path is timed too
+    seeds = [random_seed(rng) for _ in range(300)]
+    infos = []
+    for _ in range(1500):
+        data_version, version = rng.choice(VERSIONS)
+        if rng.random() < 0.5:
+            info = {'filename': 'level.dat', 'world_name': rng.choice(WORLD_NAMES), 'game_mode': 'Survival',
+                    'generator': rng.choice(GENERATORS), 'version': version,
+                    'last_played': 1262304000000 + rng.randrange(10 ** 12), 'path': f'D:/dump/saves/world{rng.randrange(50)}',
+                    'total_time': rng.randrange(10 ** 7), 'spawn_location': 'X:12 Y:64 Z:-80',
+                    'data_version': data_version if data_version is not None else 'Unknown',
+                    'difficulty': 'Normal', 'hardcore': 'No', 'allow_commands': 'Yes', 'size_on_disk': 0}
+        else:
+            info = {'filename': 'latest.log', 'world_name': 'Found in Logs', 'game_mode': None,
+                    'version': rng.choice([version, None]), 'path': 'D:/dump/logs'}
+        infos.append((rng.choice(seeds), info))
+
+    cells = lines[:1000] + carved + [f'Wörld {i} 世界' for i in range(200)] + [str(seed) for seed in seeds]
+    return {'lines': lines + carved, 'words': words, 'chunks': chunks, 'levels': levels,
+            'infos': infos, 'cells': cells}
+
+def micro_benchmarks(scanner, inputs):
+    """(name, per-call function, inputs, reset) for every helper that is timed"""
+    state = {}
+
+    def reset_result():
+        state['result'] = scanner.FileResult()
+
+    def reset_unique_seeds():
+        state['seeds'] = scanner.SeedStore()
+
+    return [
+        ('is_potential_seed', scanner.is_potential_seed, inputs['words'], None),
+        ('find_potential_seeds',
+         lambda line: scanner.find_potential_seeds(state['result'], line, 'latest.log', 'D:/dump/logs'),
+         inputs['lines'], reset_result),
+        ('is_meaningful_log', scanner.is_meaningful_log, inputs['lines'], None),
+        ('is_binary_content', scanner.is_binary_content, inputs['chunks'], None),
+        ('find_seed_in_nbt', scanner.find_seed_in_nbt, inputs['levels'], None),
+        ('update_unique_seed_info', lambda item: scanner.update_unique_seed_info(state['seeds'], *item),
+         inputs['infos'], reset_unique_seeds),
+        ('sanitize_text', scanner.sanitize_text, inputs['cells'], None),
+    ]
+
+def time_calls(func, values, repeat, reset=None):
+    """Fastest pass over values in nanoseconds per call, small inputs are looped to fill MICRO_MIN_PASS"""
+    def one_pass(loops):
+        if reset:
+            reset()
+        started = time.perf_counter()
+        for _ in range(loops):
+            for value in values:
+                func(value)
+        return time.perf_counter() - started
+
+    loops = max(1, int(MICRO_MIN_PASS / max(one_pass(1), 1e-9)) + 1)  # First pass also warms caches
+    best = min(one_pass(loops) for _ in range(repeat))
+    return best * 1e9 / (len(values) * loops)
+
+def run_micro(repeat=MICRO_REPEAT, only=None):
+    """Time every helper and return {name: {'calls': n, 'ns_per_call': ns}}"""
+    with open(os.devnull, 'w') as devnull, redirect_stdout(devnull):
+        scanner = load_scanner()
+    inputs = micro_inputs()
+    results = {}
+    for name, func, values, reset in micro_benchmarks(scanner, inputs):
+        if only and name not in only:
+            continue
+        print(f"\r{name}...{' ' * 20}", end="", flush=True)
+        with open(os.devnull, 'w') as devnull, redirect_stdout(devnull):
+            ns = time_calls(func, values, repeat, reset)
+        results[name] = {'calls': len(values), 'ns_per_call': float(f'{ns:.3g}')}
+    print("\r" + " " * 50 + "\r", end="")
+    return results
+
+def micro_main(args):
+    results = run_micro(args.repeat, args.only)
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    old = baseline.get('results', {})
+
+    regressions = []
+    print(f"{'Helper':<26}{'ns/call':>12}{'baseline':>12}")
+    for name, result in results.items():
+        ns = result['ns_per_call']
+        previous = old.get(name, {}).get('ns_per_call')
+        flag = ''
+        if previous and ns > previous * (1 + args.tolerance):
+            flag = '  REGRESSION'
+            regressions.append(name)
+        shown = f"{previous:,.0f}" if previous else '-'
+        print(f"{name:<26}{ns:>12,.0f}{shown:>12}  {change(ns, previous)}{flag}")
+    if baseline and baseline.get('python') != platform_label():
+        print(f"\nNote: baseline was measured on {baseline.get('python')}")
+
+    if args.update or not baseline:
+        updated = dict(old, **results) if args.only else results
+        with open(args.baseline, 'w') as f:
+            json.dump({'python': platform_label(), 'results': updated}, f, indent=2, sort_keys=True)
+            f.write('\n')
+        print(f"\nBaseline written to {args.baseline}")
+        return 0
+    if regressions:
+        print(f"\n{len(regressions)} helper(s) slower than the baseline by more than {args.tolerance:.0%}")
+        return 1
+    return 0
+
+def options_main(args):
+    """Scan a small corpus with overridden settings and check each override took effect"""
+    with open(os.devnull, 'w') as devnull, redirect_stdout(devnull):
+        scanner = load_scanner()
+    directory = tempfile.mkdtemp(prefix='mc_recovery_options_')
+    failures = []
+
+    def check(name, ok, detail):
+        print(f"{name:<40}{'ok' if ok else 'FAILED'}  {detail}")
+        if not ok:
+            failures.append(name)
+
+    try:
+        generate_corpus(directory, OPTIONS_SCALE)
+        top_k = 5
+        records = list(scanner.scan([directory], {'POTENTIAL_SEEDS_TOP_K': top_k, 'LOG_LEVEL': 'ERROR'}))
+        random_strings = [record for record in records if type(record).__name__ == 'RandomStrings']
+        levels = {}
+        for record in random_strings:
+            levels[record[0]] = levels.get(record[0], 0) + 1
+        check('POTENTIAL_SEEDS_TOP_K', random_strings and max(levels.values()) <= top_k,
+              f"{len(random_strings)} Random Strings rows, {top_k} per confidence level allowed")
+        check('settings restored after scan()', scanner.POTENTIAL_SEEDS_TOP_K != top_k,
+              f"POTENTIAL_SEEDS_TOP_K = {scanner.POTENTIAL_SEEDS_TOP_K}")
+
+        previous = scanner.apply_options({'MAX_READER_THREADS': 3, 'MAX_WORKER_PROCESSES': 2, 'SKETCH_WIDTH': 1024})
+        try:
+            limits = scanner.ConcurrencyController().limits
+            tracker = scanner.PotentialSeedTracker()
+        finally:
+            scanner.apply_options(previous)
+        check('MAX_READER_THREADS/MAX_WORKER_PROCESSES', limits == {'readers': 3, 'workers': 2}, f"limits {limits}")
+        check('SKETCH_WIDTH', tracker.width == 1024 and len(tracker.sketch[0]) == 1024, f"width {tracker.width}")
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+    if failures:
+        print(f"\n{len(failures)} option(s) ignored by the scan")
+        return 1
+    return 0
+
+def platform_label():
+    return f"Python {platform.python_version()} on {platform.system()} {platform.machine()}"
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark nbtparsedat-v3.py on a synthetic recovery dump")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    corpus = commands.add_parser('corpus', help="build the synthetic corpus")
+    scan = commands.add_parser('scan', help="build the corpus if needed and time full scans")
+    for command in (corpus, scan):
+        command.add_argument('--scale', type=float, default=1.0, help="multiply the number of files")
+        command.add_argument('--seed', type=int, default=DEFAULT_SEED, help="random seed for the corpus")
+        command.add_argument('--blob-mb', type=int, default=CORPUS_BLOB_MB, help="size of each noise blob")
+    corpus.add_argument('corpus', nargs='?', default=DEFAULT_CORPUS)
+    scan.add_argument('--corpus', default=DEFAULT_CORPUS)
+    scan.add_argument('--repeat', type=int, default=3, help="scans to run, the median is reported")
+    scan.add_argument('--format', default='xlsx', help="output format to write (xlsx, csv, jsonl, sqlite)")
+    scan.add_argument('--save', help="write the report as JSON for a later --compare")
+    scan.add_argument('--compare', help="report changes against a saved report")
+
+    micro = commands.add_parser('micro', help="time the hot helper functions against a JSON baseline")
+    micro.add_argument('--baseline', default=MICRO_BASELINE, help="baseline JSON to compare with")
+    micro.add_argument('--update', action='store_true', help="write the results as the new baseline")
+    micro.add_argument('--repeat', type=int, default=MICRO_REPEAT, help="passes per helper, the fastest counts")
+    micro.add_argument('--tolerance', type=float, default=MICRO_TOLERANCE, help="allowed slowdown before failing")
+    micro.add_argument('--only', nargs='+', help="helpers to time (default all)")
+
+    commands.add_parser('options', help="check that scan() options reach the scan")
+
+    once = commands.add_parser('once', help="scan once in this process and print JSON (used by scan)")
+    once.add_argument('corpus')
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'micro':
+        return micro_main(args)
+    if args.command == 'options':
+        return options_main(args)
+    if args.command == 'once':
+        print(json.dumps(scan_once(os.path.abspath(args.corpus))))
+        return 0
+
+    directory = os.path.abspath(args.corpus)
+    manifest = load_manifest(directory)
+    wanted = {'version': CORPUS_VERSION, 'seed': args.seed, 'scale': args.scale, 'blob_mb': args.blob_mb}
+    if args.command == 'corpus' or not manifest or any(manifest.get(key) != value for key, value in wanted.items()):
+        print(f"Generating corpus in {directory}...")
+        started = time.perf_counter()
+        manifest = generate_corpus(directory, args.scale, args.seed, args.blob_mb)
+        print(f"{manifest['files']} files, {manifest['bytes'] / 1048576:.1f} MB, "
+              f"{len(manifest['seeds'])} planted seeds ({time.perf_counter() - started:.1f}s)")
+    if args.command == 'corpus':
+        return 0
+
+    runs = []
+    for i in range(args.repeat):
+        print(f"\rScan {i + 1}/{args.repeat}...", end="", flush=True)
+        runs.append(run_scan(directory, args.format))
+    print()
+    summary = summarize(runs)
+    summary['corpus'] = wanted
+    summary['format'] = args.format
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if baseline.get('corpus') != wanted:
+            print(f"WARNING: {args.compare} was measured on a different corpus {baseline.get('corpus')}")
+    print_report(summary, baseline)
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump(summary, f, indent=2)
+        print(f"\nSaved {args.save}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
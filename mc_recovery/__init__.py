@@ -0,0 +1,28 @@
+"""Importable scanner: the engine stays in nbtparsedat-v3.py, the single file users download
+
+    from mc_recovery import scan
+
+    for record in scan(['D:/dump'], {'MAX_TIMEOUT': 10}):
+        print(type(record).__name__, record)
+"""
+
+import importlib.util
+import os
+import sys
+
+ENGINE_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'nbtparsedat-v3.py')
+
+# Registered under a real module name so process pool workers can unpickle its functions
+engine = sys.modules.get(__name__ + '.engine')
+if engine is None:
+    _spec = importlib.util.spec_from_file_location(__name__ + '.engine', ENGINE_PATH)
+    engine = importlib.util.module_from_spec(_spec)
+    sys.modules[_spec.name] = engine
+    _spec.loader.exec_module(engine)
+
+scan = engine.scan
+cli = engine.cli
+RECORD_TYPES = engine.RECORD_TYPES
+SCAN_OPTIONS = engine.SCAN_OPTIONS
+
+__all__ = ['scan', 'cli', 'engine', 'RECORD_TYPES', 'SCAN_OPTIONS']
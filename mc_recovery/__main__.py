@@ -0,0 +1,7 @@
+import sys
+
+from mc_recovery import cli, engine
+
+if sys.argv[1:2] == ['db']:
+    sys.exit(engine.db_main(sys.argv[2:]))
+sys.exit(cli(sys.argv[1:]))
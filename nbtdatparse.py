@@ -1,18 +1,124 @@
 import nbtlib
 import os
 import gzip
+import logging
+from collections import deque
 from openpyxl import Workbook, load_workbook
 
 # Set the directory path
 directory_path = 'C:/Users/juke32/AppData/Roaming/.minecraft'
 directory_path = 'D:/dump'
 
+# Console output, DEBUG also dumps the text of every gzip-readable .dat (slow on big dumps)
+LOG_LEVEL = os.environ.get('MC_RECOVERY_LOG_LEVEL', 'INFO').upper()
+WARNING_REPEAT_LIMIT = 5  # Warnings shown per message kind, the rest are only counted
+
+class RepeatFilter(logging.Filter):
+    """Let the first WARNING_REPEAT_LIMIT warnings of each message template through"""
+
+    def __init__(self):
+        super().__init__()
+        self.counts = {}
+
+    def filter(self, record):
+        if record.levelno < logging.WARNING:
+            return True
+        count = self.counts.get(record.msg, 0) + 1
+        self.counts[record.msg] = count
+        return count <= WARNING_REPEAT_LIMIT
+
+logging.basicConfig(level=getattr(logging, LOG_LEVEL, logging.INFO), format='%(message)s')
+log = logging.getLogger('nbtdatparse')
+repeat_filter = RepeatFilter()
+log.addFilter(repeat_filter)
+
+def normalize_seed(value):
+    """Normalize a seed to an int64 when possible, otherwise a stripped string"""
+    if isinstance(value, int):  # nbtlib numeric tags are int subclasses
+        return int(value)
+    text = str(value).strip()
+    try:
+        number = int(text)
+    except ValueError:
+        return text
+    if -2**63 <= number < 2**63:
+        return number
+    return text
+
+class SeedMatcher:
+    """Ignored seeds as a hash set for exact checks and an Aho-Corasick automaton for log lines"""
+    
+    def __init__(self, seeds=()):
+        self.seeds = set()
+        self.goto = [{}]  # Trie transitions per state
+        self.fail = [0]  # Failure link per state
+        self.match = [False]  # True if some seed ends at this state
+        self.built = True
+        for seed in seeds:
+            self.add(seed)
+    
+    def __contains__(self, seed):
+        return normalize_seed(seed) in self.seeds
+    
+    def __len__(self):
+        return len(self.seeds)
+    
+    def add(self, seed):
+        """Add a seed, return False if it was already known"""
+        seed = normalize_seed(seed)
+        if seed == '' or seed in self.seeds:
+            return False
+        self.seeds.add(seed)
+        state = 0
+        for ch in str(seed):
+            next_state = self.goto[state].get(ch)
+            if next_state is None:
+                next_state = len(self.goto)
+                self.goto[state][ch] = next_state
+                self.goto.append({})
+                self.fail.append(0)
+                self.match.append(False)
+            state = next_state
+        self.match[state] = True
+        self.built = False
+        return True
+    
+    def build(self):
+        """Compute failure links breadth-first"""
+        queue = deque(self.goto[0].values())
+        for state in queue:
+            self.fail[state] = 0
+        while queue:
+            state = queue.popleft()
+            for ch, next_state in self.goto[state].items():
+                fallback = self.fail[state]
+                while fallback and ch not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[next_state] = self.goto[fallback].get(ch, 0)
+                self.match[next_state] = self.match[next_state] or self.match[self.fail[next_state]]
+                queue.append(next_state)
+        self.built = True
+    
+    def found_in(self, line):
+        """Return True if any ignored seed occurs in the line, in a single pass over it"""
+        if not self.built:
+            self.build()
+        goto, fail, match = self.goto, self.fail, self.match
+        state = 0
+        for ch in line:
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if match[state]:
+                return True
+        return False
+
 # Example of ignored seeds
-ignored_seeds = [
+ignored_seeds = SeedMatcher([
     "1234567890",  # Example seed to ignore
     "9876543210"   # Another example seed to ignore
 
-]
+])
 
 # Create a new Excel workbook
 wb = Workbook()
@@ -81,9 +187,11 @@ try:
     existing_wb = load_workbook(filename=os.path.join(directory_path, "minecraft_worlds.xlsx"))
     existing_ws = existing_wb['Tried Seeds']
     for row in range(2, existing_ws.max_row + 1):
-        ignored_seeds.append(str(existing_ws[f'A{row}'].value))  # Ensure it's a string
+        value = existing_ws[f'A{row}'].value
+        if value is not None:
+            ignored_seeds.add(value)
 except Exception as e:
-    print(f"Error loading existing tried seeds: {e}")
+    log.warning("Error loading existing tried seeds: %s", e)
 
 # Iterate through all .dat files in the directory and its subdirectories
 for root, dirs, files in os.walk(directory_path):
@@ -93,14 +201,15 @@ for root, dirs, files in os.walk(directory_path):
             
             processed_files += 1
             
-            try:
-                # Attempt to open .dat file as if it were a .gz file
-                with gzip.open(file_path, 'rt', encoding='utf-8', errors='ignore') as f:
-                    print(f"Successfully opened {filename} as .gz")
-                    for line in f:
-                        print(line.strip())
-            except OSError as e:
-                print(f"Error opening {filename} as .gz: {e}")
+            if log.isEnabledFor(logging.DEBUG):
+                try:
+                    # Attempt to open .dat file as if it were a .gz file
+                    with gzip.open(file_path, 'rt', encoding='utf-8', errors='ignore') as f:
+                        log.debug("Successfully opened %s as .gz", filename)
+                        for line in f:
+                            log.debug(line.strip())
+                except OSError as e:
+                    log.debug("Error opening %s as .gz: %s", filename, e)
                 
             try:
                 # Load the NBT file
@@ -113,39 +222,38 @@ for root, dirs, files in os.walk(directory_path):
                 # Try to extract each piece of data individually
                 try:
                     seed = str(var.root['Data']['RandomSeed'])
-                    if seed in ignored_seeds:  # Check if seed is ignored
-                        print(f"Ignoring seed {seed} from {filename}")
+                    if var.root['Data']['RandomSeed'] in ignored_seeds:  # Check if seed is ignored
+                        log.info("Ignoring seed %s from %s", seed, filename)
                         row_data += 1  # Skip this entry if seed is ignored
                         continue
                     
                     ws_data[f'B{row_data}'] = seed
                     
-                    # Add seed to ignored seeds list if not already there
-                    if seed not in ignored_seeds:
-                        ignored_seeds.append(seed)
+                    # Add seed to ignored seeds if not already there
+                    if ignored_seeds.add(var.root['Data']['RandomSeed']):
                         ws_tried_seeds[f'A{row_tried_seeds}'] = seed
                         row_tried_seeds += 1
                 except Exception as e:
                     ws_data[f'B{row_data}'] = f"Error: {e}"
-                    print(f"Error extracting RandomSeed from {filename}: {e}")
+                    log.warning("Error extracting RandomSeed from %s: %s", filename, e)
                     
                 try:
                     ws_data[f'C{row_data}'] = var.root['Data']['Time']
                 except Exception as e:
                     ws_data[f'C{row_data}'] = f"Error: {e}"
-                    print(f"Error extracting Time from {filename}: {e}")
+                    log.warning("Error extracting Time from %s: %s", filename, e)
                     
                 try:
                     ws_data[f'D{row_data}'] = var.root['Data']['generatorName']
                 except Exception as e:
                     ws_data[f'D{row_data}'] = f"Error: {e}"
-                    print(f"Error extracting generatorName from {filename}: {e}")
+                    log.warning("Error extracting generatorName from %s: %s", filename, e)
                     
                 try:
                     ws_data[f'E{row_data}'] = var.root['Data']['LevelName']
                 except Exception as e:
                     ws_data[f'E{row_data}'] = f"Error: {e}"
-                    print(f"Error extracting LevelName from {filename}: {e}")
+                    log.warning("Error extracting LevelName from %s: %s", filename, e)
                     
                 try:
                     if var.root['Data']['GameType'] == 0:
@@ -158,14 +266,14 @@ for root, dirs, files in os.walk(directory_path):
                         ws_data[f'F{row_data}'] = 'Spectator'
                 except Exception as e:
                     ws_data[f'F{row_data}'] = f"Error: {e}"
-                    print(f"Error extracting GameType from {filename}: {e}")
+                    log.warning("Error extracting GameType from %s: %s", filename, e)
                     
                 try:
                     spawn_location = f"X={var.root['Data']['SpawnX']}, Y={var.root['Data']['SpawnY']}, Z={var.root['Data']['SpawnZ']}"
                     ws_data[f'G{row_data}'] = spawn_location
                 except Exception as e:
                     ws_data[f'G{row_data}'] = f"Error: {e}"
-                    print(f"Error extracting Spawn Location from {filename}: {e}")
+                    log.warning("Error extracting Spawn Location from %s: %s", filename, e)
                 
                 saved_entries += 1
                 row_data += 1
@@ -173,21 +281,21 @@ for root, dirs, files in os.walk(directory_path):
                 ws_errors[f'A{row_errors}'] = filename
                 ws_errors[f'B{row_errors}'] = f"ValueError: {e} while processing {filename}"
                 ws_errors[f'C{row_errors}'] = os.path.dirname(file_path)
-                print(f"ValueError in {filename}: {e}")
+                log.warning("ValueError in %s: %s", filename, e)
                 errors_encountered += 1
                 row_errors += 1
             except TypeError as e:
                 ws_errors[f'A{row_errors}'] = filename
                 ws_errors[f'B{row_errors}'] = f"TypeError: {e} while processing {filename}"
                 ws_errors[f'C{row_errors}'] = os.path.dirname(file_path)
-                print(f"TypeError in {filename}: {e}")
+                log.warning("TypeError in %s: %s", filename, e)
                 errors_encountered += 1
                 row_errors += 1
             except Exception as e:
                 ws_errors[f'A{row_errors}'] = filename
                 ws_errors[f'B{row_errors}'] = f"Error: {e} while processing {filename}"
                 ws_errors[f'C{row_errors}'] = os.path.dirname(file_path)
-                print(f"Error processing {filename}: {e}")
+                log.warning("Error processing %s: %s", filename, e)
                 errors_encountered += 1
                 row_errors += 1
 
@@ -205,7 +313,7 @@ for root, dirs, files in os.walk(directory_path):
                             seed_command_encountered = True
                         elif seed_command_encountered:
                             if 'seed' in line.lower() and 'level.dat' not in file_path:
-                                seed_match = [seed for seed in ignored_seeds if seed in line]
+                                seed_match = ignored_seeds.found_in(line)
                                 if not seed_match:
                                     ws_log[f'A{row_log}'] = filename
                                     ws_log[f'B{row_log}'] = os.path.dirname(file_path)
@@ -213,26 +321,29 @@ for root, dirs, files in os.walk(directory_path):
                                     row_log += 1
                             seed_command_encountered = False
                         elif 'seed' in line.lower() and 'level.dat' not in file_path:
-                            seed_match = [seed for seed in ignored_seeds if seed in line]
+                            seed_match = ignored_seeds.found_in(line)
                             if not seed_match:
                                 ws_log[f'A{row_log}'] = filename
                                 ws_log[f'B{row_log}'] = os.path.dirname(file_path)
                                 ws_log[f'C{row_log}'] = line.strip()
                                 row_log += 1
             except Exception as e:
-                print(f"Error reading {filename}: {e}")
+                log.warning("Error reading %s: %s", filename, e)
 
 # Save the workbook to location
 output_dir = directory_path  
 if not os.path.exists(output_dir):
     os.makedirs(output_dir)
 wb.save(os.path.join(output_dir, "minecraft_worlds.xlsx"))
-print("Workbook saved successfully.")
+log.info("Workbook saved successfully.")
 
 # Print summary
-print(f"Total .dat files processed: {processed_files}")
-print(f"Entries successfully saved to Excel: {saved_entries}")
-print(f"Errors encountered during processing: {errors_encountered}")
+for template, count in repeat_filter.counts.items():
+    if count > WARNING_REPEAT_LIMIT:
+        log.info("%d more warnings like: %s", count - WARNING_REPEAT_LIMIT, template.replace('%s', '...'))
+log.info("Total .dat files processed: %d", processed_files)
+log.info("Entries successfully saved to Excel: %d", saved_entries)
+log.info("Errors encountered during processing: %d", errors_encountered)
 
 # Pause before closing
 input("Press Enter to continue...")
@@ -3,7 +3,7 @@
 import sys
 import platform
 import signal
-from contextlib import contextmanager
+from contextlib import contextmanager, nullcontext
 import threading
 import queue
 from functools import wraps
@@ -26,32 +26,211 @@ LARGE_FILE_THRESHOLD = 10 * 1024 * 1024  # 10MB
 CHUNK_SIZE = 8192  # Read in 8KB chunks for large files
 MAX_SAMPLE_LINES = 5000  # Maximum lines to sample from large files
 
+# Decompression limits (protect against zip bombs and corrupted carvings)
+MAX_DECOMPRESSED_SIZE = 512 * 1024 * 1024  # Stop inflating a log after 512MB of output
+MAX_NBT_DECOMPRESSED_SIZE = 32 * 1024 * 1024  # level.dat is tiny, anything past 32MB is bogus
+MAX_COMPRESSION_RATIO = 250  # Abort when output grows past 250x the compressed input
+RATIO_CHECK_MIN_OUTPUT = 4 * 1024 * 1024  # Only enforce the ratio after 4MB of output
+DECOMPRESS_CHUNK_SIZE = 64 * 1024  # Inflate 64KB at a time
+MAX_LINE_LENGTH = 64 * 1024  # Split runaway "lines" (binary data without newlines)
+
+# Huge file settings (multi-GB DMDE blobs are scanned in windows instead of skipped)
+HUGE_FILE_THRESHOLD = 2 * 1024 * 1024 * 1024  # Files above 2GB use the windowed scanner
+HUGE_FILE_WINDOW_SIZE = 64 * 1024 * 1024  # Map and scan 64MB at a time
+HUGE_FILE_WINDOW_OVERLAP = MAX_LINE_LENGTH  # Extra bytes mapped on each side so boundary lines stay whole
+HUGE_FILE_EXTENSIONS = ('.dat', '.dat_old', '.gz')  # DMDE raw signature outputs (.log/.txt use the parallel scanner)
+
+# Parallel log scanning (a single huge uncompressed log is split across processes)
+PARALLEL_LOG_THRESHOLD = 256 * 1024 * 1024  # Logs above 256MB are scanned in parallel
+PARALLEL_LOG_RANGE_SIZE = 32 * 1024 * 1024  # Each worker task handles about 32MB of lines
+PARALLEL_LOG_WORKERS = os.cpu_count() or 1  # Number of worker processes
+
+# Adaptive concurrency (prefetch threads keep the disk busy, worker processes run the file processors)
+ADAPTIVE_CONCURRENCY = False  # Tune reader and worker counts while scanning (multi-core machines, slow disks), False = one file at a time
+MAX_READER_THREADS = 4  # Prefetch readers, a spinning drive usually settles on 1
+MAX_WORKER_PROCESSES = os.cpu_count() or 1  # Processor workers, one runs in this process, more use a process pool
+PREFETCH_WINDOW = 64  # Files read ahead of the one being merged
+PREFETCH_WINDOW_BYTES = 256 * 1024 * 1024  # Bytes read ahead and held in memory until their file is processed
+PREFETCH_MAX_FILE_SIZE = 64 * 1024 * 1024  # Bigger files are streamed by their processor instead
+CONCURRENCY_INTERVAL = 2.0  # Seconds between tuning steps
+CONCURRENCY_MIN_FILES = 8  # Files an interval must finish before its throughput counts
+CONCURRENCY_MIN_GAIN = 0.1  # An added thread must raise throughput 10%, a removed one may cost at most 10%
+CONCURRENCY_HOLD = 3  # Intervals a thread count rests after a step that didn't pay off
+IO_BOUND_WAIT = 0.25  # Share of worker time spent waiting on prefetch that makes the scan I/O bound
+
+# Random Strings limits (memory stays flat no matter how many numbers a dump contains)
+POTENTIAL_SEEDS_TOP_K = 50000  # Tokens kept with full context per confidence level
+SKETCH_WIDTH = 1 << 20  # Count-min sketch counters per row
+SKETCH_DEPTH = 4  # Count-min sketch rows
+BLOOM_BITS = 1 << 26  # Bloom filter size in bits (8MB)
+BLOOM_HASHES = 4  # Bits set per Bloom filter key
+
+# Output settings
+OUTPUT_FORMAT = os.environ.get('MC_RECOVERY_OUTPUT', 'xlsx').lower()  # xlsx, csv, jsonl or sqlite
+OUTPUT_BASENAME = "minecraft_worlds_recovery"  # Output file name, csv/jsonl add _<sheet> per table
+STREAMING_OUTPUT = True  # Stream rows with an openpyxl write_only workbook (flat memory, fast save)
+EXCEL_ROW_LIMIT = 1048576  # Rows per sheet (header included) before rolling over to "Log Results (2)" etc.
+EXCEL_SPLIT_WORKBOOKS = False  # Put overflow sheets in extra files, "minecraft_worlds_recovery (2).xlsx" etc.
+BACKGROUND_WRITER = True  # Sanitize and write rows on a separate thread while scanning continues
+OUTPUT_QUEUE_SIZE = 10000  # Rows buffered for the writer thread before scanning waits
+STATS_JSON = True  # Also write the Stats sheet as minecraft_worlds_recovery_stats.json
+SLOWEST_FILES_COUNT = 100  # Rows in the Slowest Files sheet
+LATENCY_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1, 2, 5)  # Histogram upper bounds in seconds, slower goes in the last column
+NEAR_TIMEOUT_RATIO = 0.8  # Files that used this much of their timeout count as near misses
+EVENTS_PATH = os.environ.get('MC_RECOVERY_EVENTS')  # JSONL event stream file, '-' for stdout (console text moves to stderr), None = off
+EVENT_PROGRESS_INTERVAL = 2.0  # Seconds between progress events
+EVENT_STALL_SECONDS = 60  # Emit a stall event once a single file has taken this long
+RESULTS_DB_ENABLED = True  # Also record every run in an indexed SQLite database
+RESULTS_DB_PATH = os.environ.get('MC_RECOVERY_DB')  # Shared database for several drives, None = next to the output
+
+# Console settings (console I/O is slow on Windows, keep it off the per-file path)
+LOG_LEVEL = os.environ.get('MC_RECOVERY_LOG_LEVEL', 'INFO').upper()  # DEBUG, INFO, WARNING or ERROR
+PROGRESS_INTERVAL = 0.25  # Seconds between progress line redraws
+WARNING_REPEAT_LIMIT = 5  # Warnings shown per message kind, the rest are counted and summarized
+
+# Gzip catalog settings
+DEDUP_GZ_LOGS = True  # Don't inflate gzip files whose CRC32 and size match one already scanned, repeat its findings under the copy's name
+
+# Settings scan() options may override, every upper-case name defined above
+SCAN_OPTIONS = frozenset(name for name in list(globals()) if name.isupper()) | {'IGNORED_SEEDS'}
+
 def truncate(text, length=32):
     """Truncate text to specified length"""
     if len(text) <= length:
         return text
     return text[:length-3] + "..."
 
-print("\n=== Python Environment Info ===")
-print(truncate(f"Python: {sys.version.split()[0]}"))
-print(truncate(f"System: {platform.system()}"))
-print("=============================\n")
-
-try:
-    print("Importing nbtlib...")
-    import nbtlib
-    print("Import successful")
-except ImportError as e:
-    print("\nERROR: Missing nbtlib package")
-    print("Run: pip install nbtlib")
-    input("\nPress Enter to exit...")
-    sys.exit(1)
-
+import csv
+import bisect
+import collections
 import gzip
+import hashlib
+import heapq
+import importlib.util
+import io
+import itertools
+import json
+import logging
+import mmap
+import multiprocessing
+import random
 import re
+import sqlite3
+import struct
+import time
+import uuid
+import zlib
+from array import array
+from datetime import datetime
 import traceback
-from openpyxl import Workbook, load_workbook
-from openpyxl.styles import PatternFill
+from concurrent.futures import ProcessPoolExecutor
+
+class ProgressLine:
+    """One \\r progress line, redrawn at most every PROGRESS_INTERVAL seconds"""
+    
+    def __init__(self):
+        self.last = 0.0
+        self.active = False  # Cursor is at the end of an unfinished progress line
+        self.enabled = False  # Only the command line draws progress, embedded scans stay quiet
+        self.lock = threading.Lock()
+    
+    def update(self, text, force=False):
+        now = time.perf_counter()
+        if not force and now - self.last < PROGRESS_INTERVAL:
+            return
+        self.last = now
+        if not self.enabled or not log.isEnabledFor(logging.INFO):
+            return
+        with self.lock:
+            stream = console_stream()
+            stream.write('\r' + text)
+            stream.flush()
+            self.active = True
+    
+    def end(self, text=None):
+        """Draw a final state (if given) and move to a fresh line"""
+        if text:
+            self.update(text, force=True)
+        self.break_line()
+    
+    def break_line(self):
+        with self.lock:
+            if self.active:
+                console_stream().write('\n')
+                self.active = False
+
+class ConsoleHandler(logging.StreamHandler):
+    """Finish an unfinished progress line before writing a message"""
+    
+    def __init__(self):
+        super().__init__()
+    
+    def emit(self, record):
+        self.stream = console_stream()
+        progress.break_line()
+        super().emit(record)
+
+class ConsoleFormatter(logging.Formatter):
+    def format(self, record):
+        message = super().format(record)
+        return message if record.levelno < logging.WARNING else f"{record.levelname.title()}: {message}"
+
+class RepeatFilter(logging.Filter):
+    """Show the first WARNING_REPEAT_LIMIT warnings of each message template, count the rest"""
+    
+    def __init__(self):
+        super().__init__()
+        self.counts = {}
+        self.last_args = {}  # Template -> args of the latest suppressed record, formatted only for the summary
+    
+    def filter(self, record):
+        if record.levelno < logging.WARNING:
+            return True
+        key = record.msg  # The unformatted template, e.g. "Skipping %s (timeout after %.1fs)"
+        count = self.counts.get(key, 0) + 1
+        self.counts[key] = count
+        if count == WARNING_REPEAT_LIMIT:
+            record.msg = f"{record.msg} (more like this are counted, not shown)"
+        elif count > WARNING_REPEAT_LIMIT:
+            self.last_args[key] = record.args
+            return False
+        return True
+    
+    def suppressed(self):
+        """(count, latest message) for every template that went over the limit"""
+        return [(count - WARNING_REPEAT_LIMIT, key % self.last_args[key] if self.last_args[key] else key)
+                for key, count in self.counts.items() if count > WARNING_REPEAT_LIMIT]
+    
+    def clear(self):
+        self.counts.clear()
+        self.last_args.clear()
+
+def console_stream():
+    """Where text for people goes, stderr when the event stream owns stdout"""
+    return sys.stderr if EVENTS_PATH == '-' else sys.stdout
+
+# Silent when imported, the command line attaches the console handler (setup_console)
+log = logging.getLogger('mc_recovery')
+log.addHandler(logging.NullHandler())
+console_handler = ConsoleHandler()
+console_handler.setFormatter(ConsoleFormatter('%(message)s'))
+repeat_filter = RepeatFilter()
+console_handler.addFilter(repeat_filter)
+progress = ProgressLine()
+
+def setup_console():
+    """Log to the console at LOG_LEVEL with the progress line enabled"""
+    log.setLevel(getattr(logging, LOG_LEVEL.upper(), logging.INFO))
+    log.propagate = False
+    if console_handler not in log.handlers:
+        log.addHandler(console_handler)
+    progress.enabled = True
+
+def log_suppressed_warnings():
+    """Summarize warnings the repeat filter held back"""
+    for count, message in repeat_filter.suppressed():
+        log.info("%d more warnings like: %s", count, message)
+    repeat_filter.clear()
 
 # Patterns for finding seeds in logs
 seed_patterns = [
@@ -94,39 +273,570 @@ search_terms = [
 ]
 
 # Example of ignored seeds
-ignored_seeds = [
+IGNORED_SEEDS = [
     "1234567890",
     "9876543210"
 ]
 
-# Global variables for Excel workbook
-wb = None
-ws_data = None
-ws_errors = None
-ws_log = None
-ws_all_seeds = None
-ws_corrupted = None
-ws_potential = None  # Added potential seeds worksheet
-error_fill = None
-unique_seeds = {}
-potential_seeds = {}  # Track potential seeds and their contexts
-
-# Initialize row counters
-row_data = 2
-row_errors = 2
-row_log = 2
-row_all_seeds = 2
-row_corrupted = 2
-
-# Initialize counters for processed and saved files
-processed_files = 0
-saved_entries = 0
-errors_encountered = 0
-corrupted_files = 0
+# Fields kept for every unique seed, in All Seeds column order
+SEED_FIELDS = (
+    'filename', 'world_name', 'game_mode', 'generator', 'version', 'last_played', 'path',
+    'total_time', 'spawn_location', 'data_version', 'difficulty', 'hardcore',
+    'allow_commands', 'size_on_disk'
+)
+SEED_FIELD_SET = frozenset(SEED_FIELDS)
+# Values repeated across thousands of seeds share one string object
+INTERNED_SEED_FIELDS = frozenset((
+    'filename', 'world_name', 'game_mode', 'generator', 'version', 'path',
+    'difficulty', 'hardcore', 'allow_commands'
+))
+JAVA_LONG_MIN = -2 ** 63
+JAVA_LONG_MAX = 2 ** 63 - 1
+
+def normalize_seed(value):
+    """Normalize a seed to a Java long int, values that aren't integers stay stripped strings"""
+    if isinstance(value, int):  # nbtlib numeric tags are int subclasses
+        number = int(value)
+    else:
+        text = str(value).strip()
+        try:
+            number = int(text)
+        except ValueError:
+            return text
+    if JAVA_LONG_MIN <= number <= JAVA_LONG_MAX:
+        return number
+    return str(number)
+
+class SeedRecord:
+    """Everything known about one unique seed, in slots instead of a per-seed dict"""
+    __slots__ = SEED_FIELDS + ('times_found',)
+    
+    def __init__(self):
+        self.filename = self.world_name = self.game_mode = self.generator = 'Unknown'
+        self.version = self.last_played = self.path = self.total_time = 'Unknown'
+        self.spawn_location = self.data_version = self.difficulty = self.hardcore = 'Unknown'
+        self.allow_commands = self.size_on_disk = 'Unknown'
+        self.times_found = 0
+
+class SeedStore(dict):
+    """Unique seeds keyed by their normalized int64 value, one SeedRecord each"""
+    
+    def record_for(self, seed):
+        """Return the record for a seed, creating an empty one the first time"""
+        key = normalize_seed(seed)
+        record = self.get(key)
+        if record is None:
+            record = self[key] = SeedRecord()
+        return record
+
+# Mersenne prime modulus for the count-min sketch row hashes
+SKETCH_PRIME = (1 << 61) - 1
+
+def normalize_token(word):
+    """Normalize a seed-like token (plain or scientific notation) to an int"""
+    try:
+        return int(word)
+    except ValueError:
+        return int(float(word))
+
+class PotentialSeedTracker:
+    """Memory-bounded Random Strings aggregation
+    
+    A Bloom filter dedups (file, token) sightings so a count-min sketch can track in
+    how many files each token appears. Full context is only kept for the top
+    POTENTIAL_SEEDS_TOP_K tokens per confidence level, ranked by that file count.
+    Sizes left as None come from the settings when the tracker is created.
+    """
+    
+    def __init__(self, top_k=None, width=None, depth=None, bloom_bits=None, bloom_hashes=None):
+        self.top_k = POTENTIAL_SEEDS_TOP_K if top_k is None else top_k
+        self.width = SKETCH_WIDTH if width is None else width
+        self.bloom_bits = BLOOM_BITS if bloom_bits is None else bloom_bits
+        self.bloom_hashes = BLOOM_HASHES if bloom_hashes is None else bloom_hashes
+        depth = SKETCH_DEPTH if depth is None else depth
+        # Fixed seed so counts are reproducible between runs
+        rng = random.Random(0x5EED)
+        self.sketch_params = [(rng.randrange(1, SKETCH_PRIME) | 1, rng.randrange(SKETCH_PRIME)) for _ in range(depth)]
+        self.clear()
+    
+    def clear(self):
+        """Forget everything seen so far"""
+        self.sketch = [array('I', bytes(4 * self.width)) for _ in self.sketch_params]
+        self.bloom = bytearray(self.bloom_bits // 8)
+        self.entries = {}
+        self.level_sizes = {'Low': 0, 'Medium': 0, 'High': 0}
+        self.distinct_tokens = 0
+    
+    def __len__(self):
+        """Approximate number of distinct tokens seen, including ones no longer kept"""
+        return self.distinct_tokens
+    
+    def bloom_add(self, key):
+        """Set a key's bits, return True if the key had not been added before"""
+        # blake2b, not hash(): str hashes change with PYTHONHASHSEED and the counts would too
+        h = int.from_bytes(hashlib.blake2b(repr(key).encode('utf-8', 'surrogatepass'), digest_size=8).digest(), 'little')
+        h1 = h & 0xFFFFFFFF
+        h2 = (h >> 32) | 1
+        bits = self.bloom
+        is_new = False
+        for i in range(self.bloom_hashes):
+            index = (h1 + i * h2) % self.bloom_bits
+            mask = 1 << (index & 7)
+            if not bits[index >> 3] & mask:
+                bits[index >> 3] |= mask
+                is_new = True
+        return is_new
+    
+    def sketch_indexes(self, token):
+        """Counter index of a token in each sketch row"""
+        return [((token * a + b) % SKETCH_PRIME) % self.width for a, b in self.sketch_params]
+    
+    def files_seen(self, token):
+        """Estimated number of files a token appeared in (never an underestimate)"""
+        return min(row[index] for row, index in zip(self.sketch, self.sketch_indexes(token)))
+    
+    def add(self, word, filename, context, line, root, confidence):
+        """Record one sighting of a token"""
+        token = normalize_token(word)
+        
+        if self.bloom_add(('token', token)):
+            self.distinct_tokens += 1
+        if self.bloom_add((root, filename, token)):
+            # First time in this file: conservative update of the sketch
+            indexes = self.sketch_indexes(token)
+            count = min(row[index] for row, index in zip(self.sketch, indexes)) + 1
+            for row, index in zip(self.sketch, indexes):
+                if row[index] < count:
+                    row[index] = min(count, 0xFFFFFFFF)
+        
+        entry = self.entries.get(token)
+        if entry is None:
+            self.entries[token] = {
+                'filename': filename,
+                'context': context,
+                'line': line,
+                'path': root,
+                'confidence': confidence
+            }
+            self.level_sizes[confidence] += 1
+            if self.level_sizes[confidence] > 2 * self.top_k:
+                self.prune(confidence)
+        # Update if new instance has higher confidence
+        elif confidence_level(confidence) > confidence_level(entry['confidence']):
+            self.level_sizes[entry['confidence']] -= 1
+            self.level_sizes[confidence] += 1
+            entry.update({
+                'context': context,
+                'line': line,
+                'confidence': confidence
+            })
+            if self.level_sizes[confidence] > 2 * self.top_k:
+                self.prune(confidence)
+    
+    def prune(self, confidence):
+        """Drop a level back to its top_k tokens by file count (amortized, runs every top_k adds)"""
+        level = [token for token, entry in self.entries.items() if entry['confidence'] == confidence]
+        level.sort(key=self.files_seen, reverse=True)
+        for token in level[self.top_k:]:
+            del self.entries[token]
+        self.level_sizes[confidence] = min(len(level), self.top_k)
+    
+    def top_entries(self):
+        """Kept tokens, most confident first, then by how many files they were seen in"""
+        ranked = []
+        for confidence in ('High', 'Medium', 'Low'):
+            level = [(self.files_seen(token), token) for token, entry in self.entries.items()
+                     if entry['confidence'] == confidence]
+            level.sort(key=lambda item: item[0], reverse=True)
+            ranked.extend((token, self.entries[token], files) for files, token in level[:self.top_k])
+        return ranked
+
+def add_potential_sighting(potential, level_sizes, key, confidence, context, line):
+    """Keep a seed-like token's sighting in a per-file or per-range dict, if it raises its confidence
+    
+    Only POTENTIAL_SEEDS_TOP_K new tokens are taken per confidence level, which is all the
+    tracker keeps: it ranks by files seen and every token of one file is at one there, so
+    it would keep the first ones. A huge log then can't hold every number it contains.
+    """
+    sightings = potential.get(key)
+    if sightings is None:
+        if level_sizes[confidence] >= POTENTIAL_SEEDS_TOP_K:
+            return
+        potential[key] = [(confidence, context, line)]
+        level_sizes[confidence] += 1
+    elif confidence_level(confidence) > confidence_level(sightings[-1][0]):
+        level_sizes[sightings[-1][0]] -= 1
+        level_sizes[confidence] += 1
+        sightings.append((confidence, context, line))
+
+# Ignored seeds as a hash set of normalized (int64) seeds for constant-time checks
+ignored_seeds = {normalize_seed(seed) for seed in IGNORED_SEEDS}
+
+class RunStats:
+    """Low-overhead perf_counter accumulators per stage and per file type
+    
+    Stages can nest, e.g. 'log scan' includes the 'gzip inflate' time of the lines it reads.
+    """
+    
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.stages = {}  # Stage -> [calls, items, seconds, bytes in, bytes out]
+        self.file_types = {}  # File type -> [files, seconds, bytes]
+        self.latency = {}  # File type -> counts per LATENCY_BUCKETS bucket (+1 for slower)
+        self.near_timeouts = {}  # File type -> files that used NEAR_TIMEOUT_RATIO of their timeout
+        self.timeouts = {}  # File type -> files that timed out
+        self.max_seconds = {}  # File type -> slowest file
+        self.slowest = []  # Min-heap of (seconds, sequence, file type, path, size, timeout)
+        self.sequence = 0
+        self.lock = threading.Lock()  # Stages are timed from worker, prefetch and writer threads
+    
+    def add(self, stage, seconds, bytes_in=0, bytes_out=0, items=0):
+        with self.lock:
+            entry = self.stages.get(stage)
+            if entry is None:
+                entry = self.stages[stage] = [0, 0, 0.0, 0, 0]
+            entry[0] += 1
+            entry[1] += items
+            entry[2] += seconds
+            entry[3] += bytes_in
+            entry[4] += bytes_out
+    
+    @contextmanager
+    def timed(self, stage, bytes_in=0):
+        """Time a block as one call of a stage"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(stage, time.perf_counter() - started, bytes_in)
+    
+    def merge_stages(self, stages):
+        """Add stage totals measured elsewhere, e.g. in a worker process"""
+        for stage, (calls, items, seconds, bytes_in, bytes_out) in stages.items():
+            with self.lock:
+                entry = self.stages.get(stage)
+                if entry is None:
+                    entry = self.stages[stage] = [0, 0, 0.0, 0, 0]
+                entry[0] += calls
+                entry[1] += items
+                entry[2] += seconds
+                entry[3] += bytes_in
+                entry[4] += bytes_out
+    
+    def add_file(self, file_type, seconds, size, path=None, timeout=None):
+        """Record one processed file, timeout is the limit it ran under (None if unlimited)"""
+        entry = self.file_types.get(file_type)
+        if entry is None:
+            entry = self.file_types[file_type] = [0, 0.0, 0]
+            self.latency[file_type] = [0] * (len(LATENCY_BUCKETS) + 1)
+            self.near_timeouts[file_type] = 0
+            self.max_seconds[file_type] = 0.0
+        entry[0] += 1
+        entry[1] += seconds
+        entry[2] += size
+        self.latency[file_type][bisect.bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        if seconds > self.max_seconds[file_type]:
+            self.max_seconds[file_type] = seconds
+        if timeout and seconds >= timeout * NEAR_TIMEOUT_RATIO:
+            self.near_timeouts[file_type] += 1
+        
+        # Keep only the slowest files
+        if len(self.slowest) < SLOWEST_FILES_COUNT or seconds > self.slowest[0][0]:
+            self.sequence += 1
+            item = (seconds, self.sequence, file_type, path, size, timeout)
+            if len(self.slowest) < SLOWEST_FILES_COUNT:
+                heapq.heappush(self.slowest, item)
+            else:
+                heapq.heapreplace(self.slowest, item)
+    
+    def add_timeout(self, file_type):
+        self.timeouts[file_type] = self.timeouts.get(file_type, 0) + 1
+    
+    def slowest_rows(self):
+        """Slowest Files sheet rows: file type, path, size, seconds, timeout, % of timeout"""
+        return [(file_type, path, size, round(seconds, 3), round(timeout, 2) if timeout else None,
+                 round(seconds * 100 / timeout, 1) if timeout else None)
+                for seconds, _, file_type, path, size, timeout in sorted(self.slowest, reverse=True)]
+    
+    def latency_rows(self):
+        """Latency sheet rows: file type, files, one count per bucket, near timeouts, timeouts, max seconds"""
+        return [(file_type, self.file_types[file_type][0], *self.latency[file_type],
+                 self.near_timeouts[file_type], self.timeouts.get(file_type, 0), round(self.max_seconds[file_type], 3))
+                for file_type in sorted(self.file_types)]
+    
+    def rows(self):
+        """Stats sheet rows: kind, name, count, items, seconds, bytes in, bytes out, MB/s in, per second"""
+        elapsed = time.perf_counter() - self.started
+        rows = [('run', 'total', 1, 0, round(elapsed, 3), 0, 0, None, None)]
+        for stage, (calls, items, seconds, bytes_in, bytes_out) in sorted(self.stages.items(), key=lambda item: -item[1][2]):
+            rows.append(('stage', stage, calls, items, round(seconds, 3), bytes_in, bytes_out,
+                         round(bytes_in / seconds / 1048576, 2) if seconds and bytes_in else None,
+                         round((items or calls) / seconds, 1) if seconds else None))
+        for file_type, (files, seconds, size) in sorted(self.file_types.items()):
+            rows.append(('file type', file_type, files, 0, round(seconds, 3), size, 0,
+                         round(size / seconds / 1048576, 2) if seconds and size else None,
+                         round(files / seconds, 1) if seconds else None))
+        return rows
+    
+    def to_dict(self):
+        return {
+            'elapsed': round(time.perf_counter() - self.started, 3),
+            'stages': {stage: dict(zip(('calls', 'items', 'seconds', 'bytes_in', 'bytes_out'), entry))
+                       for stage, entry in self.stages.items()},
+            'file_types': {file_type: dict(zip(('files', 'seconds', 'bytes'), entry))
+                           for file_type, entry in self.file_types.items()},
+            'latency_buckets': list(LATENCY_BUCKETS),
+            'latency': {row[0]: dict(zip(LATENCY_HEADERS[1:], row[1:])) for row in self.latency_rows()},
+            'slowest_files': [dict(zip(SLOWEST_FILES_HEADERS, row)) for row in self.slowest_rows()],
+        }
+
+STATS_HEADERS = ('Kind', 'Name', 'Count', 'Items', 'Seconds', 'Bytes In', 'Bytes Out', 'MB/s In', 'Per Second')
+SLOWEST_FILES_HEADERS = ('File Type', 'Path', 'Size', 'Seconds', 'Timeout', '% of Timeout')
+LATENCY_HEADERS = (('File Type', 'Files') + tuple(f'<= {bound}s' for bound in LATENCY_BUCKETS)
+                   + (f'> {LATENCY_BUCKETS[-1]}s', 'Near Timeout', 'Timed Out', 'Max Seconds'))
+
+# Stage timings of the running scan (its ScanContext.stats), module level so low-level helpers can time themselves
+run_stats = RunStats()
+
+class FileResult:
+    """Everything scanning one file produced, merged into the run by ScanContext.apply
+    
+    Processors fill one in instead of writing to the sheets and seed tables, so they can
+    run on a timeout thread, in a worker process or on another machine. Seed-like tokens
+    only keep the sightings that raised their confidence, and no more tokens per level
+    than the tracker keeps (add_potential_sighting).
+    """
+    
+    def __init__(self):
+        self.rows = []  # (sheet title, values) in the order they were produced
+        self.seeds = []  # (seed, info) sightings for All Seeds
+        self.potential = {}  # (word, filename, path) -> [(confidence, context, line)]
+        self.potential_levels = collections.Counter()  # Tokens in potential per confidence level
+        self.worlds = []  # (seed, info) for the results database
+        self.log_hits = []  # (seed, filename, path, line) for the results database
+        self.db_errors = []  # (filename, path, message) for the results database
+        self.events = []  # (event, fields) for the event stream
+        self.timeouts = []  # File types that ran out of time
+        self.saved = 0  # Worlds added to Data
+        self.errors = 0
+        self.corrupted = 0
+    
+    def add_row(self, title, values):
+        self.rows.append((title, values))
+    
+    def add_potential(self, word, filename, context, line, root, confidence):
+        add_potential_sighting(self.potential, self.potential_levels, (word, filename, root), confidence, context, line)
+    
+    def error(self, filename, message, root, traceback_str=None):
+        """Count an error and add its Errors row, results database entry and event"""
+        self.errors += 1
+        self.add_row("Errors", (filename, message, root) if traceback_str is None else (filename, message, root, traceback_str))
+        self.db_errors.append((filename, root, message))
+        self.events.append(('error', {'file': filename, 'path': root, 'message': message}))
+    
+    def data_error(self, filename, message, root):
+        """Add a highlighted error row for a file to Data"""
+        self.add_row("Data", (filename, message, None, None, None, None, None, root,
+                              None, None, None, None, None, None, None, Highlight("Yes")))
+    
+    def copy_for(self, filename, root):
+        """The log findings again for a byte-identical copy of the file at filename/root"""
+        copy = FileResult()
+        copy.rows = [(title, (filename, root) + tuple(values[2:])) for title, values in self.rows if title == "Log Results"]
+        copy.seeds = [(seed, dict(info, filename=filename, path=root)) for seed, info in self.seeds]
+        copy.potential = {(word, filename, root): list(sightings) for (word, _, _), sightings in self.potential.items()}
+        copy.potential_levels = collections.Counter(self.potential_levels)
+        copy.log_hits = [(seed, filename, root, line) for seed, _, _, line in self.log_hits]
+        return copy
+    
+    def timeout(self, file_type, filename, root, timeout):
+        """Note a file that ran out of time, the caller adds its error rows"""
+        self.timeouts.append(file_type)
+        self.events.append(('timeout', {'file_type': file_type, 'file': filename, 'path': root,
+                                        'timeout': round(timeout, 2)}))
+
+class ScanContext:
+    """Per-run state: output sheets, seed tables, counters and the results database
+    
+    Only the thread driving the scan touches it, through apply(). run_stats and events
+    stay module-level hooks pointing at the running scan's, like the logger.
+    """
+    
+    def __init__(self, directory):
+        self.directory = directory  # Output, results database and stats JSON go here
+        self.stats = RunStats()
+        self.sink = None
+        self.writer = None  # OutputWriter feeding sink
+        self.sheets = {}  # Sheet title -> QueuedSheet
+        self.results_db = None  # ResultsDatabase, None when disabled
+        self.unique_seeds = SeedStore()
+        self.potential_seeds = PotentialSeedTracker()  # Track potential seeds and their contexts
+        self.rows = collections.Counter()  # Rows merged from FileResults per sheet
+        self.processed_files = 0
+        self.saved_entries = 0
+        self.errors = 0
+        self.corrupted_files = 0
+    
+    def apply(self, result):
+        """Merge a FileResult, called in file order
+        
+        Each list is swapped out before it is merged, so a processor still running past its
+        timeout can't change it underneath; whatever that processor adds later is dropped.
+        """
+        rows, result.rows = result.rows, []
+        seeds, result.seeds = result.seeds, []
+        potential, result.potential = result.potential, {}
+        worlds, result.worlds = result.worlds, []
+        log_hits, result.log_hits = result.log_hits, []
+        db_errors, result.db_errors = result.db_errors, []
+        result_events, result.events = result.events, []
+        timeouts, result.timeouts = result.timeouts, []
+        
+        for title, values in rows:
+            self.sheets[title].append(values)
+            self.rows[title] += 1
+        for seed, info in seeds:
+            if update_unique_seed_info(self.unique_seeds, seed, info):
+                emit_event('seed', seed=str(normalize_seed(seed)), file=info.get('filename'),
+                           path=info.get('path'), world=info.get('world_name'))
+        for (word, filename, root), sightings in list(potential.items()):
+            for confidence, context, line in sightings:
+                self.potential_seeds.add(word, filename, context, line, root, confidence)
+        if self.results_db:
+            for seed, info in worlds:
+                self.results_db.add_world(seed, info)
+            for seed, filename, root, line in log_hits:
+                self.results_db.add_log_hit(seed, filename, root, line)
+            for filename, root, message in db_errors:
+                self.results_db.add_error(filename, root, message)
+        for file_type in timeouts:
+            self.stats.add_timeout(file_type)
+        for event, fields in result_events:
+            emit_event(event, **fields)
+        
+        self.saved_entries += result.saved
+        self.errors += result.errors
+        self.corrupted_files += result.corrupted
+
+class EventStream:
+    """Machine-readable JSON lines for supervisors and dashboards
+    
+    Progress events come from a heartbeat thread every EVENT_PROGRESS_INTERVAL, so the
+    stream keeps ticking (with the file being worked on) even when a single file stalls.
+    Several files can be in flight at once; the oldest one is reported as the current
+    file, since results are merged in file order and it is the one holding up the rest.
+    """
+    
+    def __init__(self, path):
+        self.path = path
+        self.stream = sys.stdout if path == '-' else open(path, 'a', encoding='utf-8')
+        self.lock = threading.Lock()
+        self.stopped = threading.Event()
+        self.heartbeat = None
+        self.started = time.perf_counter()
+        self.files_done = 0
+        self.files_total = 0
+        self.bytes_done = 0
+        self.bytes_total = 0
+        self.in_flight = {}  # (file type, path) -> [started, stall reported]
+    
+    def emit(self, event, **fields):
+        record = {'ts': round(time.time(), 3), 'event': event}
+        record.update(fields)
+        line = json.dumps(record, default=str)
+        with self.lock:
+            try:
+                self.stream.write(line + '\n')
+                self.stream.flush()
+            except (OSError, ValueError):
+                pass  # A closed pipe must not stop the scan
+    
+    def start(self, files_total, bytes_total):
+        """Announce the scan and start the progress heartbeat"""
+        self.files_total = files_total
+        self.bytes_total = bytes_total
+        self.started = time.perf_counter()
+        self.emit('scan_start', files_total=files_total, bytes_total=bytes_total)
+        self.heartbeat = threading.Thread(target=self.run, name='events', daemon=True)
+        self.heartbeat.start()
+    
+    def file_started(self, file_type, path):
+        with self.lock:
+            self.in_flight[(file_type, path)] = [time.perf_counter(), False]
+    
+    def file_done(self, file_type, path):
+        try:
+            self.bytes_done += os.path.getsize(path)
+        except OSError:
+            pass
+        self.files_done += 1
+        with self.lock:
+            self.in_flight.pop((file_type, path), None)
+    
+    def run(self):
+        while not self.stopped.wait(EVENT_PROGRESS_INTERVAL):
+            self.progress()
+    
+    def progress(self):
+        """Files and bytes done, overall and per-type rates, ETA and the current file"""
+        now = time.perf_counter()
+        elapsed = now - self.started
+        bytes_rate = self.bytes_done / elapsed if elapsed else 0.0
+        remaining = self.bytes_total - self.bytes_done
+        types = {}
+        for file_type, (files, seconds, size) in list(run_stats.file_types.items()):
+            types[file_type] = {'files': files, 'bytes': size,
+                                'files_per_second': round(files / seconds, 1) if seconds else None,
+                                'mb_per_second': round(size / seconds / 1048576, 2) if seconds else None}
+        fields = {
+            'files_done': self.files_done, 'files_total': self.files_total,
+            'bytes_done': self.bytes_done, 'bytes_total': self.bytes_total,
+            'elapsed': round(elapsed, 1),
+            'files_per_second': round(self.files_done / elapsed, 1) if elapsed else None,
+            'mb_per_second': round(bytes_rate / 1048576, 2),
+            'eta_seconds': round(remaining / bytes_rate) if bytes_rate and remaining > 0 else None,
+            'types': types,
+        }
+        stalls = []
+        with self.lock:
+            if self.in_flight:
+                current, (current_started, _) = min(self.in_flight.items(), key=lambda item: item[1][0])
+                fields.update(current_type=current[0], current_file=current[1],
+                              current_seconds=round(now - current_started, 1), files_in_flight=len(self.in_flight))
+            for (file_type, path), state in self.in_flight.items():
+                if now - state[0] >= EVENT_STALL_SECONDS and not state[1]:
+                    state[1] = True
+                    stalls.append((file_type, path, now - state[0]))
+        for file_type, path, seconds in stalls:
+            self.emit('stall', file_type=file_type, path=path, seconds=round(seconds, 1))
+        self.emit('progress', **fields)
+    
+    def close(self, **summary):
+        """Stop the heartbeat, write a last progress event and the run summary"""
+        self.stopped.set()
+        if self.heartbeat:
+            self.heartbeat.join()
+            self.progress()
+        self.emit('run_end', **summary)
+        if self.path != '-':
+            self.stream.close()
+
+events = None  # EventStream for the current run, None when MC_RECOVERY_EVENTS is unset
+
+def emit_event(event, **fields):
+    """Write an event when the event stream is enabled"""
+    if events:
+        events.emit(event, **fields)
 
 class TimeoutException(Exception):
     pass
 
+class DecompressionLimitException(Exception):
+    """Raised when a compressed stream inflates past the configured limits"""
+    def __init__(self, reason, message):
+        super().__init__(message)
+        self.reason = reason  # 'size' or 'ratio'
+
 def timeout_handler(seconds):
     """Cross-platform timeout decorator that works on both Windows and Unix"""
     def decorator(func):
@@ -155,154 +865,781 @@ def timeout_handler(seconds):
         return wrapper
     return decorator
 
-def initialize_excel_workbook():
-    """Initialize Excel workbook and worksheets"""
-    global wb, ws_data, ws_errors, ws_log, ws_all_seeds, ws_corrupted, ws_potential, error_fill
+def table_name(title):
+    """File/table/column name for a sheet title or header, "Random Strings" -> random_strings, "<= 5s" -> le_5s"""
+    title = title.replace('<=', 'le').replace('>', 'gt').replace('%', 'pct')
+    return re.sub(r'\W+', '_', title).strip('_').lower()
+
+class ExcelSheet:
+    """Worksheet wrapper that rejects values openpyxl can't store before they reach the writer"""
+    
+    def __init__(self, sink, ws, title):
+        self.sink = sink
+        self.ws = ws
+        self.title = title
+        self.column_dimensions = ws.column_dimensions
+        self.header = None
+        self.rows = 0  # Rows in the current shard
+        self.shard = 1
+    
+    def append(self, values):
+        """Append one row of values in the sheet's column order"""
+        # A write-only sheet can't take any more rows after a failed one
+        for value in values:
+            if isinstance(value, str):
+                if self.sink.illegal_characters.search(value):
+                    raise self.sink.IllegalCharacterError(f"{value!r} cannot be used in worksheets.")
+            elif value is not None and not isinstance(value, (int, float, self.sink.Cell)):
+                raise ValueError(f"Cannot convert {value!r} to Excel")
+        self.ws.append(values)
+        if self.header is None:
+            self.header = tuple(values)
+        self.rows += 1
+        # Roll over right away so highlighted cells are always created for the sheet they end up in
+        if self.rows >= EXCEL_ROW_LIMIT:
+            self.roll_over()
+    
+    def roll_over(self):
+        """Continue in a new shard with the same header and column widths"""
+        self.shard += 1
+        ws = self.sink.create_shard(self.title, self.shard)
+        for key, dimension in self.column_dimensions.items():
+            ws.column_dimensions[key].width = dimension.width
+        log.info("%s reached %d rows, continuing in shard %d", self.title, EXCEL_ROW_LIMIT, self.shard)
+        self.ws = ws
+        self.rows = 0
+        self.append(self.header)
+    
+    def highlight(self, value):
+        """Cell highlighted with the shared error style"""
+        cell = self.sink.WriteOnlyCell(self.ws, value=value)
+        cell.style = "error"
+        return cell
+
+class ExcelSink:
+    """All result tables as worksheets of one xlsx workbook"""
+    extension = '.xlsx'
+    
+    def __init__(self, path):
+        # Only needed for xlsx output, headless csv/jsonl/sqlite runs never import openpyxl
+        from openpyxl import Workbook
+        from openpyxl.cell import Cell, WriteOnlyCell
+        from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
+        from openpyxl.styles import NamedStyle, PatternFill
+        from openpyxl.utils.exceptions import IllegalCharacterError
+        self.Cell = Cell
+        self.WriteOnlyCell = WriteOnlyCell
+        self.IllegalCharacterError = IllegalCharacterError
+        self.illegal_characters = ILLEGAL_CHARACTERS_RE
+        
+        self.Workbook = Workbook
+        self.NamedStyle = NamedStyle
+        self.PatternFill = PatternFill
+        
+        self.base = path
+        self.path = path + self.extension
+        self.wb = self.new_workbook()
+        self.extra_workbooks = {}  # Shard number -> workbook, with EXCEL_SPLIT_WORKBOOKS
+    
+    def new_workbook(self):
+        wb = self.Workbook(write_only=STREAMING_OUTPUT)
+        if not STREAMING_OUTPUT:
+            wb.remove(wb.active)  # Sheets are created in order by open_sheet
+        
+        # Shared highlight style for errors, registered once instead of a fill per cell
+        error_style = self.NamedStyle(name="error")
+        error_style.fill = self.PatternFill(start_color="FFFF0000", end_color="FFFF0000", fill_type="solid")
+        wb.add_named_style(error_style)
+        return wb
+    
+    def open_sheet(self, title):
+        return ExcelSheet(self, self.wb.create_sheet(title=title), title)
+    
+    def create_shard(self, title, shard):
+        """Worksheet for the overflow rows of a full sheet"""
+        if EXCEL_SPLIT_WORKBOOKS:
+            if shard not in self.extra_workbooks:
+                self.extra_workbooks[shard] = self.new_workbook()
+            return self.extra_workbooks[shard].create_sheet(title=title)
+        return self.wb.create_sheet(title=f"{title} ({shard})")
+    
+    def close(self):
+        self.wb.save(self.path)
+        for shard, wb in self.extra_workbooks.items():
+            wb.save(f"{self.base} ({shard}){self.extension}")
+
+class CsvSheet:
+    """Rows written straight to a CSV file, the first row is the header"""
+    
+    def __init__(self, f):
+        self.writer = csv.writer(f)
+    
+    def append(self, values):
+        self.writer.writerow(values)
+    
+    def highlight(self, value):
+        return value
+
+class CsvSink:
+    """One CSV file per result table"""
+    extension = '.csv'
+    
+    def __init__(self, path):
+        self.base = path
+        self.path = f"{path}_*{self.extension}"
+        self.files = []
+    
+    def open_sheet(self, title):
+        f = open(f"{self.base}_{table_name(title)}{self.extension}", 'w', newline='', encoding='utf-8')
+        self.files.append(f)
+        return CsvSheet(f)
+    
+    def close(self):
+        for f in self.files:
+            f.close()
+
+class JsonlSheet:
+    """One JSON object per line keyed by the header row"""
+    
+    def __init__(self, f):
+        self.f = f
+        self.keys = None
+    
+    def append(self, values):
+        if self.keys is None:
+            self.keys = [table_name(str(key)) for key in values]
+            return
+        self.f.write(json.dumps(dict(zip(self.keys, values)), default=str, ensure_ascii=False))
+        self.f.write('\n')
+    
+    def highlight(self, value):
+        return value
+
+class JsonlSink(CsvSink):
+    """One JSON Lines file per result table"""
+    extension = '.jsonl'
+    
+    def open_sheet(self, title):
+        f = open(f"{self.base}_{table_name(title)}{self.extension}", 'w', encoding='utf-8')
+        self.files.append(f)
+        return JsonlSheet(f)
+
+class SqliteSheet:
+    """Rows inserted into a table whose columns come from the header row"""
+    
+    def __init__(self, conn, table):
+        self.conn = conn
+        self.table = table
+        self.insert = None
+    
+    def append(self, values):
+        if self.insert is None:
+            columns = ', '.join(f'"{table_name(str(key))}"' for key in values)
+            self.conn.execute(f'DROP TABLE IF EXISTS "{self.table}"')
+            self.conn.execute(f'CREATE TABLE "{self.table}" ({columns})')
+            self.insert = f'INSERT INTO "{self.table}" VALUES ({", ".join("?" * len(values))})'
+            return
+        self.conn.execute(self.insert, [value if value is None or isinstance(value, (int, float, str)) else str(value)
+                                        for value in values])
+    
+    def highlight(self, value):
+        return value
+
+class SqliteSink:
+    """All result tables in one SQLite database, committed once at the end"""
+    extension = '.sqlite'
+    
+    def __init__(self, path):
+        self.path = path + self.extension
+        # Rows come from the timeout worker threads too
+        self.conn = sqlite3.connect(self.path, check_same_thread=False)
+    
+    def open_sheet(self, title):
+        return SqliteSheet(self.conn, table_name(title))
+    
+    def close(self):
+        self.conn.commit()
+        self.conn.close()
+
+RECORD_TYPES = {}  # Sheet title -> namedtuple type of the records scan() yields for it
+
+def record_type(title, header):
+    """namedtuple for a sheet's rows, "Log Results" -> LogResults(file_name, path, log_line, extracted_seed)"""
+    record = RECORD_TYPES.get(title)
+    if record is None:
+        fields = [table_name(str(column)) for column in header]
+        record = RECORD_TYPES[title] = collections.namedtuple(title.title().replace(' ', ''), fields, rename=True)
+    return record
+
+class RecordSheet:
+    """Rows turned into records and held until scan() yields them"""
+    
+    def __init__(self, sink, title):
+        self.sink = sink
+        self.title = title
+        self.type = None
+    
+    def append(self, values):
+        if self.type is None:
+            self.type = record_type(self.title, values)
+            return
+        values = tuple(values)
+        if len(values) < len(self.type._fields):
+            values += (None,) * (len(self.type._fields) - len(values))  # Errors rows without a traceback
+        self.sink.pending.append(self.type(*values))
+    
+    def highlight(self, value):
+        return value
+
+class RecordSink:
+    """No files at all, rows become records for the scan() generator"""
+    
+    def __init__(self, path):
+        self.path = None
+        self.pending = []
+    
+    def open_sheet(self, title):
+        return RecordSheet(self, title)
+    
+    def drain(self):
+        records, self.pending = self.pending, []
+        return records
+    
+    def close(self):
+        pass
+
+OUTPUT_SINKS = {'xlsx': ExcelSink, 'csv': CsvSink, 'jsonl': JsonlSink, 'sqlite': SqliteSink, 'records': RecordSink}
+
+RESULTS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id INTEGER PRIMARY KEY,
+    run_uuid TEXT UNIQUE,
+    source_root TEXT,
+    host TEXT,
+    started TEXT,
+    finished TEXT
+);
+CREATE TABLE IF NOT EXISTS files (run_id INTEGER, file_type TEXT, path TEXT, filename TEXT);
+CREATE TABLE IF NOT EXISTS worlds (run_id INTEGER, seed, %(fields)s);
+CREATE TABLE IF NOT EXISTS seeds (run_id INTEGER, seed, times_found INTEGER, %(fields)s);
+CREATE TABLE IF NOT EXISTS log_hits (run_id INTEGER, seed, filename TEXT, path TEXT, line TEXT);
+CREATE TABLE IF NOT EXISTS candidates (
+    run_id INTEGER, token, confidence TEXT, files_seen INTEGER,
+    filename TEXT, context TEXT, line TEXT, path TEXT
+);
+CREATE TABLE IF NOT EXISTS errors (run_id INTEGER, filename TEXT, path TEXT, message TEXT);
+CREATE INDEX IF NOT EXISTS files_run ON files (run_id);
+CREATE INDEX IF NOT EXISTS worlds_seed ON worlds (seed, run_id);
+CREATE INDEX IF NOT EXISTS seeds_seed ON seeds (seed, run_id);
+CREATE INDEX IF NOT EXISTS seeds_run ON seeds (run_id);
+CREATE INDEX IF NOT EXISTS log_hits_seed ON log_hits (seed, run_id);
+CREATE INDEX IF NOT EXISTS candidates_token ON candidates (token, run_id);
+CREATE INDEX IF NOT EXISTS errors_run ON errors (run_id);
+""" % {'fields': ', '.join(SEED_FIELDS)}
+
+# Tables copied between databases, everything but runs
+RESULTS_TABLES = ('files', 'worlds', 'seeds', 'log_hits', 'candidates', 'errors')
+
+# Report sheets regenerated from the database, seeds are aggregated over the selected runs.
+# Seeds go out as text (Excel would round 19 digit numbers) and LastPlayed epochs as local time.
+RESULTS_REPORTS = (
+    ("All Seeds", """
+        SELECT CAST(seed AS TEXT) AS "Seed Value", SUM(times_found) AS "Times Found",
+               COUNT(DISTINCT runs.source_root) AS "Sources",
+               GROUP_CONCAT(DISTINCT runs.source_root) AS "Source Roots",
+               MAX(world_name) AS "World Name", MAX(version) AS "Version",
+               MAX(data_version) AS "Data Version",
+               DATETIME(MAX(last_played) / 1000, 'unixepoch', 'localtime') AS "Last Played",
+               MIN(path) AS "Path"
+        FROM seeds JOIN runs USING (run_id) WHERE run_id IN (%s)
+        GROUP BY seed ORDER BY "Sources" DESC, "Times Found" DESC"""),
+    ("Data", """
+        SELECT runs.source_root AS "Source Root", filename AS "File Name", CAST(seed AS TEXT) AS "Random Seed",
+               total_time AS "Time Played", generator AS "Generator Name", world_name AS "Level Name",
+               game_mode AS "Game Mode", spawn_location AS "Spawn Location", path AS "Path",
+               version AS "Version", data_version AS "Data Version",
+               DATETIME(last_played / 1000, 'unixepoch', 'localtime') AS "Last Played",
+               size_on_disk AS "Size on Disk", difficulty AS "Difficulty", hardcore AS "Hardcore",
+               allow_commands AS "Allow Commands"
+        FROM worlds JOIN runs USING (run_id) WHERE run_id IN (%s)"""),
+    ("Log Results", """
+        SELECT runs.source_root AS "Source Root", filename AS "File Name", path AS "Path",
+               line AS "Log Line", CAST(seed AS TEXT) AS "Extracted Seed"
+        FROM log_hits JOIN runs USING (run_id) WHERE run_id IN (%s)"""),
+    ("Random Strings", """
+        SELECT confidence AS "Confidence", CAST(token AS TEXT) AS "Number", SUM(files_seen) AS "Files Seen",
+               MIN(filename) AS "Found In", MIN(context) AS "Context", MIN(line) AS "Line", MIN(path) AS "Path"
+        FROM candidates WHERE run_id IN (%s)
+        GROUP BY token ORDER BY CASE confidence WHEN 'High' THEN 0 WHEN 'Medium' THEN 1 ELSE 2 END, "Files Seen" DESC"""),
+    ("Errors", """
+        SELECT runs.source_root AS "Source Root", filename AS "File Name", message AS "Error Message", path AS "Path"
+        FROM errors JOIN runs USING (run_id) WHERE run_id IN (%s)"""),
+)
+
+def db_value(value):
+    """Column value for the results database, 'Unknown' becomes NULL"""
+    if value is None or value == 'Unknown':
+        return None
+    if isinstance(value, bool):
+        return int(value)
+    if isinstance(value, int):
+        return int(value)  # Drops nbtlib tag subclasses
+    if isinstance(value, float):
+        return value
+    return str(value)
+
+class ResultsDatabase:
+    """Indexed SQLite database collecting every run, for merges, diffs and reports without rescanning"""
+    
+    def __init__(self, path):
+        self.path = path
+        # Rows come from the timeout worker threads too
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.executescript(RESULTS_SCHEMA)
+        self.run_id = None
+    
+    def start_run(self, source_root):
+        """Register a new run and return its ID"""
+        cursor = self.conn.execute(
+            "INSERT INTO runs (run_uuid, source_root, host, started) VALUES (?, ?, ?, ?)",
+            (uuid.uuid4().hex, os.path.abspath(source_root), platform.node(), datetime.now().isoformat(timespec='seconds')))
+        self.run_id = cursor.lastrowid
+        return self.run_id
+    
+    def add_files(self, minecraft_files):
+        self.conn.executemany("INSERT INTO files VALUES (?, ?, ?, ?)",
+                              ((self.run_id, file_type, root, filename) for file_type, root, filename, _ in minecraft_files))
+    
+    def add_world(self, seed, info):
+        self.conn.execute(f"INSERT INTO worlds VALUES (?, ?{', ?' * len(SEED_FIELDS)})",
+                          [self.run_id, db_value(normalize_seed(seed))] + [db_value(info.get(field)) for field in SEED_FIELDS])
+    
+    def add_log_hit(self, seed, filename, root, line):
+        self.conn.execute("INSERT INTO log_hits VALUES (?, ?, ?, ?, ?)",
+                          (self.run_id, db_value(normalize_seed(seed)), filename, root, line))
+    
+    def add_error(self, filename, root, message):
+        self.conn.execute("INSERT INTO errors VALUES (?, ?, ?, ?)", (self.run_id, filename, root, message))
+    
+    def finish_run(self, unique_seeds, potential_seeds):
+        """Store the run's aggregated seeds and candidates and commit"""
+        self.conn.executemany(
+            f"INSERT INTO seeds VALUES (?, ?, ?{', ?' * len(SEED_FIELDS)})",
+            ([self.run_id, db_value(seed), record.times_found] + [db_value(getattr(record, field)) for field in SEED_FIELDS]
+             for seed, record in unique_seeds.items()))
+        self.conn.executemany(
+            "INSERT INTO candidates VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            ((self.run_id, token, info['confidence'], files_seen, info['filename'], info['context'], info['line'], info['path'])
+             for token, info, files_seen in potential_seeds.top_entries()))
+        self.conn.execute("UPDATE runs SET finished = ? WHERE run_id = ?",
+                          (datetime.now().isoformat(timespec='seconds'), self.run_id))
+        self.conn.commit()
+    
+    def close(self):
+        self.conn.commit()
+        self.conn.close()
+    
+    def runs(self):
+        return self.conn.execute(
+            "SELECT run_id, source_root, host, started, finished, "
+            "(SELECT COUNT(*) FROM seeds WHERE seeds.run_id = runs.run_id) FROM runs ORDER BY run_id").fetchall()
+    
+    def merge(self, other_path):
+        """Copy every run of another results database that isn't here yet, return the number copied"""
+        self.conn.execute("ATTACH DATABASE ? AS other", (other_path,))
+        try:
+            copied = 0
+            for run in self.conn.execute("SELECT * FROM other.runs ORDER BY run_id").fetchall():
+                if self.conn.execute("SELECT 1 FROM runs WHERE run_uuid = ?", (run[1],)).fetchone():
+                    continue
+                new_id = self.conn.execute(
+                    "INSERT INTO runs (run_uuid, source_root, host, started, finished) VALUES (?, ?, ?, ?, ?)",
+                    run[1:]).lastrowid
+                for table in RESULTS_TABLES:
+                    columns = [row[1] for row in self.conn.execute(f"PRAGMA main.table_info({table})")][1:]
+                    self.conn.execute(f"INSERT INTO main.{table} SELECT ?, {', '.join(columns)} "
+                                      f"FROM other.{table} WHERE run_id = ?", (new_id, run[0]))
+                copied += 1
+            self.conn.commit()
+        finally:
+            self.conn.execute("DETACH DATABASE other")
+        return copied
+    
+    def diff(self, run_a, run_b):
+        """Seeds found in run_a but not run_b, and the other way round"""
+        query = ("SELECT seed FROM seeds WHERE run_id = ? EXCEPT SELECT seed FROM seeds WHERE run_id = ? ORDER BY seed")
+        only_a = [row[0] for row in self.conn.execute(query, (run_a, run_b))]
+        only_b = [row[0] for row in self.conn.execute(query, (run_b, run_a))]
+        return only_a, only_b
+    
+    def shared_seeds(self):
+        """Seeds found under more than one source root (drive or .minecraft folder)"""
+        return self.conn.execute(
+            "SELECT seed, COUNT(DISTINCT source_root), GROUP_CONCAT(DISTINCT source_root), SUM(times_found) "
+            "FROM seeds JOIN runs USING (run_id) GROUP BY seed HAVING COUNT(DISTINCT source_root) > 1 "
+            "ORDER BY 2 DESC, 4 DESC").fetchall()
+    
+    def report(self, sink, run_ids=None):
+        """Write the report sheets for some runs (default all) into an output sink"""
+        if not run_ids:
+            run_ids = [row[0] for row in self.conn.execute("SELECT run_id FROM runs")]
+        selected = ', '.join(str(int(run_id)) for run_id in run_ids)
+        for title, query in RESULTS_REPORTS:
+            cursor = self.conn.execute(query % selected)
+            sheet = sink.open_sheet(title)
+            sheet.append(tuple(column[0] for column in cursor.description))
+            for row in cursor:
+                sheet.append(sanitize_row(row))
+        sink.close()
+
+def open_results_db(ctx):
+    """Open the results database and start a run for the scan's directory, or None when disabled"""
+    ctx.results_db = None
+    if not RESULTS_DB_ENABLED:
+        return None
+    path = RESULTS_DB_PATH or os.path.join(ctx.directory, OUTPUT_BASENAME + '.db')
+    try:
+        ctx.results_db = ResultsDatabase(path)
+        ctx.results_db.start_run(ctx.directory)
+    except sqlite3.Error as e:
+        log.warning("Could not open results database %s: %s", path, e)
+        ctx.results_db = None
+    return ctx.results_db
+
+def open_events():
+    """Open the event stream named by EVENTS_PATH, or None when it is unset"""
+    global events
+    events = None
+    if not EVENTS_PATH:
+        return None
+    try:
+        events = EventStream(EVENTS_PATH)
+    except OSError as e:
+        log.warning("Could not open event stream %s: %s", EVENTS_PATH, e)
+    return events
+
+def db_main(argv):
+    """Work with the results database without rescanning: runs, merge, diff, shared, report"""
+    import argparse
+    parser = argparse.ArgumentParser(prog='nbtparsedat-v3.py db', description=db_main.__doc__)
+    parser.add_argument('--db', default=RESULTS_DB_PATH or os.path.join(directory_path, OUTPUT_BASENAME + '.db'),
+                        help='results database (default: %(default)s)')
+    commands = parser.add_subparsers(dest='command', required=True)
+    commands.add_parser('runs', help='list recorded runs')
+    merge_parser = commands.add_parser('merge', help='copy runs from other results databases')
+    merge_parser.add_argument('sources', nargs='+')
+    diff_parser = commands.add_parser('diff', help='seeds found in one run but not the other')
+    diff_parser.add_argument('run_a', type=int)
+    diff_parser.add_argument('run_b', type=int)
+    commands.add_parser('shared', help='seeds found under more than one source root')
+    report_parser = commands.add_parser('report', help='regenerate result sheets from the database')
+    report_parser.add_argument('--run', type=int, action='append', dest='runs', help='run ID (repeatable, default all)')
+    report_parser.add_argument('--format', default=OUTPUT_FORMAT, choices=sorted(OUTPUT_SINKS))
+    report_parser.add_argument('--output', help='output path without extension (default: next to the database)')
+    args = parser.parse_args(argv)
+    
+    if args.command != 'merge' and not os.path.exists(args.db):
+        print(f"No results database at {args.db}")
+        return 1
+    db = ResultsDatabase(args.db)
+    try:
+        if args.command == 'runs':
+            for run_id, source_root, host, started, finished, seeds in db.runs():
+                print(f"{run_id:>4}  {started}  {'done' if finished else 'incomplete':<10}  {seeds:>6} seeds  {host}  {source_root}")
+        elif args.command == 'merge':
+            for source in args.sources:
+                print(f"{source}: {db.merge(source)} runs merged")
+        elif args.command == 'diff':
+            only_a, only_b = db.diff(args.run_a, args.run_b)
+            print(f"Only in run {args.run_a} ({len(only_a)}):")
+            for seed in only_a:
+                print(f"  {seed}")
+            print(f"Only in run {args.run_b} ({len(only_b)}):")
+            for seed in only_b:
+                print(f"  {seed}")
+        elif args.command == 'shared':
+            for seed, sources, roots, times_found in db.shared_seeds():
+                print(f"{seed}  {sources} sources  {times_found} times  {roots}")
+        elif args.command == 'report':
+            output = args.output or os.path.join(os.path.dirname(os.path.abspath(args.db)), OUTPUT_BASENAME + '_report')
+            sink = OUTPUT_SINKS[args.format](output)
+            db.report(sink, args.runs)
+            print(f"Report written to {sink.path}")
+    finally:
+        db.close()
+    return 0
+
+
+class Highlight:
+    """Placeholder for a highlighted cell, resolved by the writer"""
+    __slots__ = ('value',)
     
-    # Create workbook and sheets
-    wb = Workbook()
-    ws_all_seeds = wb.active  # First sheet
-    ws_all_seeds.title = "All Seeds"
-    ws_log = wb.create_sheet(title="Log Results")
-    ws_data = wb.create_sheet(title="Data")
-    ws_errors = wb.create_sheet(title="Errors")
-    ws_corrupted = wb.create_sheet(title="Corrupted Files")
-    ws_potential = wb.create_sheet(title="Random Strings")  # Renamed from "Potential Seeds"
+    def __init__(self, value):
+        self.value = value
+
+class QueuedSheet:
+    """Sheet handle whose rows are handed to the OutputWriter"""
+    
+    def __init__(self, writer, sheet, title, sanitize):
+        self.writer = writer
+        self.sheet = sheet
+        self.title = title
+        self.sanitize = sanitize
+        self.column_dimensions = getattr(sheet, 'column_dimensions', None)
+    
+    def append(self, values):
+        self.writer.put((self, values))
+    
+    def highlight(self, value):
+        return Highlight(value)
+
+class OutputWriter:
+    """Owns the output sink, rows reach it through a bounded queue drained by one writer thread"""
+    
+    def __init__(self, sink, threaded=None):
+        self.sink = sink
+        self.thread = None
+        if BACKGROUND_WRITER if threaded is None else threaded:
+            self.queue = queue.Queue(maxsize=OUTPUT_QUEUE_SIZE)
+            self.thread = threading.Thread(target=self.run, name="output-writer", daemon=True)
+            self.thread.start()
+    
+    def open_sheet(self, title, sanitize=None):
+        """Open a sheet, sanitize is None, 'all' (every value but plain numbers becomes clean text)
+        or 'strings' (only str values are cleaned, the rest keep their cell types)"""
+        return QueuedSheet(self, self.sink.open_sheet(title), title, sanitize)
+    
+    def put(self, item):
+        if self.thread is None:
+            self.write(item)
+        else:
+            self.queue.put(item)  # Blocks while the writer is OUTPUT_QUEUE_SIZE rows behind
+    
+    def write(self, item):
+        handle, values = item
+        started = time.perf_counter()
+        try:
+            if handle.sanitize:
+                values = sanitize_row(values, strings_only=handle.sanitize == 'strings')
+            values = tuple(handle.sheet.highlight(value.value) if isinstance(value, Highlight) else value
+                           for value in values)
+            handle.sheet.append(values)
+        except Exception as e:
+            log.warning("Could not write a row to %s (%s). Skipping...", handle.title, e)
+        run_stats.add('output write', time.perf_counter() - started, items=1)
     
-    # Create highlight fill for errors
-    error_fill = PatternFill(start_color="FFFF0000", end_color="FFFF0000", fill_type="solid")
+    def run(self):
+        while True:
+            item = self.queue.get()
+            if item is None:
+                break
+            self.write(item)
+    
+    def flush(self):
+        """Wait until every queued row has been written and stop the thread"""
+        if self.thread is not None:
+            self.queue.put(None)
+            self.thread.join()
+            self.thread = None
+    
+    def close(self):
+        self.flush()
+        self.sink.close()
+
+# Sheets in workbook order, and how the writer sanitizes their values. Every sheet with file
+# names, paths or text from the scanned files is cleaned, so the sink can't reject a row
+OUTPUT_SHEETS = (
+    ("All Seeds", 'all'),
+    ("Log Results", 'strings'),
+    ("Data", 'strings'),
+    ("Errors", 'strings'),
+    ("Corrupted Files", 'strings'),
+    ("Random Strings", 'all'),  # Renamed from "Potential Seeds"
+    ("Gz Catalog", 'strings'),
+    ("Stats", None),
+    ("Slowest Files", 'strings'),
+    ("Latency", None),
+)
+
+def initialize_output(ctx):
+    """Create the scan's output sink and its sheets"""
+    sink_class = OUTPUT_SINKS.get(OUTPUT_FORMAT)
+    if sink_class is None:
+        log.warning("Unknown output format '%s', using xlsx", OUTPUT_FORMAT)
+        sink_class = ExcelSink
+    ctx.sink = sink_class(os.path.join(ctx.directory, OUTPUT_BASENAME))
+    # Records must be ready when the file that produced them is done
+    ctx.writer = OutputWriter(ctx.sink, BACKGROUND_WRITER and not isinstance(ctx.sink, RecordSink))
+    ctx.sheets = {title: ctx.writer.open_sheet(title, sanitize=sanitize) for title, sanitize in OUTPUT_SHEETS}
     
-    # Set headers and adjust column widths
-    setup_excel_headers()
-    adjust_column_widths()
+    # Column widths first, write-only sheets emit them along with the first row
+    if isinstance(ctx.sink, ExcelSink):
+        adjust_column_widths(ctx.sheets)
+    setup_excel_headers(ctx.sheets)
 
-def setup_excel_headers():
+def setup_excel_headers(sheets):
     """Set up headers for all Excel sheets"""
     # All Seeds tab headers (now first)
-    ws_all_seeds['A1'] = 'Seed Value'
-    ws_all_seeds['B1'] = 'First Found In'
-    ws_all_seeds['C1'] = 'World Name'
-    ws_all_seeds['D1'] = 'Game Mode'
-    ws_all_seeds['E1'] = 'Generator'
-    ws_all_seeds['F1'] = 'Version'
-    ws_all_seeds['G1'] = 'Last Played'
-    ws_all_seeds['H1'] = 'Path'
-    ws_all_seeds['I1'] = 'Times Found'
-    ws_all_seeds['J1'] = 'Time Played'
-    ws_all_seeds['K1'] = 'Spawn Location'
-    ws_all_seeds['L1'] = 'Data Version'
-    ws_all_seeds['M1'] = 'Difficulty'
-    ws_all_seeds['N1'] = 'Hardcore'
-    ws_all_seeds['O1'] = 'Allow Commands'
-    ws_all_seeds['P1'] = 'Size on Disk'
+    sheets["All Seeds"].append((
+        'Seed Value',
+        'First Found In',
+        'World Name',
+        'Game Mode',
+        'Generator',
+        'Version',
+        'Last Played',
+        'Path',
+        'Times Found',
+        'Time Played',
+        'Spawn Location',
+        'Data Version',
+        'Difficulty',
+        'Hardcore',
+        'Allow Commands',
+        'Size on Disk'
+    ))
     
     # Log Results tab headers (second)
-    ws_log['A1'] = 'File Name'
-    ws_log['B1'] = 'Path'
-    ws_log['C1'] = 'Log Line'
-    ws_log['D1'] = 'Extracted Seed'
+    sheets["Log Results"].append((
+        'File Name',
+        'Path',
+        'Log Line',
+        'Extracted Seed'
+    ))
     
     # Data tab headers (third)
-    ws_data['A1'] = 'File Name'
-    ws_data['B1'] = 'Random Seed'
-    ws_data['C1'] = 'Time Played'
-    ws_data['D1'] = 'Generator Name'
-    ws_data['E1'] = 'Level Name'
-    ws_data['F1'] = 'Game Mode'
-    ws_data['G1'] = 'Spawn Location'
-    ws_data['H1'] = 'Path'
-    ws_data['I1'] = 'Version'
-    ws_data['J1'] = 'Data Version'
-    ws_data['K1'] = 'Last Played'
-    ws_data['L1'] = 'Size on Disk'
-    ws_data['M1'] = 'Difficulty'
-    ws_data['N1'] = 'Hardcore'
-    ws_data['O1'] = 'Allow Commands'
-    ws_data['P1'] = 'Has Errors'
+    sheets["Data"].append((
+        'File Name',
+        'Random Seed',
+        'Time Played',
+        'Generator Name',
+        'Level Name',
+        'Game Mode',
+        'Spawn Location',
+        'Path',
+        'Version',
+        'Data Version',
+        'Last Played',
+        'Size on Disk',
+        'Difficulty',
+        'Hardcore',
+        'Allow Commands',
+        'Has Errors'
+    ))
     
     # Errors tab headers (fourth)
-    ws_errors['A1'] = 'File Name'
-    ws_errors['B1'] = 'Error Message'
-    ws_errors['C1'] = 'Path'
-    ws_errors['D1'] = 'Traceback'
+    sheets["Errors"].append((
+        'File Name',
+        'Error Message',
+        'Path',
+        'Traceback'
+    ))
 
     # Corrupted Files tab headers (fifth)
-    ws_corrupted['A1'] = 'File Name'
-    ws_corrupted['B1'] = 'Path'
-    ws_corrupted['C1'] = 'Partial Data Retrieved'
-    ws_corrupted['D1'] = 'Error Details'
+    sheets["Corrupted Files"].append((
+        'File Name',
+        'Path',
+        'Partial Data Retrieved',
+        'Error Details'
+    ))
 
     # Random Strings tab headers (last, renamed from Potential Seeds)
-    ws_potential['A1'] = 'Confidence'
-    ws_potential['B1'] = 'Number'
-    ws_potential['C1'] = 'Found In'
-    ws_potential['D1'] = 'Context'
-    ws_potential['E1'] = 'Line'
-    ws_potential['F1'] = 'Path'
-
-def adjust_column_widths():
+    sheets["Random Strings"].append((
+        'Confidence',
+        'Number',
+        'Found In',
+        'Context',
+        'Line',
+        'Path',
+        'Files Seen'
+    ))
+
+    # Gz Catalog tab headers (header/trailer fields read without inflating)
+    sheets["Gz Catalog"].append((
+        'File Name',
+        'Path',
+        'Log Date',
+        'Original Name',
+        'CRC32',
+        'Inflated Size',
+        'Compressed Size',
+        'Duplicate Of'
+    ))
+
+def adjust_column_widths(sheets):
     """Adjust column widths for all Excel sheets"""
     # Data tab column widths
-    ws_data.column_dimensions['A'].width = 20
-    ws_data.column_dimensions['B'].width = 40
-    ws_data.column_dimensions['C'].width = 15
-    ws_data.column_dimensions['D'].width = 15
-    ws_data.column_dimensions['E'].width = 10
-    ws_data.column_dimensions['F'].width = 15
-    ws_data.column_dimensions['G'].width = 20
-    ws_data.column_dimensions['H'].width = 50
-    ws_data.column_dimensions['I'].width = 10
-    ws_data.column_dimensions['J'].width = 15
-    ws_data.column_dimensions['K'].width = 20
-    ws_data.column_dimensions['L'].width = 15
-    ws_data.column_dimensions['M'].width = 15
-    ws_data.column_dimensions['N'].width = 10
-    ws_data.column_dimensions['O'].width = 15
-    ws_data.column_dimensions['P'].width = 15
+    sheets["Data"].column_dimensions['A'].width = 20
+    sheets["Data"].column_dimensions['B'].width = 40
+    sheets["Data"].column_dimensions['C'].width = 15
+    sheets["Data"].column_dimensions['D'].width = 15
+    sheets["Data"].column_dimensions['E'].width = 10
+    sheets["Data"].column_dimensions['F'].width = 15
+    sheets["Data"].column_dimensions['G'].width = 20
+    sheets["Data"].column_dimensions['H'].width = 50
+    sheets["Data"].column_dimensions['I'].width = 10
+    sheets["Data"].column_dimensions['J'].width = 15
+    sheets["Data"].column_dimensions['K'].width = 20
+    sheets["Data"].column_dimensions['L'].width = 15
+    sheets["Data"].column_dimensions['M'].width = 15
+    sheets["Data"].column_dimensions['N'].width = 10
+    sheets["Data"].column_dimensions['O'].width = 15
+    sheets["Data"].column_dimensions['P'].width = 15
     
     # Errors tab column widths
-    ws_errors.column_dimensions['A'].width = 20
-    ws_errors.column_dimensions['B'].width = 50
-    ws_errors.column_dimensions['C'].width = 50
-    ws_errors.column_dimensions['D'].width = 100
+    sheets["Errors"].column_dimensions['A'].width = 20
+    sheets["Errors"].column_dimensions['B'].width = 50
+    sheets["Errors"].column_dimensions['C'].width = 50
+    sheets["Errors"].column_dimensions['D'].width = 100
 
     # Log Results tab column widths
-    ws_log.column_dimensions['A'].width = 20
-    ws_log.column_dimensions['B'].width = 50
-    ws_log.column_dimensions['C'].width = 100
-    ws_log.column_dimensions['D'].width = 20
+    sheets["Log Results"].column_dimensions['A'].width = 20
+    sheets["Log Results"].column_dimensions['B'].width = 50
+    sheets["Log Results"].column_dimensions['C'].width = 100
+    sheets["Log Results"].column_dimensions['D'].width = 20
 
     # All Seeds tab column widths
-    ws_all_seeds.column_dimensions['A'].width = 30  # Seed Value
-    ws_all_seeds.column_dimensions['B'].width = 20  # First Found In
-    ws_all_seeds.column_dimensions['C'].width = 30  # World Name
-    ws_all_seeds.column_dimensions['D'].width = 10  # Game Mode
-    ws_all_seeds.column_dimensions['E'].width = 15  # Generator
-    ws_all_seeds.column_dimensions['F'].width = 15  # Version
-    ws_all_seeds.column_dimensions['G'].width = 20  # Last Played
-    ws_all_seeds.column_dimensions['H'].width = 50  # Path
-    ws_all_seeds.column_dimensions['I'].width = 10  # Times Found
-    ws_all_seeds.column_dimensions['J'].width = 20  # Time Played
-    ws_all_seeds.column_dimensions['K'].width = 30  # Spawn Location
-    ws_all_seeds.column_dimensions['L'].width = 15  # Data Version
-    ws_all_seeds.column_dimensions['M'].width = 15  # Difficulty
-    ws_all_seeds.column_dimensions['N'].width = 10  # Hardcore
-    ws_all_seeds.column_dimensions['O'].width = 10 # Allow Commands
-    ws_all_seeds.column_dimensions['P'].width = 15  # Size on Disk
+    sheets["All Seeds"].column_dimensions['A'].width = 30  # Seed Value
+    sheets["All Seeds"].column_dimensions['B'].width = 20  # First Found In
+    sheets["All Seeds"].column_dimensions['C'].width = 30  # World Name
+    sheets["All Seeds"].column_dimensions['D'].width = 10  # Game Mode
+    sheets["All Seeds"].column_dimensions['E'].width = 15  # Generator
+    sheets["All Seeds"].column_dimensions['F'].width = 15  # Version
+    sheets["All Seeds"].column_dimensions['G'].width = 20  # Last Played
+    sheets["All Seeds"].column_dimensions['H'].width = 50  # Path
+    sheets["All Seeds"].column_dimensions['I'].width = 10  # Times Found
+    sheets["All Seeds"].column_dimensions['J'].width = 20  # Time Played
+    sheets["All Seeds"].column_dimensions['K'].width = 30  # Spawn Location
+    sheets["All Seeds"].column_dimensions['L'].width = 15  # Data Version
+    sheets["All Seeds"].column_dimensions['M'].width = 15  # Difficulty
+    sheets["All Seeds"].column_dimensions['N'].width = 10  # Hardcore
+    sheets["All Seeds"].column_dimensions['O'].width = 10 # Allow Commands
+    sheets["All Seeds"].column_dimensions['P'].width = 15  # Size on Disk
     
     # Corrupted Files tab column widths
-    ws_corrupted.column_dimensions['A'].width = 20
-    ws_corrupted.column_dimensions['B'].width = 50
-    ws_corrupted.column_dimensions['C'].width = 20
-    ws_corrupted.column_dimensions['D'].width = 30
+    sheets["Corrupted Files"].column_dimensions['A'].width = 20
+    sheets["Corrupted Files"].column_dimensions['B'].width = 50
+    sheets["Corrupted Files"].column_dimensions['C'].width = 20
+    sheets["Corrupted Files"].column_dimensions['D'].width = 30
 
     # Random Strings tab column widths
-    ws_potential.column_dimensions['A'].width = 15  # Confidence
-    ws_potential.column_dimensions['B'].width = 25  # Number
-    ws_potential.column_dimensions['C'].width = 30  # Found In
-    ws_potential.column_dimensions['D'].width = 40  # Context
-    ws_potential.column_dimensions['E'].width = 100  # Line
-    ws_potential.column_dimensions['F'].width = 50  # Path
+    sheets["Random Strings"].column_dimensions['A'].width = 15  # Confidence
+    sheets["Random Strings"].column_dimensions['B'].width = 25  # Number
+    sheets["Random Strings"].column_dimensions['C'].width = 30  # Found In
+    sheets["Random Strings"].column_dimensions['D'].width = 40  # Context
+    sheets["Random Strings"].column_dimensions['E'].width = 100  # Line
+    sheets["Random Strings"].column_dimensions['F'].width = 50  # Path
+    sheets["Random Strings"].column_dimensions['G'].width = 12  # Files Seen
+
+    # Gz Catalog tab column widths
+    sheets["Gz Catalog"].column_dimensions['A'].width = 25  # File Name
+    sheets["Gz Catalog"].column_dimensions['B'].width = 50  # Path
+    sheets["Gz Catalog"].column_dimensions['C'].width = 20  # Log Date
+    sheets["Gz Catalog"].column_dimensions['D'].width = 25  # Original Name
+    sheets["Gz Catalog"].column_dimensions['E'].width = 12  # CRC32
+    sheets["Gz Catalog"].column_dimensions['F'].width = 15  # Inflated Size
+    sheets["Gz Catalog"].column_dimensions['G'].width = 15  # Compressed Size
+    sheets["Gz Catalog"].column_dimensions['H'].width = 50  # Duplicate Of
 
 def print_debug_info():
     """Print system and environment information for debugging"""
@@ -313,8 +1650,10 @@ def print_debug_info():
     print(f"Directory path: {directory_path}")
     print("========================\n")
 
-def is_completely_empty(file_path):
-    """Check if a file is completely empty (no data at all)"""
+def is_completely_empty(file_path, data=None):
+    """Check if a file is completely empty (no data at all), data is its content when already read"""
+    if data is not None:
+        return len(data[:1024].strip()) == 0
     try:
         if os.path.getsize(file_path) == 0:
             return True
@@ -328,14 +1667,14 @@ def find_seed_in_nbt(nbt_data):
     """Recursively search for seed values in NBT data"""
     if isinstance(nbt_data, dict):
         if 'RandomSeed' in nbt_data:
-            return str(nbt_data['RandomSeed'])
+            return normalize_seed(nbt_data['RandomSeed'])
         if 'seed' in nbt_data:
-            return str(nbt_data['seed'])
+            return normalize_seed(nbt_data['seed'])
         
         if 'WorldGenSettings' in nbt_data:
             if isinstance(nbt_data['WorldGenSettings'], dict):
                 if 'seed' in nbt_data['WorldGenSettings']:
-                    return str(nbt_data['WorldGenSettings']['seed'])
+                    return normalize_seed(nbt_data['WorldGenSettings']['seed'])
                 
         if 'DimensionData' in nbt_data:
             for dim_data in nbt_data['DimensionData'].values():
@@ -378,6 +1717,27 @@ def get_generator_name(nbt_data):
     except:
         return 'Unknown'
 
+# Byte classes for the binary content check, built once instead of per call
+TEXT_BYTES = bytes(range(32, 127)) + b'\n\r\t\f\b'
+HIGH_BYTES = bytes(range(128, 256))  # UTF-8 lead/continuation bytes, text when they decode
+BINARY_SAMPLE_SIZE = 1024  # Bytes examined per sample
+CONTENT_SAMPLE_COUNT = 8  # Samples spread across a file when classifying it
+MIXED_REGION_SIZE = 1024 * 1024  # Granularity for skimming binary regions in mixed files
+FILE_BINARY_RATIO = 0.7  # is_binary_content's cutoff, a log is only skipped when every sample is past it
+REGION_BINARY_RATIO = 0.3  # Stricter so compressed data counts as binary and is only keyword-searched
+
+def binary_counts(chunk, utf8=False):
+    """Return (null bytes, non-text bytes) in a bytes-like chunk using C-level scans
+    
+    With utf8 on, bytes >= 0x80 count as text when they decode as UTF-8, so chat in
+    Cyrillic or CJK isn't mistaken for binary.
+    """
+    if not utf8:
+        return chunk.count(b'\x00'), len(chunk.translate(None, TEXT_BYTES))
+    controls = len(chunk.translate(None, TEXT_BYTES + HIGH_BYTES))
+    invalid = len(chunk) - len(chunk.decode('utf-8', errors='ignore').encode('utf-8'))
+    return chunk.count(b'\x00'), controls + invalid
+
 def is_binary_content(content):
     """Less aggressive check if content appears to be binary data"""
     try:
@@ -386,25 +1746,56 @@ def is_binary_content(content):
             content = content.encode('utf-8')
         
         # Check first chunk for binary characters
-        chunk = content[:1024] if len(content) > 1024 else content
-        text_characters = bytes(range(32, 127)) + b'\n\r\t\f\b'
-        binary_chars = bytes(set(range(256)) - set(text_characters))
-        
-        # Count null bytes and other binary characters
-        null_count = chunk.count(b'\x00')
-        binary_count = len([x for x in chunk if x in binary_chars])
-        
-        # If more than 50% nulls or 70% binary, consider it binary
+        chunk = bytes(content[:BINARY_SAMPLE_SIZE])
         if len(chunk) == 0:
             return False
         
-        null_ratio = null_count / len(chunk)
-        binary_ratio = binary_count / len(chunk)
-        
-        return null_ratio > 0.5 or binary_ratio > 0.7
+        null_count, binary_count = binary_counts(chunk)
+        # If more than 50% nulls or 70% binary, consider it binary
+        return null_count / len(chunk) > 0.5 or binary_count / len(chunk) > FILE_BINARY_RATIO
     except:
         return True  # If any error occurs, assume it's binary
 
+def classify_content(buffer, start=0, end=None, samples=None, ratio=None):
+    """Sample a buffer at spread-out offsets and return (verdict, binary_ratio)
+    
+    verdict is 'text' when every sample looks like text, 'binary' when every sample
+    is binary and 'mixed' otherwise (e.g. a DMDE blob with a text header). A sample
+    is binary past ratio non-text bytes (REGION_BINARY_RATIO by default), valid UTF-8
+    counts as text.
+    """
+    end = len(buffer) if end is None else end
+    samples = CONTENT_SAMPLE_COUNT if samples is None else samples
+    ratio = REGION_BINARY_RATIO if ratio is None else ratio
+    length = end - start
+    if length <= 0:
+        return 'text', 0.0
+    
+    if length <= BINARY_SAMPLE_SIZE * samples:
+        offsets = range(start, end, BINARY_SAMPLE_SIZE)  # Small enough to check everything
+    else:
+        step = (length - BINARY_SAMPLE_SIZE) // (samples - 1)
+        offsets = [start + i * step for i in range(samples)]
+    
+    binary_samples = 0
+    sampled_bytes = 0
+    binary_bytes = 0
+    for offset in offsets:
+        chunk = buffer[offset:min(offset + BINARY_SAMPLE_SIZE, end)]
+        null_count, binary_count = binary_counts(chunk, utf8=True)
+        sampled_bytes += len(chunk)
+        binary_bytes += binary_count
+        if null_count / len(chunk) > 0.5 or binary_count / len(chunk) > ratio:
+            binary_samples += 1
+    
+    if binary_samples == 0:
+        verdict = 'text'
+    elif binary_samples == len(offsets):
+        verdict = 'binary'
+    else:
+        verdict = 'mixed'
+    return verdict, binary_bytes / sampled_bytes
+
 def is_meaningful_log(line):
     """Check if a log line contains meaningful information we want to track"""
     # Skip common unnecessary lines
@@ -659,10 +2050,13 @@ def is_potential_seed(text):
     
     return False
 
-def find_potential_seeds(line, filename, root):
+def find_potential_seeds(result, line, filename, root):
     """Find potential seeds in a line of text"""
-    global ws_potential
-    
+    for word, context, confidence in iter_potential_seeds(line):
+        result.add_potential(word, filename, context, line, root, confidence)
+
+def iter_potential_seeds(line):
+    """Yield (word, context, confidence) for every seed-like token in a line"""
     # Skip if line is too short or doesn't contain numbers
     if len(line) < 3 or not any(c.isdigit() for c in line):
         return
@@ -694,22 +2088,7 @@ def find_potential_seeds(line, filename, root):
                 elif sum(term.lower() in line.lower() for term in seed_contexts) >= 2:
                     confidence = 'High'
             
-            # Store in potential seeds dictionary
-            if word not in potential_seeds:
-                potential_seeds[word] = {
-                    'filename': filename,
-                    'context': context,
-                    'line': line,
-                    'path': root,
-                    'confidence': confidence
-                }
-            # Update if new instance has higher confidence
-            elif confidence_level(confidence) > confidence_level(potential_seeds[word]['confidence']):
-                potential_seeds[word].update({
-                    'context': context,
-                    'line': line,
-                    'confidence': confidence
-                })
+            yield word, context, confidence
 
 def confidence_level(confidence):
     """Helper function to convert confidence string to numeric level"""
@@ -719,583 +2098,1054 @@ def confidence_level(confidence):
 def get_timeout_for_size(file_path):
     """Calculate appropriate timeout based on file size"""
     try:
-        size = os.path.getsize(file_path)
-        # Base timeout plus additional time based on file size
-        timeout = BASE_TIMEOUT + (size / SIZE_TIMEOUT_RATIO)
-        # Cap at MAX_TIMEOUT to prevent extremely long waits
-        return min(MAX_TIMEOUT, max(BASE_TIMEOUT, timeout))
+        return timeout_for_size(os.path.getsize(file_path))
     except:
         return BASE_TIMEOUT  # Default to base timeout if can't determine size
 
-def process_log_content(log_data, filename, root):
-    """Process log content for seed information"""
-    global row_log, row_all_seeds, ws_log, ws_all_seeds, unique_seeds, potential_seeds
+def timeout_for_size(size):
+    """Timeout in seconds for a file of the given size"""
+    # Base timeout plus additional time based on file size
+    timeout = BASE_TIMEOUT + (size / SIZE_TIMEOUT_RATIO)
+    # Cap at MAX_TIMEOUT to prevent extremely long waits
+    return min(MAX_TIMEOUT, max(BASE_TIMEOUT, timeout))
+
+def iter_gzip_chunks(file_path, max_output=None, max_ratio=None):
+    """Inflate a gzip file in bounded chunks, enforcing output size and ratio limits"""
+    with open(file_path, 'rb') as f:
+        yield from iter_gzip_stream(f, max_output, max_ratio)
+
+def iter_gzip_stream(f, max_output=None, max_ratio=None, progress=None):
+    """Inflate gzip members from an open binary stream, starting at its current position
     
+    Limits default to MAX_DECOMPRESSED_SIZE and MAX_COMPRESSION_RATIO. If a progress dict
+    is given, progress['consumed'] tracks how many compressed bytes have been used so
+    callers scanning a larger blob can skip past them.
+    """
+    if max_output is None:
+        max_output = MAX_DECOMPRESSED_SIZE
+    if max_ratio is None:
+        max_ratio = MAX_COMPRESSION_RATIO
+    decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    at_member_start = True
+    buffer = b''
+    total_in = 0
+    total_out = 0
+    inflate_time = 0.0
+
     try:
-        if isinstance(log_data, (list, tuple)):
-            lines = log_data
-        else:
-            try:
-                lines = log_data.readlines()
-            except AttributeError:
-                lines = str(log_data).splitlines()
-        
-        # Track version and game mode info for the current file
-        current_version = 'Unknown'
-        current_gamemode = 'Unknown'
-        
-        for line in lines:
-            try:
-                if isinstance(line, bytes):
-                    line = line.decode('utf-8', errors='ignore')
-                elif not isinstance(line, str):
-                    line = str(line)
-                
-                line = line.strip()
-                if not line:
-                    continue
-                
-                # Look for version information
-                for pattern in version_patterns:
-                    match = pattern.search(line)
-                    if match:
-                        current_version = match.group(1)
+        while True:
+            if not buffer:
+                buffer = f.read(DECOMPRESS_CHUNK_SIZE)
+                total_in += len(buffer)
+                if not buffer:
+                    break
+
+            if at_member_start:
+                # Concatenated members are valid gzip, trailing garbage from carving is not
+                while len(buffer) < 2:
+                    more = f.read(DECOMPRESS_CHUNK_SIZE)
+                    if not more:
                         break
+                    total_in += len(more)
+                    buffer += more
+                if not buffer.startswith(b'\x1f\x8b'):
+                    break
+                at_member_start = False
+
+            started = time.perf_counter()
+            chunk = decompressor.decompress(buffer, DECOMPRESS_CHUNK_SIZE)
+            inflate_time += time.perf_counter() - started
+            buffer = decompressor.unconsumed_tail
+            if decompressor.eof:
+                buffer = decompressor.unused_data
+                decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+                at_member_start = True
+            if progress is not None:
+                progress['consumed'] = total_in - len(buffer)
+
+            if chunk:
+                total_out += len(chunk)
+                check_decompression_limits(total_in - len(buffer), total_out, max_output, max_ratio)
+                yield chunk
+
+        # Drain output still held by a truncated stream
+        if not at_member_start:
+            chunk = decompressor.flush()
+            if chunk:
+                total_out += len(chunk)
+                check_decompression_limits(total_in, total_out, max_output, max_ratio)
+                yield chunk
+    finally:
+        run_stats.add('gzip inflate', inflate_time, total_in, total_out)
+
+def check_decompression_limits(bytes_in, bytes_out, max_output, max_ratio):
+    """Raise DecompressionLimitException if inflated output is out of bounds"""
+    if max_output and bytes_out > max_output:
+        raise DecompressionLimitException(
+            'size', f"inflated past {max_output / 1048576:.0f}MB limit")
+    if max_ratio and bytes_out > RATIO_CHECK_MIN_OUTPUT and bytes_out > max(bytes_in, 1) * max_ratio:
+        raise DecompressionLimitException(
+            'ratio', f"compression ratio above {max_ratio}:1 ({bytes_in} bytes -> {bytes_out} bytes)")
+
+# The breaks str.splitlines() knows, as UTF-8 bytes, so lines split the same as decoded text
+LINE_BREAK_PATTERN = re.compile(rb'\r\n|[\n\r\x0b\x0c\x1c-\x1e]|\xc2\x85|\xe2\x80[\xa8\xa9]')
+
+def iter_chunk_lines(chunks):
+    """Split a stream of byte chunks into lines without joining the whole stream"""
+    pending = b''
+    for chunk in chunks:
+        pending += chunk
+        lines = LINE_BREAK_PATTERN.split(pending)
+        pending = lines.pop()
+        yield from lines
+        # Binary blobs may never contain a newline, don't let them pile up
+        while len(pending) > MAX_LINE_LENGTH:
+            yield pending[:MAX_LINE_LENGTH]
+            pending = pending[MAX_LINE_LENGTH:]
+    if pending:
+        yield pending
+
+def load_nbt_bounded(file_path, data=None):
+    """Load an NBT file, inflating gzip payloads under the decompression limits
+    
+    data is the file's content when a prefetch thread already read it.
+    """
+    import nbtlib  # Imported on first use, workers and log-only scans never pay for it
+    if data is None:
+        with open(file_path, 'rb') as f:
+            compressed = f.read(2) == b'\x1f\x8b'
+        if not compressed:
+            return nbtlib.load(file_path)
+        chunks = iter_gzip_chunks(file_path, max_output=MAX_NBT_DECOMPRESSED_SIZE)
+    else:
+        if data[:2] != b'\x1f\x8b':
+            return nbtlib.File.from_fileobj(io.BytesIO(data))
+        chunks = iter_gzip_stream(io.BytesIO(data), max_output=MAX_NBT_DECOMPRESSED_SIZE)
+
+    return nbtlib.File.from_fileobj(io.BytesIO(b''.join(chunks)))
+
+def match_log_line(line):
+    """Return the (version, gamemode, seed) found in a stripped log line, None where absent"""
+    version = None
+    gamemode = None
+    seed_value = None
+    
+    # Look for version information
+    for pattern in version_patterns:
+        match = pattern.search(line)
+        if match:
+            version = match.group(1)
+            break
+    
+    # Look for game mode information
+    for pattern in gamemode_patterns:
+        match = pattern.search(line)
+        if match:
+            gamemode = match.group(1).title()
+            break
+    
+    # Skip unimportant log entries for regular seed processing. Lines with control characters
+    # are binary data read as a log (gzipped NBT, carvings), any "seed" in them is noise
+    if (is_meaningful_log(line) and any(term in line for term in ['seed', 'Seed', '/seed'])
+            and not ILLEGAL_CELL_RE.search(line)):
+        for pattern in seed_patterns:
+            match = pattern.search(line)
+            if match:
+                candidate = match.group(1)
+                if is_valid_seed(candidate) and normalize_seed(candidate) not in ignored_seeds:
+                    seed_value = candidate
+                    break
+    
+    return version, gamemode, seed_value
+
+def record_log_seed(result, filename, root, line, seed_value, version, gamemode):
+    """Add a seed found in a log line to Log Results and the unique seed table"""
+    # Add to log results
+    result.add_row("Log Results", (filename, root, line, seed_value))
+    
+    # Only the fields a log line can tell us, everything else stays as it is
+    seed_info = {
+        'filename': filename,
+        'world_name': 'Found in Logs',
+        'game_mode': gamemode,
+        'version': version,
+        'path': root
+    }
+    
+    # Update unique seeds with log information
+    result.seeds.append((seed_value, seed_info))
+    result.log_hits.append((seed_value, filename, root, line))
+
+def process_log_content(result, log_data, filename, root):
+    """Process log content for seed information"""
+    started = time.perf_counter()
+    line_count = 0
+    try:
+        if isinstance(log_data, (list, tuple)) or hasattr(log_data, '__next__'):
+            lines = log_data
+        else:
+            try:
+                lines = log_data.readlines()
+            except AttributeError:
+                lines = str(log_data).splitlines()
+        
+        # Track version and game mode info for the current file
+        current_version = 'Unknown'
+        current_gamemode = 'Unknown'
+        
+        for line in lines:
+            line_count += 1
+            try:
+                if isinstance(line, bytes):
+                    line = line.decode('utf-8', errors='ignore')
+                elif not isinstance(line, str):
+                    line = str(line)
                 
-                # Look for game mode information
-                for pattern in gamemode_patterns:
-                    match = pattern.search(line)
-                    if match:
-                        current_gamemode = match.group(1).title()
-                        break
+                line = line.strip()
+                if not line:
+                    continue
                 
-                # Look for potential seeds in every non-empty line
-                find_potential_seeds(line, filename, root)
+                version, gamemode, seed_value = match_log_line(line)
+                if version:
+                    current_version = version
+                if gamemode:
+                    current_gamemode = gamemode
                 
-                # Skip unimportant log entries for regular seed processing
-                if not is_meaningful_log(line):
-                    continue
+                # Look for potential seeds in every non-empty line
+                find_potential_seeds(result, line, filename, root)
                 
-                # Regular seed processing continues as before...
-                if any(term in line for term in ['seed', 'Seed', '/seed']):
-                    for pattern in seed_patterns:
-                        match = pattern.search(line)
-                        if match:
-                            seed_value = match.group(1)
-                            if is_valid_seed(seed_value) and seed_value not in ignored_seeds:
-                                # Add to log results
-                                ws_log[f'A{row_log}'] = filename
-                                ws_log[f'B{row_log}'] = root
-                                ws_log[f'C{row_log}'] = line
-                                ws_log[f'D{row_log}'] = seed_value
-                                row_log += 1
-                                
-                                # Create seed info dictionary
-                                seed_info = {
-                                    'filename': filename,
-                                    'world_name': 'Found in Logs',
-                                    'game_mode': current_gamemode,
-                                    'generator': 'Unknown',
-                                    'version': current_version,
-                                    'last_played': 'Unknown',
-                                    'path': root,
-                                    'total_time': 'Unknown',
-                                    'spawn_location': 'Unknown',
-                                    'data_version': 'Unknown',
-                                    'difficulty': 'Unknown',
-                                    'hardcore': 'Unknown',
-                                    'allow_commands': 'Unknown',
-                                    'size_on_disk': 'Unknown'
-                                }
-                                
-                                # Update unique seeds with log information
-                                update_unique_seed_info(seed_value, seed_info)
-                                break
+                if seed_value:
+                    record_log_seed(result, filename, root, line, seed_value, current_version, current_gamemode)
             except:
                 continue
+    except DecompressionLimitException:
+        raise  # Let the caller record why the stream was cut off
     except:
         pass
+    finally:
+        run_stats.add('log scan', time.perf_counter() - started, items=line_count)
+
+# Log lines worth a closer look, and the stricter set once a big file has been sampled
+LOG_IMPORTANT_TERMS = (b'seed', b'world', b'version', b'minecraft', b'generate')
+LOG_SAMPLE_TERMS = (b'seed', b'world', b'version', b'minecraft')
+LOG_TERMS_PATTERN = re.compile(b'|'.join(map(re.escape, LOG_IMPORTANT_TERMS)), re.IGNORECASE)
 
-def process_regular_file_for_logs(file_path, root, filename):
-    """Process a regular file for log content"""
+# Per-process state for parallel log workers
+worker_log_file = None
+worker_log_map = None
+
+def split_newline_ranges(buffer, size, range_size):
+    """Split a buffer into byte ranges of about range_size that each end after a newline"""
+    ranges = []
+    start = 0
+    while start < size:
+        end = min(size, start + range_size)
+        if end < size:
+            newline = buffer.find(b'\n', end)
+            end = size if newline == -1 else newline + 1
+        ranges.append((start, end))
+        start = end
+    return ranges
+
+def iter_keyword_lines(chunk, count_lines=False):
+    """Yield (index, line, lowered) for the lines of chunk that contain a log term
+    
+    Finds the terms with one regex search instead of splitting every line, for regions
+    that are mostly binary. Lines break on LF and CR like bytes.splitlines(), and index
+    is the line's position in that split (only counted when count_lines is on).
+    """
+    position = 0
+    index = 0
+    counted = 0
+    while True:
+        match = LOG_TERMS_PATTERN.search(chunk, position)
+        if match is None:
+            return
+        line_start = max(chunk.rfind(b'\n', 0, match.start()), chunk.rfind(b'\r', 0, match.start())) + 1
+        line_end = min((found for found in (chunk.find(b'\n', match.end()), chunk.find(b'\r', match.end()))
+                        if found != -1), default=len(chunk))
+        if count_lines:
+            index += (chunk.count(b'\n', counted, line_start) + chunk.count(b'\r', counted, line_start)
+                      - chunk.count(b'\r\n', counted, line_start))
+            counted = line_start
+        line = chunk[line_start:line_end]
+        yield index, line, line.lower()
+        position = line_end
+
+def scan_log_range(buffer, start, end, sample_after=None, filtered=True, sparse=False):
+    """Run the log matchers over one newline-aligned byte range without touching the workbook
+    
+    Lines are filtered on the raw bytes and only decoded when they match. With filtered
+    off every line is decoded (small files), and sample_after switches to the stricter
+    term set after that many lines of the range. sparse ranges (mostly binary) are
+    searched for the terms instead of being split into lines, with the same result.
+    
+    Returns (hits, potential, version, gamemode). hits are (line, seed, version, gamemode)
+    tuples in file order, with None where the range hasn't seen a version or gamemode yet.
+    potential maps each token to the sightings that raised its confidence, in order.
+    """
+    chunk = buffer[start:end]
+    if sparse:
+        candidates = iter_keyword_lines(chunk, count_lines=bool(sample_after))
+    else:
+        raw_lines = chunk.splitlines()
+        lowered_lines = chunk.lower().splitlines() if filtered else raw_lines
+        del chunk
+        candidates = zip(itertools.count(), raw_lines, lowered_lines)
+    
+    hits = []
+    potential = {}
+    potential_levels = collections.Counter()
+    current_version = None
+    current_gamemode = None
+    
+    for index, raw_line, lowered in candidates:
+        if filtered:
+            # Very large files are sampled: past sample_after lines only the strict terms count
+            sampling = sample_after is not None and index >= sample_after
+            terms = LOG_SAMPLE_TERMS if sampling else LOG_IMPORTANT_TERMS
+            if not any(term in lowered for term in terms):
+                continue
+        
+        try:
+            line = raw_line.decode('utf-8', errors='ignore').strip()
+            if not line:
+                continue
+            
+            version, gamemode, seed_value = match_log_line(line)
+            if version:
+                current_version = version
+            if gamemode:
+                current_gamemode = gamemode
+            
+            for word, context, confidence in iter_potential_seeds(line):
+                add_potential_sighting(potential, potential_levels, word, confidence, context, line)
+            
+            if seed_value:
+                hits.append((line, seed_value, current_version, current_gamemode))
+        except:
+            continue
+    
+    return hits, potential, current_version, current_gamemode
+
+def init_log_range_worker(file_path, options):
+    """Map the log once in each worker process, with the parent's settings (spawned workers start from the defaults)"""
+    global worker_log_file, worker_log_map
+    apply_options(options)
+    worker_log_file = open(file_path, 'rb')
+    worker_log_map = mmap.mmap(worker_log_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+def scan_log_range_worker(start, end, sample_after, filtered, sparse):
+    """Worker entry point for scan_log_range over the shared map"""
+    return scan_log_range(worker_log_map, start, end, sample_after, filtered, sparse)
+
+def merge_log_range_result(result, range_result, filename, root, carry):
+    """Add one range's results in file order, carrying version/gamemode across ranges"""
+    hits, potential, version, gamemode = range_result
+    for line, seed_value, hit_version, hit_gamemode in hits:
+        record_log_seed(result, filename, root, line, seed_value,
+                        hit_version or carry['version'], hit_gamemode or carry['gamemode'])
+    for word, sightings in potential.items():
+        for confidence, context, line in sightings:
+            result.add_potential(word, filename, context, line, root, confidence)
+    carry['version'] = version or carry['version']
+    carry['gamemode'] = gamemode or carry['gamemode']
+
+@contextmanager
+def map_file(file_path):
+    """Read-only memory map of a whole file"""
+    with open(file_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as file_map:
+        yield file_map
+
+def process_log_file_mapped(result, file_path, root, filename, file_size, workers=1, data=None):
+    """Scan an uncompressed log through a read-only memory map, decoding only matching lines
+    
+    With more than one worker the newline-aligned ranges are scanned by a process pool
+    and merged back in file order, so the results match a single-process scan. data is
+    the file's content when a prefetch thread already read it, it is scanned in place
+    of the map.
+    """
+    with nullcontext(data) if data is not None else map_file(file_path) as log_map:
+        # Sample across the whole file, not just its first KB, skipping it only past the old cutoff
+        with run_stats.timed('classify'):
+            if classify_content(log_map, ratio=FILE_BINARY_RATIO)[0] == 'binary':
+                return False
+            verdict, _ = classify_content(log_map)
+        
+        if file_size <= SMALL_FILE_THRESHOLD:
+            # Small files: every line is examined
+            tasks = [(0, file_size, None, False, False)]
+        else:
+            # Large files: keyword filter, and past MAX_SAMPLE_LINES only the strict terms
+            sampled = file_size > LARGE_FILE_THRESHOLD
+            range_size = PARALLEL_LOG_RANGE_SIZE if verdict == 'text' else MIXED_REGION_SIZE
+            ranges = split_newline_ranges(log_map, file_size, range_size)
+            # Regions that sample as binary are searched for the terms instead of line-split
+            sparse = [verdict != 'text' and classify_content(log_map, start, end)[0] == 'binary'
+                      for start, end in ranges]
+            tasks = [(start, end, (MAX_SAMPLE_LINES if index == 0 else 0) if sampled else None, True, sparse[index])
+                     for index, (start, end) in enumerate(ranges)]
+        
+        carry = {'version': 'Unknown', 'gamemode': 'Unknown'}
+        merged = 0
+        
+        if workers > 1 and len(tasks) > 1:
+            try:
+                # Spawned like ProcessorPool's workers, the pipeline's threads may hold locks a fork would copy
+                with ProcessPoolExecutor(max_workers=min(workers, len(tasks)),
+                                         mp_context=multiprocessing.get_context('spawn'),
+                                         initializer=init_log_range_worker,
+                                         initargs=(file_path, current_options())) as executor:
+                    # map() yields in submission order, so merging stays in file order
+                    for range_result in executor.map(scan_log_range_worker, *zip(*tasks)):
+                        merge_log_range_result(result, range_result, filename, root, carry)
+                        merged += 1
+                        progress.update(f"Scanning {filename[:40]}: {merged}/{len(tasks)} parts")
+            except Exception as e:  # BrokenProcessPool, or the engine can't be pickled by name
+                log.warning("Parallel scan of %s failed (%s), continuing in one process", filename, e)
+        
+        # Single worker, single range, or whatever was left after a pool failure
+        for task in tasks[merged:]:
+            merge_log_range_result(result, scan_log_range(log_map, *task), filename, root, carry)
+    return True
+
+def process_regular_file_for_logs(file_path, root, filename, data=None):
+    """Process a regular file for log content, returning its FileResult (data is its prefetched content)"""
+    result = FileResult()
     try:
         file_size = os.path.getsize(file_path)
         if file_size == 0:
-            return False
+            return result
             
+        if file_size >= PARALLEL_LOG_THRESHOLD:
+            # Giant logs are split across processes and skip the per-file timeout
+            process_log_file_mapped(result, file_path, root, filename, file_size, PARALLEL_LOG_WORKERS)
+            return result
+        
         timeout = get_timeout_for_size(file_path)
         
         @timeout_handler(timeout)
         def read_and_process_file():
             try:
-                # For small files, read the whole thing
-                if file_size <= SMALL_FILE_THRESHOLD:
-                    with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                        content = f.read()
-                        if is_binary_content(content):
-                            return False
-                        process_log_content(content.splitlines(), filename, root)
-                        return True
-                
-                # For large files, use selective sampling
-                lines_processed = 0
-                important_lines = []
-                
-                with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                    # Check first chunk for binary content
-                    sample = f.read(1024)
-                    if is_binary_content(sample):
-                        return False
-                    
-                    # Reset file pointer
-                    f.seek(0)
-                    
-                    # Process file in chunks
-                    for line in f:
-                        lines_processed += 1
-                        
-                        # For very large files, sample strategically
-                        if file_size > LARGE_FILE_THRESHOLD and lines_processed > MAX_SAMPLE_LINES:
-                            if not any(term in line.lower() for term in ['seed', 'world', 'version', 'minecraft']):
-                                continue
-                        
-                        # Quick check for meaningful content
-                        if any(term in line.lower() for term in ['seed', 'world', 'version', 'minecraft', 'generate']):
-                            important_lines.append(line)
-                            
-                            # Process in batches of 100 important lines
-                            if len(important_lines) >= 100:
-                                process_log_content(important_lines, filename, root)
-                                important_lines = []
-                
-                # Process any remaining important lines
-                if important_lines:
-                    process_log_content(important_lines, filename, root)
-                return True
-                
-            except UnicodeDecodeError:
-                try:
-                    # If text reading fails, try as binary
-                    with open(file_path, 'rb') as f:
-                        content = f.read(CHUNK_SIZE)
-                        if not is_binary_content(content):
-                            # Try processing as text if not binary
-                            f.seek(0)
-                            text_content = f.read().decode('utf-8', errors='ignore')
-                            process_log_content(text_content.splitlines(), filename, root)
-                            return True
-                except:
-                    pass
+                # Map the file and match on raw bytes, no full-file str decode
+                return process_log_file_mapped(result, file_path, root, filename, file_size, data=data)
             except Exception as e:
-                print(f"\nWarning: Error processing {filename}: {str(e)}")
+                log.warning("Error processing %s: %s", filename, e)
             return False
         
-        return read_and_process_file()
+        read_and_process_file()
         
     except TimeoutException:
-        print(f"\nSkipping {filename} (timeout after {timeout:.1f}s)")
-        errors_encountered += 1
-        
-        ws_errors[f'A{row_errors}'] = filename
-        ws_errors[f'B{row_errors}'] = f"Operation timed out (>{timeout:.1f} seconds)"
-        ws_errors[f'C{row_errors}'] = root
-        row_errors += 1
+        log.warning("Skipping %s (timeout after %.1fs)", filename, timeout)
+        result.timeout('log', filename, root, timeout)
         
-        ws_data[f'A{row_data}'] = filename
-        ws_data[f'B{row_data}'] = "Error: Operation timed out"
-        ws_data[f'H{row_data}'] = root
-        ws_data[f'P{row_data}'] = "Yes"
-        ws_data[f'P{row_data}'].fill = error_fill
-        row_data += 1
+        result.error(filename, f"Operation timed out (>{timeout:.1f} seconds)", root)
         
-        return False
+        result.data_error(filename, "Error: Operation timed out", root)
         
     except Exception as e:
-        errors_encountered += 1
         error_msg = str(e)
         
-        ws_errors[f'A{row_errors}'] = filename
-        ws_errors[f'B{row_errors}'] = error_msg
-        ws_errors[f'C{row_errors}'] = root
-        row_errors += 1
-        
-        ws_data[f'A{row_data}'] = filename
-        ws_data[f'B{row_data}'] = f"Error: {error_msg}"
-        ws_data[f'H{row_data}'] = root
-        ws_data[f'P{row_data}'] = "Yes"
-        ws_data[f'P{row_data}'].fill = error_fill
-        row_data += 1
-        return False
+        result.error(filename, error_msg, root)
+        
+        result.data_error(filename, f"Error: {error_msg}", root)
+    return result
 
-def process_gz_file(file_path, root, filename):
-    """Process a gzipped file for log content"""
+def read_gzip_fingerprint(file_path):
+    """Read gzip header MTIME/FNAME and trailer CRC32/ISIZE without inflating anything"""
+    compressed_size = os.path.getsize(file_path)
+    if compressed_size < 18:  # 10 byte header + 8 byte trailer
+        return None
+    
+    with open(file_path, 'rb') as f:
+        header = f.read(10)
+        if header[:3] != b'\x1f\x8b\x08':
+            return None
+        flags = header[3]
+        mtime = struct.unpack('<I', header[4:8])[0]
+        
+        original_name = None
+        if flags & 0x04:  # FEXTRA
+            extra_length = struct.unpack('<H', f.read(2))[0]
+            f.seek(extra_length, os.SEEK_CUR)
+        if flags & 0x08:  # FNAME, zero terminated ISO-8859-1
+            name = f.read(1024).split(b'\x00', 1)[0]
+            original_name = name.decode('latin-1')
+        
+        f.seek(-8, os.SEEK_END)
+        crc32, isize = struct.unpack('<II', f.read(8))
+    
+    # ISIZE is the inflated size mod 4GB, and garbage on truncated carvings
+    estimated_size = isize
+    if isize < compressed_size and compressed_size > SMALL_FILE_THRESHOLD:
+        estimated_size = None
+    
+    return {
+        'mtime': mtime,
+        'original_name': original_name,
+        'crc32': crc32,
+        'isize': isize,
+        'estimated_size': estimated_size,
+        'compressed_size': compressed_size,
+        'duplicate_of': None
+    }
+
+def gzip_log_date(fingerprint, filename):
+    """Date a gzip log from its header MTIME, falling back to the rolled log file name"""
+    if fingerprint['mtime']:
+        return datetime.fromtimestamp(fingerprint['mtime']).strftime('%Y-%m-%d %H:%M:%S')
+    # Minecraft writes MTIME 0 but names rolled logs like 2013-05-02-1.log.gz
+    for name in (fingerprint['original_name'] or '', filename):
+        match = re.search(r'(\d{4}-\d{2}-\d{2})', name)
+        if match:
+            return match.group(1)
+    return 'Unknown'
+
+def catalog_gz_files(result, minecraft_files):
+    """Fingerprint every gzip candidate and add it to the Gz Catalog sheet
+    
+    Returns a dict of file path -> fingerprint. Files with the same CRC32, inflated
+    size and compressed size as an earlier one get 'duplicate_of' set to that file's
+    path. The trailer is only the last 8 bytes, so carvings ending in the same fill
+    would match too: a trailer that isn't plausible (estimated_size None, or more
+    than MAX_COMPRESSION_RATIO times the file) is never deduplicated.
+    """
+    catalog = {}
+    first_seen = {}
+    for file_type, root, filename, file_path in minecraft_files:
+        if file_type != "gz" or file_path in catalog:
+            continue
+        try:
+            fingerprint = read_gzip_fingerprint(file_path)
+        except OSError:
+            continue
+        if fingerprint is None:
+            continue
+        
+        if (fingerprint['isize'] > 0 and fingerprint['estimated_size'] is not None
+                and fingerprint['isize'] <= fingerprint['compressed_size'] * MAX_COMPRESSION_RATIO):
+            key = (fingerprint['crc32'], fingerprint['isize'], fingerprint['compressed_size'])
+            if key in first_seen:
+                fingerprint['duplicate_of'] = first_seen[key]
+            else:
+                first_seen[key] = file_path
+        catalog[file_path] = fingerprint
+        
+        result.add_row("Gz Catalog", (filename, root, gzip_log_date(fingerprint, filename),
+                                      fingerprint['original_name'] or '', f"{fingerprint['crc32']:08X}",
+                                      fingerprint['isize'], fingerprint['compressed_size'], fingerprint['duplicate_of'] or ''))
+    
+    return catalog
+
+def process_gz_file(file_path, root, filename, estimated_size=None, data=None):
+    """Process a gzipped file for log content
+    
+    estimated_size is the inflated size from the gzip trailer when known, it
+    decides between the full and sampled paths instead of the compressed size.
+    data is the file's content when a prefetch thread already read it.
+    Returns the file's FileResult.
+    """
+    result = FileResult()
     try:
         file_size = os.path.getsize(file_path)
         if file_size == 0:
-            return False
+            return result
             
         # Quick check if file is actually gzipped
-        with open(file_path, 'rb') as f:
-            header = f.read(2)
-            if header != b'\x1f\x8b':  # Not a valid gzip file
-                return False
-            f.seek(0)  # Reset file pointer
+        if data is None:
+            with open(file_path, 'rb') as f:
+                header = f.read(2)
+        else:
+            header = data[:2]
+        if header != b'\x1f\x8b':  # Not a valid gzip file
+            return result
             
+        inflated_size = estimated_size if estimated_size is not None else file_size
         timeout = get_timeout_for_size(file_path)
         
         @timeout_handler(timeout)
         def read_and_process_gz():
             try:
-                with gzip.open(file_path, 'rb') as f:
-                    # Check first chunk for binary content
-                    content = f.read(CHUNK_SIZE)
-                    if is_binary_content(content):
-                        return False
-                    
-                    # For small files, process everything
-                    if file_size <= SMALL_FILE_THRESHOLD:
-                        f.seek(0)
-                        content = f.read().decode('utf-8', errors='ignore')
-                        process_log_content(content.splitlines(), filename, root)
-                        return True
-                    
-                    # For large files, process in chunks and sample
-                    f.seek(0)
-                    lines_processed = 0
-                    important_lines = []
-                    
-                    # Read and process line by line
-                    for line in f:
-                        try:
-                            line = line.decode('utf-8', errors='ignore')
-                            lines_processed += 1
-                            
-                            # For very large files, sample strategically
-                            if file_size > LARGE_FILE_THRESHOLD and lines_processed > MAX_SAMPLE_LINES:
-                                if not any(term in line.lower() for term in ['seed', 'world', 'version', 'minecraft']):
-                                    continue
-                            
-                            # Quick check for meaningful content
-                            if any(term in line.lower() for term in ['seed', 'world', 'version', 'minecraft', 'generate']):
-                                important_lines.append(line)
-                                
-                                # Process in batches of 100 important lines
-                                if len(important_lines) >= 100:
-                                    process_log_content(important_lines, filename, root)
-                                    important_lines = []
-                        except:
-                            continue
-                    
-                    # Process any remaining important lines
-                    if important_lines:
-                        process_log_content(important_lines, filename, root)
+                # Inflate in bounded chunks so a tiny carved file can't expand to gigabytes
+                chunks = iter_gzip_chunks(file_path) if data is None else iter_gzip_stream(io.BytesIO(data))
+                
+                # Check first chunk for binary content
+                first_chunk = next(chunks, b'')
+                if is_binary_content(first_chunk[:CHUNK_SIZE]):
+                    return False
+                
+                lines = iter_chunk_lines(itertools.chain([first_chunk], chunks))
+                
+                # For small files, process everything (streamed, never joined in memory)
+                if inflated_size <= SMALL_FILE_THRESHOLD:
+                    process_log_content(result, lines, filename, root)
                     return True
+                
+                # For large files, process in chunks and sample
+                lines_processed = 0
+                important_lines = []
+                
+                # Read and process line by line
+                for line in lines:
+                    try:
+                        line = line.decode('utf-8', errors='ignore')
+                        lines_processed += 1
+                        
+                        # For very large files, sample strategically
+                        if inflated_size > LARGE_FILE_THRESHOLD and lines_processed > MAX_SAMPLE_LINES:
+                            if not any(term in line.lower() for term in ['seed', 'world', 'version', 'minecraft']):
+                                continue
+                        
+                        # Quick check for meaningful content
+                        if any(term in line.lower() for term in ['seed', 'world', 'version', 'minecraft', 'generate']):
+                            important_lines.append(line)
+                            
+                            # Process in batches of 100 important lines
+                            if len(important_lines) >= 100:
+                                process_log_content(result, important_lines, filename, root)
+                                important_lines = []
+                    except:
+                        continue
+                
+                # Process any remaining important lines
+                if important_lines:
+                    process_log_content(result, important_lines, filename, root)
+                return True
                     
-            except gzip.BadGzipFile:
+            except DecompressionLimitException:
+                raise
+            except (gzip.BadGzipFile, zlib.error):
                 return False  # Silently ignore bad gzip files
             except Exception as e:
                 if 'Not a gzipped file' in str(e):
                     return False  # Silently ignore non-gzip files
                 # Only log actual errors, not gzip-related ones
-                print(f"\nWarning: Error processing gzipped file {filename}: {str(e)}")
+                log.warning("Error processing gzipped file %s: %s", filename, e)
                 return False
         
-        return read_and_process_gz()
+        read_and_process_gz()
         
     except TimeoutException:
-        print(f"\nSkipping {filename} (timeout after {timeout:.1f}s)")
+        log.warning("Skipping %s (timeout after %.1fs)", filename, timeout)
+        result.timeout('gz', filename, root, timeout)
         # Only log timeout errors for valid gzip files
-        errors_encountered += 1
-        ws_errors[f'A{row_errors}'] = filename
-        ws_errors[f'B{row_errors}'] = f"Operation timed out (>{timeout:.1f} seconds)"
-        ws_errors[f'C{row_errors}'] = root
-        row_errors += 1
-        return False
+        result.error(filename, f"Operation timed out (>{timeout:.1f} seconds)", root)
+    
+    except DecompressionLimitException as e:
+        log.warning("Stopped inflating %s (%s)", filename, e)
+        result.error(filename, f"Decompression aborted ({e.reason}): {e}", root)
         
     except Exception as e:
         # Don't log gzip-related errors
-        if 'Not a gzipped file' in str(e) or isinstance(e, gzip.BadGzipFile):
-            return False
-        # Only log actual errors
-        errors_encountered += 1
-        error_msg = str(e)
-        ws_errors[f'A{row_errors}'] = filename
-        ws_errors[f'B{row_errors}'] = error_msg
-        ws_errors[f'C{row_errors}'] = root
-        row_errors += 1
-        return False
+        if 'Not a gzipped file' not in str(e) and not isinstance(e, gzip.BadGzipFile):
+            # Only log actual errors
+            result.error(filename, str(e), root)
+    return result
 
-def update_unique_seed_info(seed, info):
-    """Update unique seed information with the most complete data available"""
-    if seed not in unique_seeds:
-        unique_seeds[seed] = {
-            'filename': info.get('filename', 'Unknown'),
-            'world_name': info.get('world_name', 'Unknown'),
-            'game_mode': info.get('game_mode', 'Unknown'),
-            'generator': info.get('generator', 'Unknown'),
-            'version': info.get('version', 'Unknown'),
-            'last_played': info.get('last_played', 'Unknown'),
-            'path': info.get('path', 'Unknown'),
-            'times_found': 1,
-            'total_time': info.get('total_time', 'Unknown'),
-            'spawn_location': info.get('spawn_location', 'Unknown'),
-            'data_version': info.get('data_version', 'Unknown'),
-            'difficulty': info.get('difficulty', 'Unknown'),
-            'hardcore': info.get('hardcore', 'Unknown'),
-            'allow_commands': info.get('allow_commands', 'Unknown'),
-            'size_on_disk': info.get('size_on_disk', 'Unknown')
-        }
+def iter_find(buffer, needle, start, end):
+    """Yield every offset of needle that starts in [start, end)"""
+    end = min(len(buffer), end + len(needle) - 1)
+    pos = buffer.find(needle, start, end)
+    while pos != -1:
+        yield pos
+        pos = buffer.find(needle, pos + 1, end)
+
+# Control bytes stripped from lines pulled out of binary blobs (tab is kept)
+BLOB_CONTROL_BYTES = bytes(range(0, 9)) + bytes(range(10, 32)) + b'\x7f'
+
+def find_seed_lines(buffer, start, end):
+    """Return the text lines around each 'seed' keyword starting in [start, end)"""
+    positions = sorted(itertools.chain(
+        iter_find(buffer, b'eed', start + 1, end + 1),
+        iter_find(buffer, b'EED', start + 1, end + 1)))
+    
+    lines = []
+    last_line_end = -1
+    for pos in positions:
+        if buffer[pos - 1] not in b'sS':
+            continue
+        if pos < last_line_end:
+            continue  # Same line as the previous hit
+        
+        line_start = buffer.rfind(b'\n', max(0, pos - MAX_LINE_LENGTH), pos) + 1
+        line_start = max(line_start, pos - MAX_LINE_LENGTH)
+        line_end = buffer.find(b'\n', pos, min(len(buffer), pos + MAX_LINE_LENGTH))
+        if line_end == -1:
+            line_end = min(len(buffer), pos + MAX_LINE_LENGTH)
+        
+        lines.append(buffer[line_start:line_end].translate(None, BLOB_CONTROL_BYTES))
+        last_line_end = line_end
+    return lines
+
+def scan_embedded_gzip(result, f, offset, root, filename):
+    """Inflate a gzip member found inside a larger file and process it as a log or level
+    
+    Returns the number of compressed bytes consumed, 0 if the signature was a false hit.
+    """
+    f.seek(offset)
+    header = f.read(10)
+    if len(header) < 10 or header[3] & 0xE0:  # Reserved flag bits set, random bytes
+        return 0
+    
+    f.seek(offset)
+    progress = {'consumed': 0}
+    label = f"{filename} @0x{offset:X}"
+    try:
+        chunks = iter_gzip_stream(f, progress=progress)
+        first_chunk = next(chunks, b'')
+        
+        if first_chunk.startswith(b'\x0a'):  # Gzipped NBT compound, e.g. a carved level.dat
+            parts = [first_chunk]
+            size = len(first_chunk)
+            for chunk in chunks:
+                size += len(chunk)
+                if size > MAX_NBT_DECOMPRESSED_SIZE:
+                    raise DecompressionLimitException(
+                        'size', f"inflated past {MAX_NBT_DECOMPRESSED_SIZE / 1048576:.0f}MB limit")
+                parts.append(chunk)
+            import nbtlib
+            nbt_file = nbtlib.File.from_fileobj(io.BytesIO(b''.join(parts)))
+            record_nbt_world(result, nbt_file.root.get('Data', {}), root, label)
+        elif first_chunk and not is_binary_content(first_chunk[:CHUNK_SIZE]):
+            process_log_content(result, iter_chunk_lines(itertools.chain([first_chunk], chunks)), label, root)
+    except DecompressionLimitException as e:
+        result.error(label, f"Decompression aborted ({e.reason}): {e}", root)
+    except Exception:
+        pass  # Truncated member or a signature inside unrelated data
+    return progress['consumed']
+
+def process_huge_file(file_path, root, filename):
+    """Scan a multi-GB file in memory-mapped windows for gzip members and seed text, returning its FileResult"""
+    result = FileResult()
+    try:
+        file_size = os.path.getsize(file_path)
+        resume_at = 0  # Signatures before this offset are inside a member already inflated
+        
+        with open(file_path, 'rb') as f, open(file_path, 'rb') as member_f:
+            for window_start in range(0, file_size, HUGE_FILE_WINDOW_SIZE):
+                window_end = min(window_start + HUGE_FILE_WINDOW_SIZE, file_size)
+                map_start = max(0, window_start - HUGE_FILE_WINDOW_OVERLAP)
+                map_start -= map_start % mmap.ALLOCATIONGRANULARITY
+                map_end = min(file_size, window_end + HUGE_FILE_WINDOW_OVERLAP)
+                
+                progress.update(f"Scanning {filename[:40]}: {window_end * 100 // file_size}%")
+                
+                with mmap.mmap(f.fileno(), map_end - map_start, access=mmap.ACCESS_READ, offset=map_start) as window:
+                    if hasattr(window, 'madvise'):
+                        window.madvise(mmap.MADV_SEQUENTIAL)
+                    
+                    for pos in iter_find(window, b'\x1f\x8b\x08', window_start - map_start, window_end - map_start):
+                        offset = map_start + pos
+                        if offset < resume_at:
+                            continue
+                        resume_at = offset + scan_embedded_gzip(result, member_f, offset, root, filename)
+                    
+                    lines = find_seed_lines(window, window_start - map_start, window_end - map_start)
+                    if lines:
+                        process_log_content(result, lines, filename, root)
+        
+    except Exception as e:
+        log.warning("Error scanning large file %s: %s", filename, e)
+        result.error(filename, str(e), root)
+    return result
+
+def format_last_played(last_played):
+    """Format a LastPlayed epoch in milliseconds for the sheets"""
+    if isinstance(last_played, (int, float)):
+        try:
+            return datetime.fromtimestamp(last_played / 1000.0).strftime('%Y-%m-%d %H:%M:%S')
+        except (OverflowError, OSError, ValueError):
+            return str(last_played)
+    return last_played
+
+def version_key(version):
+    """Sortable key for version names, so 1.10 sorts above 1.9 and releases above their pre-releases"""
+    release, _, suffix = str(version).partition('-')
+    return tuple(int(number) for number in re.findall(r'\d+', release)), not suffix
+
+def update_unique_seed_info(unique_seeds, seed, info):
+    """Update a SeedStore with the most complete data available, True when the seed is new"""
+    record = unique_seeds.record_for(seed)
+    record.times_found += 1
+    
+    if record.times_found == 1:
+        # First sighting, nothing to compare against
+        for field, new_value in info.items():
+            if new_value != 'Unknown' and field in SEED_FIELD_SET:
+                if field in INTERNED_SEED_FIELDS and isinstance(new_value, str):
+                    new_value = sys.intern(str(new_value))
+                setattr(record, field, new_value)
+        return True
+    
+    # Version names follow DataVersion when both sightings have one
+    new_data_version = info.get('data_version')
+    if isinstance(new_data_version, int) and isinstance(record.data_version, int):
+        newer_version = new_data_version > record.data_version
     else:
-        unique_seeds[seed]['times_found'] += 1
+        newer_version = None
+    
+    # Only look at fields the caller actually knows
+    for field, new_value in info.items():
+        if new_value == 'Unknown' or field not in SEED_FIELD_SET:
+            continue
+        current_value = getattr(record, field)
+        if current_value == new_value:
+            continue
+        if field in INTERNED_SEED_FIELDS and isinstance(new_value, str):
+            new_value = sys.intern(str(new_value))
         
-        # Update each field if the new data is more complete
-        for field in unique_seeds[seed]:
-            if field == 'times_found':
-                continue
-            
-            current_value = unique_seeds[seed][field]
-            new_value = info.get(field, 'Unknown')
-            
-            # Keep the more informative value
-            if current_value == 'Unknown' and new_value != 'Unknown':
-                unique_seeds[seed][field] = new_value
-            elif current_value != 'Unknown' and new_value != 'Unknown':
-                # For timestamps, keep the most recent
-                if field == 'last_played':
-                    try:
-                        current_time = datetime.strptime(current_value, '%Y-%m-%d %H:%M:%S')
-                        new_time = datetime.strptime(new_value, '%Y-%m-%d %H:%M:%S')
-                        if new_time > current_time:
-                            unique_seeds[seed][field] = new_value
-                    except:
-                        pass
-                # For version numbers, keep the highest
-                elif field == 'version':
-                    if new_value > current_value:
-                        unique_seeds[seed][field] = new_value
+        # Keep the more informative value
+        if current_value == 'Unknown':
+            setattr(record, field, new_value)
+        # For timestamps (epoch milliseconds), keep the most recent
+        elif field == 'last_played':
+            if isinstance(new_value, int) and (not isinstance(current_value, int) or new_value > current_value):
+                record.last_played = new_value
+        # For versions, keep the highest
+        elif field == 'version':
+            if newer_version if newer_version is not None else version_key(new_value) > version_key(current_value):
+                record.version = new_value
+        elif field == 'data_version':
+            if isinstance(new_value, int) and (not isinstance(current_value, int) or new_value > current_value):
+                record.data_version = new_value
+    return False
 
-def process_nbt_file(file_path, root, filename):
-    """Process an NBT file for world data"""
-    global row_data, row_errors, row_corrupted, saved_entries, errors_encountered, corrupted_files
-    global ws_data, ws_errors, ws_corrupted, ws_all_seeds, row_all_seeds, error_fill, unique_seeds
+def record_nbt_world(result, nbt_data, root, filename):
+    """Extract world information from a level's Data compound and add it to the result"""
+    seed = find_seed_in_nbt(nbt_data)
+    if seed is None or seed == '':
+        return
+        
+    # Get all the world information
+    level_name = nbt_data.get('LevelName', 'Unknown')
+    game_mode = nbt_data.get('GameType', 'Unknown')
+    if isinstance(game_mode, int):
+        game_modes = {0: 'Survival', 1: 'Creative', 2: 'Adventure', 3: 'Spectator'}
+        game_mode = game_modes.get(game_mode, f'Unknown ({game_mode})')
+    
+    version = nbt_data.get('Version', {}).get('Name', 'Unknown')
+    last_played = nbt_data.get('LastPlayed', 'Unknown')
+    if isinstance(last_played, int):
+        last_played = int(last_played)  # Epoch milliseconds, formatted when written
+    
+    generator_name = get_generator_name(nbt_data)
+    total_time = nbt_data.get('Time', 'Unknown')
+    
+    spawn_x = nbt_data.get('SpawnX', 'Unknown')
+    spawn_y = nbt_data.get('SpawnY', 'Unknown')
+    spawn_z = nbt_data.get('SpawnZ', 'Unknown')
+    spawn_location = f"X:{spawn_x} Y:{spawn_y} Z:{spawn_z}" if all(coord != 'Unknown' for coord in [spawn_x, spawn_y, spawn_z]) else 'Unknown'
     
+    data_version = nbt_data.get('DataVersion', 'Unknown')
+    if isinstance(data_version, int):
+        data_version = int(data_version)
+    difficulty = nbt_data.get('Difficulty', 'Unknown')
+    if isinstance(difficulty, int):
+        difficulties = {0: 'Peaceful', 1: 'Easy', 2: 'Normal', 3: 'Hard'}
+        difficulty = difficulties.get(difficulty, f'Unknown ({difficulty})')
+    
+    hardcore = nbt_data.get('hardcore', False)
+    allow_commands = nbt_data.get('allowCommands', 'Unknown')
+    size_on_disk = nbt_data.get('SizeOnDisk', 'Unknown')
+    
+    if size_on_disk != 'Unknown' and isinstance(size_on_disk, (int, float)):
+        if size_on_disk > 1073741824:
+            size_on_disk = f"{size_on_disk/1073741824:.2f} GB"
+        elif size_on_disk > 1048576:
+            size_on_disk = f"{size_on_disk/1048576:.2f} MB"
+        elif size_on_disk > 1024:
+            size_on_disk = f"{size_on_disk/1024:.2f} KB"
+        else:
+            size_on_disk = f"{size_on_disk} bytes"
+    
+    # Update unique seeds with all available information
+    seed_info = {
+        'filename': filename,
+        'world_name': level_name,
+        'game_mode': game_mode,
+        'generator': generator_name,
+        'version': version,
+        'last_played': last_played,
+        'path': root,
+        'total_time': total_time,
+        'spawn_location': spawn_location,
+        'data_version': data_version,
+        'difficulty': difficulty,
+        'hardcore': 'Yes' if hardcore else 'No',
+        'allow_commands': 'Yes' if allow_commands else 'No',
+        'size_on_disk': size_on_disk
+    }
+    
+    result.seeds.append((seed, seed_info))
+    result.worlds.append((seed, seed_info))
+    
+    # Write to Data worksheet
+    result.add_row("Data", (
+        filename,
+        str(seed),  # Text, Excel would round 19 digit numbers
+        total_time,
+        generator_name,
+        level_name,
+        game_mode,
+        spawn_location,
+        root,
+        version,
+        data_version,
+        format_last_played(last_played),
+        size_on_disk,
+        difficulty,
+        'Yes' if hardcore else 'No',
+        'Yes' if allow_commands else 'No',
+        "No"
+    ))
+    result.saved += 1
+
+def process_nbt_file(file_path, root, filename, data=None):
+    """Process an NBT file for world data, returning its FileResult (data is its prefetched content)"""
+    result = FileResult()
     timeout = get_timeout_for_size(file_path)
     @timeout_handler(timeout)
     def read_and_process_nbt():
-        if is_completely_empty(file_path):
+        if is_completely_empty(file_path, data):
             return None
-            
-        with open(file_path, 'rb') as f:
-            header = f.read(3)
-            if header.startswith(b'\x1f\x8b'):  # gzip header
-                return nbtlib.load(file_path).root.get('Data', {})
-            elif header.startswith(b'\x0A'):  # NBT header
-                return nbtlib.load(file_path).root.get('Data', {})
-            else:
-                return None  # Not a valid NBT file
+        
+        if data is None:
+            with open(file_path, 'rb') as f:
+                header = f.read(3)
+        else:
+            header = data[:3]
+        if header.startswith(b'\x1f\x8b'):  # gzip header
+            with run_stats.timed('nbt load'):
+                return load_nbt_bounded(file_path, data).root.get('Data', {})
+        elif header.startswith(b'\x0A'):  # NBT header
+            with run_stats.timed('nbt load'):
+                return load_nbt_bounded(file_path, data).root.get('Data', {})
+        else:
+            return None  # Not a valid NBT file
     
     try:
         nbt_data = read_and_process_nbt()
-        if nbt_data is None:
-            return
+        if nbt_data is not None:
+            record_nbt_world(result, nbt_data, root, filename)
         
-        seed = find_seed_in_nbt(nbt_data)
-        if not seed:
-            return
-            
-        # Get all the world information
-        level_name = nbt_data.get('LevelName', 'Unknown')
-        game_mode = nbt_data.get('GameType', 'Unknown')
-        if isinstance(game_mode, int):
-            game_modes = {0: 'Survival', 1: 'Creative', 2: 'Adventure', 3: 'Spectator'}
-            game_mode = game_modes.get(game_mode, f'Unknown ({game_mode})')
-        
-        version = nbt_data.get('Version', {}).get('Name', 'Unknown')
-        last_played = nbt_data.get('LastPlayed', 'Unknown')
-        if last_played != 'Unknown' and isinstance(last_played, (int, float)):
-            from datetime import datetime
-            last_played = datetime.fromtimestamp(last_played / 1000.0).strftime('%Y-%m-%d %H:%M:%S')
-        
-        generator_name = get_generator_name(nbt_data)
-        total_time = nbt_data.get('Time', 'Unknown')
-        
-        spawn_x = nbt_data.get('SpawnX', 'Unknown')
-        spawn_y = nbt_data.get('SpawnY', 'Unknown')
-        spawn_z = nbt_data.get('SpawnZ', 'Unknown')
-        spawn_location = f"X:{spawn_x} Y:{spawn_y} Z:{spawn_z}" if all(coord != 'Unknown' for coord in [spawn_x, spawn_y, spawn_z]) else 'Unknown'
-        
-        data_version = nbt_data.get('DataVersion', 'Unknown')
-        difficulty = nbt_data.get('Difficulty', 'Unknown')
-        if isinstance(difficulty, int):
-            difficulties = {0: 'Peaceful', 1: 'Easy', 2: 'Normal', 3: 'Hard'}
-            difficulty = difficulties.get(difficulty, f'Unknown ({difficulty})')
-        
-        hardcore = nbt_data.get('hardcore', False)
-        allow_commands = nbt_data.get('allowCommands', 'Unknown')
-        size_on_disk = nbt_data.get('SizeOnDisk', 'Unknown')
-        
-        if size_on_disk != 'Unknown' and isinstance(size_on_disk, (int, float)):
-            if size_on_disk > 1073741824:
-                size_on_disk = f"{size_on_disk/1073741824:.2f} GB"
-            elif size_on_disk > 1048576:
-                size_on_disk = f"{size_on_disk/1048576:.2f} MB"
-            elif size_on_disk > 1024:
-                size_on_disk = f"{size_on_disk/1024:.2f} KB"
-            else:
-                size_on_disk = f"{size_on_disk} bytes"
-        
-        # Update unique seeds with all available information
-        seed_info = {
-            'filename': filename,
-            'world_name': level_name,
-            'game_mode': game_mode,
-            'generator': generator_name,
-            'version': version,
-            'last_played': last_played,
-            'path': root,
-            'total_time': total_time,
-            'spawn_location': spawn_location,
-            'data_version': data_version,
-            'difficulty': difficulty,
-            'hardcore': 'Yes' if hardcore else 'No',
-            'allow_commands': 'Yes' if allow_commands else 'No',
-            'size_on_disk': size_on_disk
-        }
+    except TimeoutException:
+        log.warning("Skipping %s (timeout after %.1fs)", filename, timeout)
+        result.timeout('nbt', filename, root, timeout)
         
-        update_unique_seed_info(seed, seed_info)
-        
-        # Write to Data worksheet
-        ws_data[f'A{row_data}'] = filename
-        ws_data[f'B{row_data}'] = seed
-        ws_data[f'C{row_data}'] = total_time
-        ws_data[f'D{row_data}'] = generator_name
-        ws_data[f'E{row_data}'] = level_name
-        ws_data[f'F{row_data}'] = game_mode
-        ws_data[f'G{row_data}'] = spawn_location
-        ws_data[f'H{row_data}'] = root
-        ws_data[f'I{row_data}'] = version
-        ws_data[f'J{row_data}'] = data_version
-        ws_data[f'K{row_data}'] = last_played
-        ws_data[f'L{row_data}'] = size_on_disk
-        ws_data[f'M{row_data}'] = difficulty
-        ws_data[f'N{row_data}'] = 'Yes' if hardcore else 'No'
-        ws_data[f'O{row_data}'] = 'Yes' if allow_commands else 'No'
-        ws_data[f'P{row_data}'] = "No"
-        
-        row_data += 1
-        saved_entries += 1
+        result.error(filename, f"Operation timed out (>{timeout:.1f} seconds)", root)
         
-    except TimeoutException:
-        print(f"Skipping {filename} (timeout after {timeout:.1f}s)")
-        errors_encountered += 1
-        
-        ws_errors[f'A{row_errors}'] = filename
-        ws_errors[f'B{row_errors}'] = f"Operation timed out (>{timeout:.1f} seconds)"
-        ws_errors[f'C{row_errors}'] = root
-        row_errors += 1
-        
-        ws_data[f'A{row_data}'] = filename
-        ws_data[f'B{row_data}'] = "Error: Operation timed out"
-        ws_data[f'H{row_data}'] = root
-        ws_data[f'P{row_data}'] = "Yes"
-        ws_data[f'P{row_data}'].fill = error_fill
-        row_data += 1
+        result.data_error(filename, "Error: Operation timed out", root)
     except Exception as e:
-        errors_encountered += 1
         error_msg = str(e)
         traceback_str = traceback.format_exc()
         
         try:
             with open(file_path, 'rb') as f:
-                partial_data = f.read()
+                partial_data = f.read(1)  # Only need to know the file isn't empty
                 if len(partial_data) > 0:
-                    ws_corrupted[f'A{row_corrupted}'] = filename
-                    ws_corrupted[f'B{row_corrupted}'] = root
-                    ws_corrupted[f'C{row_corrupted}'] = "Yes"
-                    ws_corrupted[f'D{row_corrupted}'] = error_msg
-                    row_corrupted += 1
-                    corrupted_files += 1
+                    result.add_row("Corrupted Files", (filename, root, "Yes", error_msg))
+                    result.corrupted += 1
         except:
             pass
         
-        ws_errors[f'A{row_errors}'] = filename
-        ws_errors[f'B{row_errors}'] = error_msg
-        ws_errors[f'C{row_errors}'] = root
-        ws_errors[f'D{row_errors}'] = traceback_str
-        row_errors += 1
+        result.error(filename, error_msg, root, traceback_str)
         
-        ws_data[f'A{row_data}'] = filename
-        ws_data[f'B{row_data}'] = f"Error: {error_msg}"
-        ws_data[f'H{row_data}'] = root
-        ws_data[f'P{row_data}'] = "Yes"
-        ws_data[f'P{row_data}'].fill = error_fill
-        row_data += 1
+        result.data_error(filename, f"Error: {error_msg}", root)
+    return result
+
+# Characters an xlsx cell can't hold: control characters other than tab/newline/carriage
+# return (what openpyxl rejects) and lone surrogates (which fail when the file is saved)
+ILLEGAL_CELL_CHARACTERS = [code for code in range(32) if chr(code) not in '\t\n\r'] + list(range(0xD800, 0xE000))
+SANITIZE_TABLE = dict.fromkeys(ILLEGAL_CELL_CHARACTERS)
+ILLEGAL_CELL_RE = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f\ud800-\udfff]')
 
 def sanitize_text(text):
-    """Sanitize text for Excel by removing or replacing illegal characters"""
+    """Sanitize text for Excel, dropping only characters a cell can't hold (Unicode is kept)"""
     if not isinstance(text, str):
         text = str(text)
     
-    # Replace common problematic characters
-    text = text.encode('ascii', 'ignore').decode('ascii')
-    
-    # Remove control characters
-    text = ''.join(char for char in text if ord(char) >= 32 or char in '\n\r\t')
+    # Most values are clean, only translate when there is something to remove
+    if ILLEGAL_CELL_RE.search(text):
+        text = text.translate(SANITIZE_TABLE)
     
     # Limit length to avoid Excel cell limits
     return text[:32000] if len(text) > 32000 else text
 
-def write_potential_seeds():
-    """Write potential seeds to the Random Strings worksheet"""
-    global ws_potential
+def sanitize_row(values, strings_only=False):
+    """Sanitize a whole row, plain numbers and empty cells pass through unchanged
     
-    row = 2
-    for number, info in potential_seeds.items():
-        try:
-            ws_potential[f'A{row}'] = sanitize_text(info['confidence'])
-            ws_potential[f'B{row}'] = sanitize_text(number)
-            ws_potential[f'C{row}'] = sanitize_text(info['filename'])
-            ws_potential[f'D{row}'] = sanitize_text(info['context'])
-            ws_potential[f'E{row}'] = sanitize_text(info['line'])
-            ws_potential[f'F{row}'] = sanitize_text(info['path'])
-            row += 1
-        except Exception as e:
-            print(f"\nWarning: Could not write row {row} due to invalid characters. Skipping...")
-            continue
+    With strings_only only str values are cleaned, anything else (nbtlib numbers, highlights)
+    keeps its type.
+    """
+    if strings_only:
+        return tuple(sanitize_text(value) if isinstance(value, str) else value for value in values)
+    return tuple(value if value is None or type(value) in (int, float) else sanitize_text(value)
+                 for value in values)
+
+def write_potential_seeds(ctx):
+    """Write potential seeds to the Random Strings worksheet"""
+    sheet = ctx.sheets["Random Strings"]
+    # The writer thread sanitizes these rows
+    for number, info, files_seen in ctx.potential_seeds.top_entries():
+        sheet.append((
+            info['confidence'],
+            str(number),
+            info['filename'],
+            info['context'],
+            info['line'],
+            info['path'],
+            files_seen
+        ))
 
-def write_unique_seeds():
+def write_unique_seeds(ctx):
     """Write unique seeds to the All Seeds worksheet"""
-    global row_all_seeds, ws_all_seeds, unique_seeds
-    
+    sheet = ctx.sheets["All Seeds"]
     # Sort seeds by times_found in descending order
-    sorted_seeds = sorted(unique_seeds.items(), key=lambda x: x[1]['times_found'], reverse=True)
+    sorted_seeds = sorted(ctx.unique_seeds.items(), key=lambda x: x[1].times_found, reverse=True)
     
+    # Write all available information for each unique seed, the writer thread sanitizes it
     for seed, info in sorted_seeds:
-        try:
-            # Write all available information for each unique seed
-            ws_all_seeds[f'A{row_all_seeds}'] = sanitize_text(seed)
-            ws_all_seeds[f'B{row_all_seeds}'] = sanitize_text(info['filename'])
-            ws_all_seeds[f'C{row_all_seeds}'] = sanitize_text(info['world_name'])
-            ws_all_seeds[f'D{row_all_seeds}'] = sanitize_text(info['game_mode'])
-            ws_all_seeds[f'E{row_all_seeds}'] = sanitize_text(info['generator'])
-            ws_all_seeds[f'F{row_all_seeds}'] = sanitize_text(info['version'])
-            ws_all_seeds[f'G{row_all_seeds}'] = sanitize_text(info['last_played'])
-            ws_all_seeds[f'H{row_all_seeds}'] = sanitize_text(info['path'])
-            ws_all_seeds[f'I{row_all_seeds}'] = info['times_found']
-            
-            # Add additional columns for complete information
-            ws_all_seeds[f'J{row_all_seeds}'] = sanitize_text(str(info['total_time']))
-            ws_all_seeds[f'K{row_all_seeds}'] = sanitize_text(info['spawn_location'])
-            ws_all_seeds[f'L{row_all_seeds}'] = sanitize_text(str(info['data_version']))
-            ws_all_seeds[f'M{row_all_seeds}'] = sanitize_text(info['difficulty'])
-            ws_all_seeds[f'N{row_all_seeds}'] = sanitize_text(info['hardcore'])
-            ws_all_seeds[f'O{row_all_seeds}'] = sanitize_text(info['allow_commands'])
-            ws_all_seeds[f'P{row_all_seeds}'] = sanitize_text(info['size_on_disk'])
-            
-            row_all_seeds += 1
-        except Exception as e:
-            print(f"\nWarning: Could not write seed {seed} due to invalid characters. Skipping...")
-            continue
+        sheet.append((
+            str(seed),
+            info.filename,
+            info.world_name,
+            info.game_mode,
+            info.generator,
+            info.version,
+            format_last_played(info.last_played),
+            info.path,
+            info.times_found,
+            # Additional columns for complete information
+            str(info.total_time),
+            info.spawn_location,
+            str(info.data_version),
+            info.difficulty,
+            info.hardcore,
+            info.allow_commands,
+            info.size_on_disk
+        ))
+
+def write_stats(ctx):
+    """Write stage timings, throughput, slowest files and latency histograms"""
+    ctx.sheets["Stats"].append(STATS_HEADERS)
+    for row in ctx.stats.rows():
+        ctx.sheets["Stats"].append(row)
+    
+    # Per-file durations, to check BASE_TIMEOUT, MAX_TIMEOUT and SIZE_TIMEOUT_RATIO against real dumps
+    ctx.sheets["Slowest Files"].append(SLOWEST_FILES_HEADERS)
+    for row in ctx.stats.slowest_rows():
+        ctx.sheets["Slowest Files"].append(row)
+    ctx.sheets["Latency"].append(LATENCY_HEADERS)
+    for row in ctx.stats.latency_rows():
+        ctx.sheets["Latency"].append(row)
+
+def write_stats_json(ctx, path):
+    """Write the run stats as JSON, including the final save"""
+    try:
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(ctx.stats.to_dict(), f, indent=2)
+    except OSError as e:
+        log.warning("Could not write stats to %s: %s", path, e)
 
 def should_skip_file(filename):
     """Check if file should be skipped based on filename"""
@@ -1363,7 +3213,7 @@ def process_large_directory(root, files):
         end_idx = min((batch_num + 1) * batch_size, total_files)
         batch_files = files[start_idx:end_idx]
         
-        print(f"\nProcessing batch {batch_num + 1}/{num_batches} ({len(batch_files)} files)")
+        log.debug("Processing batch %d/%d (%d files)", batch_num + 1, num_batches, len(batch_files))
         
         for file in batch_files:
             filepath = os.path.join(root, file)
@@ -1372,74 +3222,38 @@ def process_large_directory(root, files):
                     continue
                 
                 ext = os.path.splitext(file)[1].lower()
-                if os.path.getsize(filepath) > 2:  # Need at least 3 bytes to check headers
+                file_size = os.path.getsize(filepath)
+                if file_size > HUGE_FILE_THRESHOLD and ext not in ['.log', '.txt']:
+                    # Too big to load, walk it in windows instead
+                    if ext in HUGE_FILE_EXTENSIONS:
+                        processed_files.append(("huge", root, file, filepath))
+                    continue
+                
+                if file_size > 2:  # Need at least 3 bytes to check headers
                     with open(filepath, 'rb') as f:
                         header = f.read(3)
                         # For .dat files, check both formats
                         if ext == '.dat':
                             if header.startswith(b'\x1f\x8b') or header.startswith(b'\x0A'):  # NBT formats
-                                processed_files.append((filepath, "nbt"))
+                                processed_files.append(("nbt", root, file, filepath))
                             if header.startswith(b'\x1f\x8b'):  # Also check as gzip
-                                processed_files.append((filepath, "gz"))
+                                processed_files.append(("gz", root, file, filepath))
                         # For .gz files, only check gzip format
                         elif ext == '.gz' and header.startswith(b'\x1f\x8b'):
-                            processed_files.append((filepath, "gz"))
+                            processed_files.append(("gz", root, file, filepath))
                 
                 # Process as log if it has a valid extension
                 if ext in ['.log', '.txt']:
-                    processed_files.append((filepath, "log"))
+                    processed_files.append(("log", root, file, filepath))
                 
             except Exception as e:
-                print(f"Error processing {filepath}: {str(e)}")
+                log.warning("Error processing %s: %s", filepath, e)
                 continue
         
-        print(f"Completed batch {batch_num + 1}/{num_batches}")
+        log.debug("Completed batch %d/%d", batch_num + 1, num_batches)
     
     return processed_files
 
-def process_small_directory():
-    result = []
-    for filename in files:
-        try:
-            if should_skip_file(filename):
-                continue
-                
-            file_path = os.path.join(root, filename)
-            if not os.path.exists(file_path) or not os.access(file_path, os.R_OK):
-                continue
-            
-            file_size = os.path.getsize(file_path)
-            if file_size > 2 * 1024 * 1024 * 1024:
-                print(f"\nSkipping {filename} (larger than 2GB)")
-                continue
-            elif file_size == 0:
-                continue
-            
-            ext = os.path.splitext(filename)[1].lower()
-            if file_size > 2:
-                try:
-                    with open(file_path, 'rb') as f:
-                        header = f.read(3)
-                        # For .dat files, check both formats
-                        if ext == '.dat':
-                            if header.startswith(b'\x1f\x8b') or header.startswith(b'\x0A'):  # NBT formats
-                                result.append(("nbt", root, filename, file_path))
-                            if header.startswith(b'\x1f\x8b'):  # Also check as gzip
-                                result.append(("gz", root, filename, file_path))
-                        # For .gz files, only check gzip format
-                        elif ext == '.gz' and header.startswith(b'\x1f\x8b'):
-                            result.append(("gz", root, filename, file_path))
-                except:
-                    pass
-            
-            # Process as log if it has a valid extension
-            if ext in ['.log', '.txt']:
-                result.append(("log", root, filename, file_path))
-                
-        except Exception:
-            continue
-    return result
-
 def collect_files_with_timeout(directory):
     """Collect files with timeout and progress indication"""
     minecraft_files = []
@@ -1447,19 +3261,19 @@ def collect_files_with_timeout(directory):
     total_dirs = 0
     
     # First count total directories for progress
-    print("\nCounting directories...")
+    log.info("Counting directories...")
     for root, dirs, files in os.walk(directory):
         total_dirs += 1
         
-    print(f"\nScanning {total_dirs} directories...")
+    log.info("Scanning %d directories...", total_dirs)
     
     for root, dirs, files in os.walk(directory):
         try:
             processed_dirs += 1
-            progress = (processed_dirs / total_dirs) * 100
+            percent = (processed_dirs / total_dirs) * 100
             
             current_dir = os.path.basename(root) or root
-            print(f"\rScanning: {progress:.1f}% | Dir {processed_dirs}/{total_dirs} | Current: {current_dir[:40]}{'...' if len(current_dir) > 40 else ''}", end="", flush=True)
+            progress.update(f"Scanning: {percent:.1f}% | Dir {processed_dirs}/{total_dirs} | Current: {current_dir[:40]}{'...' if len(current_dir) > 40 else ''}")
             
             num_files = len(files)
             if num_files > 1000:
@@ -1482,13 +3296,15 @@ def collect_files_with_timeout(directory):
                                     continue
                                 
                                 file_size = os.path.getsize(file_path)
-                                if file_size > 2 * 1024 * 1024 * 1024:
-                                    print(f"\nSkipping {filename} (larger than 2GB)")
+                                ext = os.path.splitext(filename)[1].lower()
+                                if file_size > HUGE_FILE_THRESHOLD and ext not in ['.log', '.txt']:
+                                    # Too big to load, walk it in windows instead
+                                    if ext in HUGE_FILE_EXTENSIONS:
+                                        result.append(("huge", root, filename, file_path))
                                     continue
                                 elif file_size == 0:
                                     continue
                                 
-                                ext = os.path.splitext(filename)[1].lower()
                                 if file_size > 2:
                                     try:
                                         with open(file_path, 'rb') as f:
@@ -1517,118 +3333,618 @@ def collect_files_with_timeout(directory):
                     minecraft_files.extend(new_files)
                 except TimeoutException:
                     # If timeout occurs, switch to batch processing
-                    print(f"\nTimeout in directory {root}, switching to batch processing...")
+                    log.warning("Timeout in directory %s, switching to batch processing...", root)
                     new_files = process_large_directory(root, files)
                     minecraft_files.extend(new_files)
                 except Exception as e:
-                    print(f"\nError processing directory {root}: {str(e)}")
+                    log.warning("Error processing directory %s: %s", root, e)
                     continue
                 
         except Exception:
             continue
             
-    print("\nFile collection complete!")
+    progress.end(f"Scanning: 100.0% | Dir {processed_dirs}/{total_dirs}")
+    log.info("File collection complete!")
     return minecraft_files
 
-def main():
-    """Main function to run the Minecraft world recovery script"""
-    global processed_files, saved_entries, errors_encountered, corrupted_files
-    global row_data, row_errors, row_log, row_all_seeds, row_corrupted
-    global wb, ws_data, ws_errors, ws_log, ws_all_seeds, ws_corrupted, error_fill, unique_seeds, potential_seeds
-    
-    print("=== MC World Recovery ===")
-    
-    # Initialize Excel workbook and worksheets
-    initialize_excel_workbook()
-    
-    # Reset counters and dictionaries
-    processed_files = 0
-    saved_entries = 0
-    errors_encountered = 0
-    corrupted_files = 0
-    row_data = 2
-    row_errors = 2
-    row_log = 2
-    row_all_seeds = 2
-    row_corrupted = 2
-    unique_seeds.clear()
-    potential_seeds.clear()
+def scan_file(task, gz_catalog, data=None):
+    """Run the processor for one (file type, root, filename, path) entry
+    
+    data is the file's content when a prefetch thread already read it. Returns (FileResult, seconds, size), or None when the file is gone or unreadable. A
+    duplicate gzip isn't inflated and comes back as (None, 0.0, size). Touches none of
+    the run's state, so any thread can call it.
+    """
+    file_type, root, filename, file_path = task
+    if not os.path.exists(file_path) or not os.access(file_path, os.R_OK):
+        return None
+    fingerprint = gz_catalog.get(file_path) if file_type == "gz" else None
+    if fingerprint and fingerprint['duplicate_of'] and DEDUP_GZ_LOGS:
+        return None, 0.0, os.path.getsize(file_path)  # Identical content, run_scan repeats the first copy's findings
+    
+    if events:
+        events.file_started(file_type, file_path)
+    started = time.perf_counter()
+    if file_type == "nbt":
+        result = process_nbt_file(file_path, root, filename, data)
+    elif file_type == "log":
+        result = process_regular_file_for_logs(file_path, root, filename, data)
+    elif file_type == "gz":
+        result = process_gz_file(file_path, root, filename, fingerprint['estimated_size'] if fingerprint else None, data)
+    elif file_type == "huge":
+        result = process_huge_file(file_path, root, filename)
+    else:
+        return None
+    return result, time.perf_counter() - started, os.path.getsize(file_path)
+
+def init_scan_worker(options, console):
+    """Give a worker process the parent's settings (spawned workers start from the defaults)"""
+    apply_options(options)
+    if console:
+        log.setLevel(getattr(logging, LOG_LEVEL.upper(), logging.INFO))
+        log.propagate = False
+        if console_handler not in log.handlers:
+            log.addHandler(console_handler)
+
+def scan_file_worker(task, fingerprint):
+    """Process pool entry point for scan_file, the stage timings go back with the outcome"""
+    global run_stats
+    run_stats = RunStats()
+    try:
+        outcome = scan_file(task, {task[3]: fingerprint} if fingerprint else {})
+    except Exception:
+        outcome = None  # Same as a failure in the scanning process, an exception here means a broken pool
+    return outcome, run_stats.stages
+
+class ProcessorPool:
+    """Runs scan_file in this process for one worker, in worker processes for more
+    
+    The pool starts the first time the controller asks for a second worker. Huge files
+    and logs big enough for the parallel log scanner stay in this process, they bring
+    their own parallelism. Prefetched content is only used in this process; a worker
+    process reads the file again from the OS cache, which is cheaper than pickling it.
+    """
+    
+    def __init__(self, gz_catalog, controller):
+        self.gz_catalog = gz_catalog
+        self.controller = controller
+        self.executor = None
+        self.broken = False
+        self.lock = threading.Lock()
+    
+    def __call__(self, task, data=None):
+        file_type, _, _, file_path = task
+        if self.controller.counts['workers'] < 2 or self.broken or file_type == "huge":
+            return scan_file(task, self.gz_catalog, data)
+        try:
+            if file_type == "log" and os.path.getsize(file_path) >= PARALLEL_LOG_THRESHOLD:
+                return scan_file(task, self.gz_catalog, data)
+        except OSError:
+            return None
+        
+        if events:
+            events.file_started(file_type, file_path)
+        try:
+            outcome, stages = self.pool().submit(scan_file_worker, task, self.gz_catalog.get(file_path)).result()
+        except Exception as e:  # BrokenProcessPool, or the engine can't be pickled by name
+            if not self.broken:
+                self.broken = True
+                log.warning("Worker processes failed (%s), continuing in one process", e)
+            return scan_file(task, self.gz_catalog, data)
+        run_stats.merge_stages(stages)
+        return outcome
+    
+    def pool(self):
+        with self.lock:
+            if self.executor is None:
+                options = current_options()
+                # Spawned, not forked: forking while the reader and writer threads hold locks can deadlock
+                self.executor = ProcessPoolExecutor(max_workers=self.controller.limits['workers'],
+                                                    mp_context=multiprocessing.get_context('spawn'),
+                                                    initializer=init_scan_worker,
+                                                    initargs=(options, console_handler in log.handlers))
+            return self.executor
+    
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+
+def prefetch_size(task):
+    """Bytes a prefetch thread should read for a file, 0 for files the processor streams itself"""
+    file_type, _, _, file_path = task
+    if file_type == "huge":
+        return 0
+    try:
+        size = os.path.getsize(file_path)
+    except OSError:
+        return 0
+    return size if size <= PREFETCH_MAX_FILE_SIZE else 0
+
+def prefetch_file(file_path, size):
+    """Read a file ahead of its processor, returning its content or None to let the processor read it"""
+    started = time.perf_counter()
+    data = None
+    try:
+        with open(file_path, 'rb', buffering=0) as f:
+            data = f.read()
+    except OSError:
+        pass  # The processor reports unreadable files
+    run_stats.add('prefetch', time.perf_counter() - started, bytes_in=len(data) if data else 0)
+    if data is None or len(data) != size:
+        return None  # Changed since it was sized, read it again the normal way
+    return data
+
+class ConcurrencyController:
+    """Hill-climbs the prefetch reader and worker thread counts on measured throughput
+    
+    Each interval the scan counts as I/O bound (workers waited on prefetch) or CPU bound.
+    The bottleneck's count moves one at a time and a step is kept only when the throughput
+    follows, so a spinning drive that slows down with a second reader goes back to one.
+    The other count is trimmed while that costs nothing. A step that didn't pay off is
+    undone and the next probe goes the other way, after a rest of CONCURRENCY_HOLD intervals
+    that doubles with every miss in a row. Probing never stops, so the counts follow the
+    dump when it changes character.
+    """
+    
+    def __init__(self, max_readers=None, max_workers=None):
+        self.limits = {'readers': max(1, MAX_READER_THREADS if max_readers is None else max_readers),
+                       'workers': max(1, MAX_WORKER_PROCESSES if max_workers is None else max_workers)}
+        self.counts = {'readers': 1, 'workers': 1}
+        self.direction = {'readers': 1, 'workers': 1}
+        self.hold = {'readers': 0, 'workers': 0}
+        self.misses = {'readers': 0, 'workers': 0}  # Rejected steps in a row
+        self.trial = None  # (knob, delta, count before, rate before, timeouts before) while a step is measured
+    
+    def step(self, rate, io_bound, timeouts=0):
+        """One tuning step from the last interval's bytes/s, True when a count changed
+        
+        timeouts is the run's timeout total so far, an added thread that brings new
+        timeouts is undone (per-file timeouts are wall clock, threads share the CPU).
+        """
+        for knob in self.hold:
+            self.hold[knob] = max(0, self.hold[knob] - 1)
+        
+        if self.trial:
+            knob, delta, previous, before, timeouts_before = self.trial
+            self.trial = None
+            needed = before * (1 + CONCURRENCY_MIN_GAIN) if delta > 0 else before * (1 - CONCURRENCY_MIN_GAIN)
+            if rate < needed or (delta > 0 and timeouts > timeouts_before):
+                self.counts[knob] = previous
+                self.hold[knob] = CONCURRENCY_HOLD << min(self.misses[knob], 4)
+                self.misses[knob] += 1
+                self.direction[knob] = -delta
+                return True
+            self.misses[knob] = 0
+        
+        bottleneck, other = ('readers', 'workers') if io_bound else ('workers', 'readers')
+        if self.counts[other] > 1 and not self.hold[other]:
+            return self.try_step(other, -1, rate, timeouts)
+        if self.hold[bottleneck]:
+            return False
+        delta = self.direction[bottleneck]
+        if not 1 <= self.counts[bottleneck] + delta <= self.limits[bottleneck]:
+            delta = -delta
+            if not 1 <= self.counts[bottleneck] + delta <= self.limits[bottleneck]:
+                return False
+        return self.try_step(bottleneck, delta, rate, timeouts)
+    
+    def try_step(self, knob, delta, rate, timeouts):
+        self.trial = (knob, delta, self.counts[knob], rate, timeouts)
+        self.counts[knob] += delta
+        return True
+
+class ScanPipeline:
+    """Prefetch readers and processor workers over the file list, outcomes back in file order
+    
+    Readers load files up to PREFETCH_WINDOW files (and PREFETCH_WINDOW_BYTES) ahead of the
+    merge point, in file order so a spinning drive reads them the way the walk found them.
+    Each worker thread has one file in flight: it waits for the prefetch, then runs process
+    (a ProcessorPool) on the content that was read, so each file comes off the disk once. The counts in use follow the
+    controller, threads above them park until they rise. Iterating yields (task, outcome)
+    in file order and tunes the controller between files.
+    """
+    
+    def __init__(self, tasks, process, controller=None):
+        self.tasks = tasks
+        self.process = process
+        self.controller = controller or ConcurrencyController()
+        self.condition = threading.Condition()
+        self.sizes = [0] * len(tasks)  # Bytes prefetched per task, held in the window until merged
+        self.prefetched = [False] * len(tasks)
+        self.data = {}  # Task index -> prefetched content, until a worker takes it
+        self.outcomes = {}
+        self.next_read = 0
+        self.next_work = 0
+        self.merged = 0
+        self.window_bytes = 0
+        self.closed = False
+        self.threads = {'readers': [], 'workers': []}
+        self.reset_interval()
+    
+    def reset_interval(self):
+        self.interval_started = time.perf_counter()
+        self.interval_files = 0
+        self.interval_bytes = 0
+        self.io_wait = 0.0  # Worker seconds spent waiting on prefetch
+        self.work_seconds = 0.0  # Worker seconds spent in processors
+    
+    def __iter__(self):
+        if not ADAPTIVE_CONCURRENCY or len(self.tasks) < 2:
+            for task in self.tasks:
+                yield task, self.run_task(task)
+            return
+        
+        with self.condition:
+            self.start_threads()
+        for index, task in enumerate(self.tasks):
+            with self.condition:
+                while index not in self.outcomes:
+                    self.condition.wait(CONCURRENCY_INTERVAL)
+                    self.tune()
+                outcome = self.outcomes.pop(index)
+                self.merged = index + 1
+                self.window_bytes -= self.sizes[index]
+                self.interval_files += 1
+                self.interval_bytes += outcome[2] if outcome else 0
+                self.tune()
+                self.condition.notify_all()
+            yield task, outcome
+    
+    def run_task(self, task, data=None):
+        try:
+            return self.process(task, data)
+        except Exception:
+            return None
+    
+    def start_threads(self):
+        """Start threads up to the controller's counts, parked ones are reused"""
+        for knob, target in (('readers', self.read), ('workers', self.work)):
+            threads = self.threads[knob]
+            while len(threads) < self.controller.counts[knob]:
+                thread = threading.Thread(target=target, args=(len(threads),),
+                                          name=f"scan-{knob[:-1]}-{len(threads)}", daemon=True)
+                threads.append(thread)
+                thread.start()
+    
+    def can_read(self, number):
+        return (number < self.controller.counts['readers'] and self.next_read < len(self.tasks)
+                and self.next_read < self.merged + PREFETCH_WINDOW
+                and (self.window_bytes < PREFETCH_WINDOW_BYTES or self.next_read == self.merged))
+    
+    def read(self, number):
+        while True:
+            with self.condition:
+                while not self.closed and not self.can_read(number):
+                    self.condition.wait()
+                if self.closed:
+                    return
+                index = self.next_read
+                self.next_read += 1
+            
+            size = prefetch_size(self.tasks[index])
+            data = None
+            if size:
+                with self.condition:
+                    self.sizes[index] = size
+                    self.window_bytes += size
+                data = prefetch_file(self.tasks[index][3], size)
+            
+            with self.condition:
+                if data is not None and not self.closed:
+                    self.data[index] = data
+                self.prefetched[index] = True
+                self.condition.notify_all()
+    
+    def can_work(self, number):
+        return (number < self.controller.counts['workers'] and self.next_work < len(self.tasks)
+                and self.next_work < self.merged + PREFETCH_WINDOW)
+    
+    def work(self, number):
+        while True:
+            with self.condition:
+                while not self.closed and not self.can_work(number):
+                    self.condition.wait()
+                if self.closed:
+                    return
+                index = self.next_work
+                self.next_work += 1
+                if not self.prefetched[index]:
+                    waiting = time.perf_counter()
+                    while not self.closed and not self.prefetched[index]:
+                        self.condition.wait()
+                    self.io_wait += time.perf_counter() - waiting
+                data = self.data.pop(index, None)
+            
+            started = time.perf_counter()
+            outcome = self.run_task(self.tasks[index], data)
+            del data
+            with self.condition:
+                self.work_seconds += time.perf_counter() - started
+                self.outcomes[index] = outcome
+                self.condition.notify_all()
+    
+    def tune(self):
+        """Hand the last interval's throughput to the controller, called with the condition held"""
+        elapsed = time.perf_counter() - self.interval_started
+        if elapsed < CONCURRENCY_INTERVAL or self.interval_files < CONCURRENCY_MIN_FILES:
+            return
+        rate = self.interval_bytes / elapsed
+        busy = self.io_wait + self.work_seconds
+        io_bound = busy > 0 and self.io_wait / busy >= IO_BOUND_WAIT
+        if self.controller.step(rate, io_bound, sum(run_stats.timeouts.values())):
+            counts = self.controller.counts
+            self.start_threads()
+            self.condition.notify_all()
+            log.debug("Concurrency: %d readers, %d workers (%.2f MB/s, %s bound)",
+                      counts['readers'], counts['workers'], rate / 1048576, 'I/O' if io_bound else 'CPU')
+            emit_event('concurrency', readers=counts['readers'], workers=counts['workers'],
+                       mb_per_second=round(rate / 1048576, 2), io_bound=io_bound)
+        self.reset_interval()
+    
+    def close(self):
+        """Release the threads, a worker stuck in a processor is a daemon and won't hold up exit"""
+        with self.condition:
+            self.closed = True
+            self.data.clear()
+            self.condition.notify_all()
+
+def run_scan(ctx, paths, interactive=False):
+    """Scan directories into a ScanContext, yielding records when OUTPUT_FORMAT is 'records'
+    
+    The output, results database and stats JSON go in ctx.directory. When saving fails an
+    interactive scan asks whether to try again, any other scan raises the error.
+    """
+    global run_stats
+    
+    run_stats = ctx.stats  # Stage timers in the helpers report to this scan
+    repeat_filter.clear()
+    log.info("=== MC World Recovery ===")
+    if open_events():
+        events.emit('run_start', directory=os.pathsep.join(paths), output_format=OUTPUT_FORMAT)
+    
+    # Initialize the output sink and its sheets
+    initialize_output(ctx)
+    open_results_db(ctx)
     
     # Collect files with progress indication and timeout handling
-    minecraft_files = collect_files_with_timeout(directory_path)
+    with run_stats.timed('walk'):
+        minecraft_files = []
+        for path in paths:
+            minecraft_files.extend(collect_files_with_timeout(path))
     
     total_files = len(minecraft_files)
     if total_files == 0:
-        print("\nNo files found to process!")
+        log.info("No files found to process!")
+        if events:
+            events.close(status='no files')
         return
         
-    print(f"\nScanning {total_files} files...")
+    # Fingerprint gzip candidates from a few header/trailer bytes before inflating anything
+    catalog_result = FileResult()
+    with run_stats.timed('gz catalog'):
+        gz_catalog = catalog_gz_files(catalog_result, minecraft_files)
+    ctx.apply(catalog_result)
+    if ctx.results_db:
+        ctx.results_db.add_files(minecraft_files)
+    duplicate_gz = sum(1 for fingerprint in gz_catalog.values() if fingerprint['duplicate_of'])
+    if duplicate_gz:
+        log.info("Found %d duplicate gzip files%s", duplicate_gz, ' (reusing the first copy\'s results)' if DEDUP_GZ_LOGS else '')
+    # First copies whose findings are kept until the later copies are merged
+    duplicate_counts = collections.Counter(fingerprint['duplicate_of'] for fingerprint in gz_catalog.values()
+                                           if fingerprint['duplicate_of']) if DEDUP_GZ_LOGS else {}
+    duplicate_findings = {}
     
-    last_progress = -1
+    log.info("Scanning %d files...", total_files)
+    if events:
+        total_bytes = 0
+        for _, _, _, file_path in minecraft_files:
+            try:
+                total_bytes += os.path.getsize(file_path)
+            except OSError:
+                pass
+        events.start(total_files, total_bytes)
     
-    for idx, (file_type, root, filename, file_path) in enumerate(minecraft_files, 1):
-        try:
-            # Show progress for every 1%
-            progress = int((idx / total_files) * 100)
-            if progress > last_progress:
-                # Clear the current line and show new progress
-                print(f"\rProgress: {progress}% ({idx}/{total_files} files)", end="", flush=True)
-                last_progress = progress
-            
-            processed_files += 1
-            
-            if not os.path.exists(file_path) or not os.access(file_path, os.R_OK):
+    records = ctx.sink if isinstance(ctx.sink, RecordSink) else None
+    # Files are prefetched and processed by tuned thread and process pools, results are merged here in file order
+    controller = ConcurrencyController()
+    processors = ProcessorPool(gz_catalog, controller)
+    pipeline = ScanPipeline(minecraft_files, processors, controller)
+    try:
+        for idx, ((file_type, root, filename, file_path), outcome) in enumerate(pipeline, 1):
+            if records and records.pending:
+                yield from records.drain()
+            try:
+                # Redraws are throttled to PROGRESS_INTERVAL, so this costs next to nothing per file
+                progress.update(f"Progress: {idx * 100 // total_files}% ({idx}/{total_files} files)")
+                
+                ctx.processed_files += 1
+                if outcome is None:
+                    continue
+                
+                result, elapsed, size = outcome
+                if result is None:  # Duplicate gzip, report it where it was found without inflating it again
+                    original = gz_catalog[file_path]['duplicate_of']
+                    if original in duplicate_findings:
+                        ctx.apply(duplicate_findings[original].copy_for(filename, root))
+                        duplicate_counts[original] -= 1
+                        if not duplicate_counts[original]:
+                            del duplicate_findings[original]
+                    continue
+                if file_type == "gz" and duplicate_counts.get(file_path):
+                    duplicate_findings[file_path] = result.copy_for(filename, root)
+                ctx.apply(result)
+                # Huge files and logs big enough for the parallel scanner run without a timeout
+                unlimited = file_type == "huge" or (file_type == "log" and size >= PARALLEL_LOG_THRESHOLD)
+                run_stats.add_file(file_type, elapsed, size, file_path, None if unlimited else timeout_for_size(size))
+            except Exception:
                 continue
+            finally:
+                if events:
+                    events.file_done(file_type, file_path)
+    finally:
+        pipeline.close()
+        processors.close()
+    if ADAPTIVE_CONCURRENCY:
+        log.debug("Finished with %d readers, %d workers", controller.counts['readers'], controller.counts['workers'])
     
-            if file_type == "nbt":
-                process_nbt_file(file_path, root, filename)
-            elif file_type == "log":
-                process_regular_file_for_logs(file_path, root, filename)
-            elif file_type == "gz":
-                process_gz_file(file_path, root, filename)
-        except Exception:
-            continue
-    
-    print("\rProgress: 100% (Complete)")  # Ensure we show 100% at the end
+    progress.end("Progress: 100% (Complete)")  # Ensure we show 100% at the end
+    log_suppressed_warnings()
     
-    if processed_files == 0:
-        print("\nNo files were successfully processed!")
+    if ctx.processed_files == 0:
+        log.info("No files were successfully processed!")
+        if events:
+            events.close(status='no files processed')
         return
     
     # Write seeds at the end
-    print("\nWriting results...")
-    write_unique_seeds()
-    write_potential_seeds()
+    log.info("Writing results...")
+    with run_stats.timed('write results'):
+        write_unique_seeds(ctx)
+        write_potential_seeds(ctx)
+    if ctx.results_db:
+        with run_stats.timed('results db'):
+            ctx.results_db.finish_run(ctx.unique_seeds, ctx.potential_seeds)
+            ctx.results_db.close()
+        log.info("Run %d recorded in %s", ctx.results_db.run_id, ctx.results_db.path)
+    write_stats(ctx)
+    if records:
+        yield from records.drain()
     
+    saved = False
+    save_error = None
     while True:
         try:
-            output_path = os.path.join(directory_path, "minecraft_worlds_recovery.xlsx")
-            wb.save(output_path)
-            print("\n=== Complete ===")
-            print(f"Files Processed: {processed_files}")
-            print(f"Unique Seeds: {len(unique_seeds)}")
-            print(f"Random Strings Found: {len(potential_seeds)}")
-            print(f"Log Entries: {row_log - 2}")
-            print(f"Errors: {errors_encountered}")
-            if corrupted_files > 0:
-                print(f"Corrupted Files: {corrupted_files}")
+            with run_stats.timed('save'):
+                ctx.writer.close()
+            if STATS_JSON:
+                write_stats_json(ctx, os.path.join(ctx.directory, OUTPUT_BASENAME + '_stats.json'))
+            log.info("\n=== Complete ===")
+            log.info("Results: %s", ctx.sink.path)
+            log.info("Files Processed: %d", ctx.processed_files)
+            log.info("Unique Seeds: %d", len(ctx.unique_seeds))
+            log.info("Random Strings Found: %d", len(ctx.potential_seeds))
+            log.info("Log Entries: %d", ctx.rows["Log Results"])
+            log.info("Errors: %d", ctx.errors)
+            if ctx.corrupted_files > 0:
+                log.info("Corrupted Files: %d", ctx.corrupted_files)
+            saved = True
             break
         except Exception as e:
-            print("\nError saving results. The file might be open in another program.")
-            print("Close the file if it's open and try again.")
+            log.error("Error saving results. The file might be open in another program.")
+            if not interactive:
+                save_error = e
+                break
+            log.info("Close the file if it's open and try again.")
             retry = input("Try saving again? (y/n): ").lower()
             if retry != 'y':
-                print("Results not saved. Exiting...")
+                log.info("Results not saved. Exiting...")
                 break
+    
+    if events:
+        events.close(status='complete' if saved else 'not saved', output=ctx.sink.path,
+                     files_processed=ctx.processed_files, unique_seeds=len(ctx.unique_seeds),
+                     random_strings=len(ctx.potential_seeds), log_entries=ctx.rows["Log Results"],
+                     errors=ctx.errors, corrupted_files=ctx.corrupted_files)
+    if save_error is not None:
+        raise save_error
 
-if __name__ == '__main__':
+SCAN_DEFAULTS = {'OUTPUT_FORMAT': 'records', 'RESULTS_DB_ENABLED': False, 'STATS_JSON': False}
+
+def apply_options(options):
+    """Set configuration globals from {name: value}, returning the values they replaced"""
+    global ignored_seeds
+    previous = {}
+    for name, value in options.items():
+        key = name.upper()
+        if key not in SCAN_OPTIONS:
+            raise ValueError(f"Unknown scan option '{name}'")
+        previous.setdefault(key, globals()[key])
+        globals()[key] = value
+    if 'IGNORED_SEEDS' in previous:
+        ignored_seeds = {normalize_seed(seed) for seed in IGNORED_SEEDS}
+    return previous
+
+def current_options():
+    """Every scan option's current value, for worker processes to apply_options()"""
+    return {name: globals()[name] for name in SCAN_OPTIONS}
+
+def scan(paths, options=None):
+    """Scan directories and yield a record for every result row, typed per sheet (RECORD_TYPES)
+    
+    options override configuration settings by name, e.g. {'MAX_TIMEOUT': 10}. By default
+    nothing is written to disk; with another OUTPUT_FORMAT the rows go to those files
+    instead and nothing is yielded. Options are module settings, so run one scan at a time.
+    
+        for record in scan(['D:/dump']):
+            if type(record).__name__ == 'AllSeeds':
+                print(record.seed_value, record.world_name)
+    """
+    if isinstance(paths, str):
+        paths = [paths]
+    settings = dict(SCAN_DEFAULTS)
+    settings.update(options or {})
+    previous = apply_options(settings)
+    paths = [os.path.normpath(path) for path in paths]
+    try:
+        yield from run_scan(ScanContext(paths[0]), paths)
+    finally:
+        apply_options(previous)
+
+def main(paths=None, interactive=True):
+    """Main function to run the Minecraft world recovery script, returns the run's ScanContext"""
+    paths = paths or [directory_path]
+    ctx = ScanContext(paths[0])
+    for _ in run_scan(ctx, paths, interactive):
+        pass
+    return ctx
+
+def cli(argv):
+    """Command line entry point, 'db' subcommands are handled by db_main"""
+    import argparse
+    parser = argparse.ArgumentParser(prog='nbtparsedat-v3.py',
+                                     description="Find Minecraft world seeds in saves, logs and recovered files",
+                                     epilog="Run 'nbtparsedat-v3.py db --help' to query the results database.")
+    parser.add_argument('paths', nargs='*', help=f'directories to scan (default: {directory_path})')
+    parser.add_argument('--output', choices=('xlsx', 'csv', 'jsonl', 'sqlite'),
+                        help=f'output format (default: {OUTPUT_FORMAT})')
+    parser.add_argument('--events', help="JSONL event stream file, '-' for stdout")
+    parser.add_argument('--log-level', choices=('DEBUG', 'INFO', 'WARNING', 'ERROR'),
+                        help=f'console detail (default: {LOG_LEVEL})')
+    parser.add_argument('--db', help='results database (default: next to the output)')
+    parser.add_argument('--no-db', action='store_true', help="don't record the run in the results database")
+    parser.add_argument('--no-pause', action='store_true',
+                        help="exit without waiting for Enter, and don't offer to retry a failed save")
+    args = parser.parse_args(argv)
+    
+    options = {'OUTPUT_FORMAT': args.output, 'EVENTS_PATH': args.events, 'LOG_LEVEL': args.log_level,
+               'RESULTS_DB_PATH': args.db, 'RESULTS_DB_ENABLED': False if args.no_db else None}
+    apply_options({name: value for name, value in options.items() if value is not None})
+    setup_console()
+    pause = (lambda: None) if args.no_pause else (lambda: input("\nPress Enter to exit..."))
+    
+    log.info("\n=== Python Environment Info ===")
+    log.info(truncate(f"Python: {sys.version.split()[0]}"))
+    log.info(truncate(f"System: {platform.system()}"))
+    log.info("=============================\n")
+    if importlib.util.find_spec('nbtlib') is None:
+        log.error("Missing nbtlib package")
+        log.info("Run: pip install nbtlib")
+        pause()
+        return 1
+    
     try:
-        main()
-        print("I hope you find this helpful!")
-        input("\nPress Enter to exit...")
+        main([os.path.normpath(path) for path in args.paths] or None, interactive=not args.no_pause)
+        log.info("I hope you find this helpful!")
+        pause()
     except KeyboardInterrupt:
-        print("\nOperation cancelled by user")
+        log.info("\nOperation cancelled by user")
     except Exception as e:
-        print(f"\nFatal error: {e}")
+        log.error("Fatal error: %s", e)
         traceback.print_exc()
-        input("\nPress Enter to exit...")
+        pause()
+        return 1
+    return 0
+
+if __name__ == '__main__':
+    if sys.argv[1:2] == ['db']:
+        sys.exit(db_main(sys.argv[2:]))
+    sys.exit(cli(sys.argv[1:]))